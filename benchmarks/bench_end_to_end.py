@@ -0,0 +1,149 @@
+"""
+End-to-end throughput and latency benchmark against the local fake API server
+
+Drives sync handlers (``solve_many_sync``, one thread per running task), sync handlers on the
+background engine (``set_engine``) and async handlers (``aio_solve_many``)
+at several concurrency levels and reports:
+
+* tasks/s - finished solve calls per wall-clock second;
+* overhead - mean solve call latency minus the simulated solve time of its task,
+  i.e. time spent in the client, the transport and polling granularity;
+* cpu/task - process CPU time per task, the fake server runs in the same process and is included;
+* p50 / p99 - solve call latency;
+* sockets - client connections opened during the run.
+
+Runs fully offline, all requests go to the fake server on a loopback port.
+
+Run:
+    python benchmarks/bench_end_to_end.py
+    python benchmarks/bench_end_to_end.py --mode async --tasks 100,1000,10000 --solve-time lognormal:0.5,0.4
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, List
+
+from fake_server import FakeAntiCaptchaServer
+
+from python3_anticaptcha.core.engine import ENGINE
+from python3_anticaptcha.core.hooks import LifecycleEvent, LifecycleHook
+from python3_anticaptcha.core.polling import POLLING_PROFILES
+from python3_anticaptcha.turnstile import Turnstile
+
+API_KEY = "a" * 32
+# sync mode runs one thread per task, larger levels are capped to keep the OS thread count sane
+MAX_SYNC_THREADS = 512
+
+
+class LatencyRecorder(LifecycleHook):
+    """
+    Collects latency and task id of every finished solve call
+    """
+
+    def __init__(self):
+        self.finished: List[LifecycleEvent] = []
+
+    def on_solved(self, event: LifecycleEvent) -> None:
+        self.finished.append(event)
+
+    def on_failed(self, event: LifecycleEvent) -> None:
+        self.finished.append(event)
+
+
+def make_solver(server: FakeAntiCaptchaServer, recorder: LatencyRecorder, poll_interval: float) -> Turnstile:
+    solver = Turnstile(
+        api_key=API_KEY,
+        captcha_type="TurnstileTaskProxyless",
+        websiteURL="https://example.com/",
+        websiteKey="1x00000000000000000000AA",
+        sleep_time=poll_interval,
+    )
+    solver.set_request_url(server.url)
+    solver.add_hook(recorder)
+    return solver
+
+
+def run_sync(server: FakeAntiCaptchaServer, recorder: LatencyRecorder, tasks: int, poll_interval: float) -> None:
+    solver = make_solver(server, recorder, poll_interval)
+    solver.solve_many_sync([{}] * tasks, max_workers=min(tasks, MAX_SYNC_THREADS), return_exceptions=True)
+
+
+def run_engine(server: FakeAntiCaptchaServer, recorder: LatencyRecorder, tasks: int, poll_interval: float) -> None:
+    # sync calls solved on the background event loop, no thread per pending task
+    solver = make_solver(server, recorder, poll_interval)
+    solver.set_engine(ENGINE)
+    solver.solve_many_sync([{}] * tasks, max_workers=tasks, return_exceptions=True)
+
+
+def run_async(server: FakeAntiCaptchaServer, recorder: LatencyRecorder, tasks: int, poll_interval: float) -> None:
+    # `aio_solve_many` in a new loop, whose session is closed before the next concurrency level
+    solver = make_solver(server, recorder, poll_interval)
+    solver.solve_many([{}] * tasks, concurrency=tasks, return_exceptions=True)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def bench(server: FakeAntiCaptchaServer, mode: str, tasks: int, poll_interval: float) -> Dict[str, float]:
+    POLLING_PROFILES.reset()
+    server.reset_stats()
+    recorder = LatencyRecorder()
+    runner = {"sync": run_sync, "engine": run_engine, "async": run_async}[mode]
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    runner(server, recorder, tasks, poll_interval)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    latencies = [event.elapsed for event in recorder.finished]
+    overheads = [
+        event.elapsed - server.solve_time(event.task_id) for event in recorder.finished if event.task_id is not None
+    ]
+    return {
+        "tasks": tasks,
+        "failed": sum(event.event != "solved" for event in recorder.finished),
+        "tasks_s": tasks / wall,
+        "overhead_ms": statistics.mean(overheads) * 1000 if overheads else float("nan"),
+        "cpu_ms": cpu / tasks * 1000,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "sockets": server.connections,
+        "requests": sum(server.requests.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("sync", "engine", "async", "all"), default="all")
+    parser.add_argument("--tasks", default="1,10,100,1000", help="comma separated concurrency levels, up to 10000")
+    parser.add_argument(
+        "--solve-time", default="const:0.05", help="const:S | uniform:A,B | exp:MEAN | lognormal:MED,SIGMA"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="`sleep_time` of the handlers, seconds")
+    args = parser.parse_args()
+
+    modes = ("sync", "engine", "async") if args.mode == "all" else (args.mode,)
+    header = (
+        f"{'mode':<6}{'tasks':>7}{'failed':>8}{'tasks/s':>10}{'overhead ms':>13}"
+        f"{'cpu/task ms':>13}{'p50 ms':>9}{'p99 ms':>9}{'sockets':>9}{'requests':>10}"
+    )
+    with FakeAntiCaptchaServer(solve_time=args.solve_time, error_rate=args.error_rate) as server:
+        print(f"fake server {server.url}, solve time {args.solve_time}")
+        print(header)
+        for mode in modes:
+            for tasks in (int(value) for value in args.tasks.split(",")):
+                row = bench(server, mode, tasks, args.poll_interval)
+                print(
+                    f"{mode:<6}{row['tasks']:>7}{row['failed']:>8}{row['tasks_s']:>10.1f}{row['overhead_ms']:>13.2f}"
+                    f"{row['cpu_ms']:>13.3f}{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                    f"{row['sockets']:>9}{row['requests']:>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
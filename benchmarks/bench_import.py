@@ -0,0 +1,68 @@
+"""
+Cold-start benchmark of the package import
+
+Every sample imports the modules in a fresh interpreter, so nothing is cached in
+``sys.modules``. Reports the median import time and which transport libraries
+the import pulled in. With ``--max-ms`` the script exits with code 1 when the median
+is slower, so it can guard the cold-start cost of short-lived worker processes in CI.
+
+Run:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --max-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "handler module": "import python3_anticaptcha.turnstile",
+    "all handlers": (
+        "import python3_anticaptcha.turnstile, python3_anticaptcha.image_to_text, "
+        "python3_anticaptcha.recaptcha_v2, python3_anticaptcha.control"
+    ),
+    "sync transport": "import python3_anticaptcha.core.sio_captcha_instrument",
+    "async transport": "import python3_anticaptcha.core.aio_captcha_instrument",
+}
+TRANSPORTS = ("asyncio", "requests", "urllib3", "aiohttp", "tenacity")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {transports!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str) -> dict:
+    code = PROBE.format(statement=statement, transports=TRANSPORTS)
+    return json.loads(subprocess.run([sys.executable, "-c", code], capture_output=True, check=True).stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the `handler module` median is slower")
+    args = parser.parse_args()
+
+    # the first run compiles bytecode, it is not a cold start of a deployed worker
+    measure(";".join(SCENARIOS.values()))
+
+    medians = {}
+    print(f"{'scenario':<18}{'median ms':>11}{'min ms':>9}  transports loaded")
+    for name, statement in SCENARIOS.items():
+        samples = [measure(statement) for _ in range(args.repeat)]
+        medians[name] = statistics.median(sample["ms"] for sample in samples)
+        fastest = min(sample["ms"] for sample in samples)
+        print(f"{name:<18}{medians[name]:>11.1f}{fastest:>9.1f}  {', '.join(samples[0]['loaded']) or '-'}")
+
+    if args.max_ms is not None and medians["handler module"] > args.max_ms:
+        print(f"handler module import {medians['handler module']:.1f} ms is slower than {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Microbenchmark of request/response serialization on the solving hot path
+
+Compares the old path (``to_dict()`` + stdlib ``json`` + ``Struct(**dict)``)
+with cached msgspec encoder/decoders from ``core.serializer``.
+
+Run:
+    python benchmarks/bench_serialization.py
+"""
+
+import json
+import timeit
+
+from python3_anticaptcha.core.serializer import (
+    GET_TASK_RESULT_RESPONSE_DECODER,
+    JSON_ENCODER,
+    CreateTaskBaseSer,
+    GetTaskResultRequestSer,
+    GetTaskResultResponseSer,
+)
+
+NUMBER = 50_000
+
+CREATE_TASK = CreateTaskBaseSer(
+    clientKey="a" * 32,
+    task={
+        "type": "RecaptchaV2TaskProxyless",
+        "websiteURL": "https://www.example.com/login",
+        "websiteKey": "6Le-wvkSAAAAAPBMRTvw0Q4Muexq9bi0DJwx_mJ-",
+        "isInvisible": False,
+    },
+)
+GET_RESULT = GetTaskResultRequestSer(clientKey="a" * 32, taskId=7654321)
+RESPONSE = json.dumps(
+    {
+        "errorId": 0,
+        "status": "ready",
+        "solution": {"gRecaptchaResponse": "3AHJ_VuvYIBNBW5yyv0zRYJ75VkOKvhKj9_xGBJKnQimF72rfoq3Iy-DyGHMwLAo6a3" * 4},
+        "cost": "0.00200",
+        "ip": "46.98.54.221",
+        "createTime": 1679004358,
+        "endTime": 1679004368,
+        "solveCount": 0,
+    }
+).encode()
+
+
+def stdlib_round_trip():
+    json.dumps(CREATE_TASK.to_dict()).encode()
+    json.dumps(GET_RESULT.to_dict()).encode()
+    GetTaskResultResponseSer(**json.loads(RESPONSE)).to_dict()
+
+
+def msgspec_round_trip():
+    JSON_ENCODER.encode(CREATE_TASK)
+    JSON_ENCODER.encode(GET_RESULT)
+    GET_TASK_RESULT_RESPONSE_DECODER.decode(RESPONSE).to_dict()
+
+
+def main():
+    results = {}
+    for name, func in (("stdlib json", stdlib_round_trip), ("msgspec", msgspec_round_trip)):
+        best = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        results[name] = best / NUMBER * 1e6
+        print(f"{name:<12} {results[name]:8.2f} us per createTask + getTaskResult round trip")
+    print(f"speedup      {results['stdlib json'] / results['msgspec']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+In-process fake Anti-Captcha API server for offline benchmarks
+
+Implements `createTask`, `getTaskResult` and the account (``ControlPostfixEnm``) methods.
+Every created task becomes `ready` after a solve time drawn from a configurable distribution.
+The server runs its own event loop in a daemon thread, so both sync and async handlers
+can be driven against it from the same process.
+
+Usage:
+    >>> with FakeAntiCaptchaServer(solve_time="lognormal:0.5,0.3") as server:
+    ...     solver.set_request_url(server.url)
+    ...     solver.captcha_handler()
+"""
+
+import asyncio
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from aiohttp import web
+
+from python3_anticaptcha.core.enum import ControlPostfixEnm
+
+__all__ = ("FakeAntiCaptchaServer", "solve_time_sampler")
+
+TOKEN = "03AFcWeA5zZ0x8Y3WwqQ_FAKE_TOKEN_" + "x" * 400
+
+
+def solve_time_sampler(spec: str, seed: Optional[int] = None) -> Callable[[], float]:
+    """
+    Build solve time sampler from a spec:
+
+    * ``const:S`` - always ``S`` seconds;
+    * ``uniform:A,B`` - uniform between ``A`` and ``B`` seconds;
+    * ``exp:MEAN`` - exponential with the ``MEAN`` seconds;
+    * ``lognormal:MEDIAN,SIGMA`` - log-normal with the ``MEDIAN`` seconds, long right tail.
+    """
+    rng = random.Random(seed)
+    kind, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",") if value]
+    if kind == "const":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda: rng.expovariate(1 / values[0])
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown solve time distribution - {spec}")
+
+
+class FakeAntiCaptchaServer:
+    """
+    Fake API server on a loopback port
+
+    Args:
+        solve_time: Solve time distribution spec, see ``solve_time_sampler``
+        error_rate: Share of tasks finished with `ERROR_CAPTCHA_UNSOLVABLE`
+        cost: Cost of every ready task
+        seed: Random seed of the solve time and errors
+        port: Port to listen, ``0`` - any free port
+    """
+
+    def __init__(
+        self,
+        solve_time: str = "const:0.05",
+        error_rate: float = 0.0,
+        cost: float = 0.002,
+        seed: Optional[int] = 1,
+        port: int = 0,
+    ):
+        self.sample_solve_time = solve_time_sampler(solve_time, seed=seed)
+        self.error_rate = error_rate
+        self.cost = cost
+        self.port = port
+
+        self._rng = random.Random(seed)
+        self._task_ids = itertools.count(1)
+        # task id -> (monotonic ready time, solve time, failed)
+        self.tasks: Dict[int, tuple] = {}
+        self.requests: Dict[str, int] = {}
+        self._connections: Set[int] = set()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/"
+
+    @property
+    def connections(self) -> int:
+        """
+        Number of distinct client connections which sent requests
+        """
+        return len(self._connections)
+
+    def solve_time(self, task_id: int) -> float:
+        return self.tasks[task_id][1]
+
+    def reset_stats(self) -> None:
+        self.requests.clear()
+        self._connections.clear()
+
+    def start(self) -> "FakeAntiCaptchaServer":
+        self._thread = threading.Thread(target=self._run, name="fake-anticaptcha", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self) -> "FakeAntiCaptchaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _serve(self) -> None:
+        app = web.Application()
+        app.router.add_post("/createTask", self._create_task)
+        app.router.add_post("/getTaskResult", self._get_task_result)
+        for method in ControlPostfixEnm.list_values():
+            app.router.add_post(f"/{method}", self._control)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", self.port, backlog=16384)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def _count(self, request: web.Request) -> None:
+        method = request.path.strip("/")
+        self.requests[method] = self.requests.get(method, 0) + 1
+        self._connections.add(id(request.transport))
+
+    async def _create_task(self, request: web.Request) -> web.Response:
+        self._count(request)
+        payload = await request.json()
+        if not payload.get("clientKey"):
+            return web.json_response({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
+        task_id = next(self._task_ids)
+        solve_time = self.sample_solve_time()
+        self.tasks[task_id] = (time.monotonic() + solve_time, solve_time, self._rng.random() < self.error_rate)
+        return web.json_response({"errorId": 0, "taskId": task_id})
+
+    async def _get_task_result(self, request: web.Request) -> web.Response:
+        self._count(request)
+        payload = await request.json()
+        task = self.tasks.get(payload.get("taskId"))
+        if task is None:
+            return web.json_response({"errorId": 16, "errorCode": "ERROR_NO_SUCH_CAPCHA_ID"})
+        ready_at, solve_time, failed = task
+        if time.monotonic() < ready_at:
+            return web.json_response({"errorId": 0, "status": "processing"})
+        if failed:
+            return web.json_response({"errorId": 12, "errorCode": "ERROR_CAPTCHA_UNSOLVABLE"})
+        end_time = int(time.time())
+        return web.json_response(
+            {
+                "errorId": 0,
+                "status": "ready",
+                "solution": {"token": TOKEN, "text": "fake", "gRecaptchaResponse": TOKEN},
+                "cost": f"{self.cost:.5f}",
+                "ip": "127.0.0.1",
+                "createTime": end_time - math.ceil(solve_time),
+                "endTime": end_time,
+                "solveCount": 0,
+            }
+        )
+
+    async def _control(self, request: web.Request) -> web.Response:
+        self._count(request)
+        method = request.path.strip("/")
+        if method == ControlPostfixEnm.GET_BALANCE:
+            return web.json_response({"errorId": 0, "balance": 100.0})
+        if method == ControlPostfixEnm.GET_QUEUE_STATS:
+            return web.json_response({"waiting": 10, "load": 50.0, "bid": 0.0005, "speed": 5.0, "total": 100})
+        return web.json_response({"errorId": 0, "status": "success", "data": []})
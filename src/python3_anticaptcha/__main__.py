@@ -0,0 +1,260 @@
+"""
+Streaming JSONL batch solver
+
+Reads one task per line from a file or stdin, solves the tasks with bounded async concurrency
+and writes one result per line, in completion order. Input is read lazily, so memory usage
+depends on ``--concurrency``, not on the input size.
+
+Input line - ``type`` is the handler class name, ``params`` are its constructor arguments
+(``api_key`` defaults to ``--api-key``), ``task`` are the ``aio_captcha_handler`` arguments,
+optional ``id`` is copied to the result line:
+
+    {"id": "row-1", "type": "Turnstile", "params": {"captcha_type": "TurnstileTaskProxyless",
+     "websiteURL": "https://...", "websiteKey": "0x4AAAAAAA..."}}
+    {"id": "row-2", "type": "ImageToText", "task": {"captcha_link": "https://.../img.jpg"}}
+
+Output line:
+
+    {"id": "row-1", "index": 0, "result": {"errorId": 0, "status": "ready", ...}}
+    {"id": "row-2", "index": 1, "error": "ValueError: ..."}
+
+Run:
+    python -m python3_anticaptcha --api-key KEY --concurrency 200 < tasks.jsonl > results.jsonl
+"""
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import IO, Any, Dict, List, Optional
+
+import msgspec
+
+__all__ = ("main", "solve_stream")
+
+# handler class name -> module, modules are imported on first use
+SOLVER_MODULES = {
+    "Altcha": "altcha",
+    "AmazonWAF": "amazon_waf",
+    "CustomTask": "custom_task",
+    "FriendlyCaptcha": "friendly_captcha",
+    "FunCaptcha": "fun_captcha",
+    "GeeTest": "gee_test",
+    "ImageToCoordinates": "image_to_coordinates",
+    "ImageToText": "image_to_text",
+    "Prosopo": "prosopo_captcha",
+    "ReCaptchaV2": "recaptcha_v2",
+    "ReCaptchaV3": "recaptcha_v3",
+    "Turnstile": "turnstile",
+}
+# same variable as in the README setup section
+API_KEY_ENV = "API_KEY"
+
+
+class TaskSpec(msgspec.Struct, forbid_unknown_fields=True):
+    type: str
+    params: Dict[str, Any] = msgspec.field(default_factory=dict)
+    task: Dict[str, Any] = msgspec.field(default_factory=dict)
+    id: Any = None
+
+
+TASK_SPEC_DECODER = msgspec.json.Decoder(TaskSpec)
+RESULT_ENCODER = msgspec.json.Encoder()
+# equal params with another key order must map to the same cached solver
+PARAMS_KEY_ENCODER = msgspec.json.Encoder(order="sorted")
+
+
+class SolverCache:
+    """
+    Bounded LRU cache of configured solvers, lines with the same type and params share one solver
+
+    Args:
+        api_key: API key of the solvers whose params have no ``api_key``
+        size: Maximum number of cached solvers
+        timeout: Total seconds for every solve call, ``None`` - no limit
+        request_url: API address, ``None`` - the default one
+    """
+
+    def __init__(
+        self, api_key: str, size: int = 64, timeout: Optional[float] = None, request_url: Optional[str] = None
+    ):
+        self.api_key = api_key
+        self.size = size
+        self.timeout = timeout
+        self.request_url = request_url
+        self._solvers: "OrderedDict[bytes, CaptchaParams]" = OrderedDict()
+
+    def get(self, solver_type: str, params: Dict[str, Any]) -> "CaptchaParams":
+        key = PARAMS_KEY_ENCODER.encode([solver_type, params])
+        solver = self._solvers.get(key)
+        if solver is not None:
+            self._solvers.move_to_end(key)
+            return solver
+
+        solver = self._create(solver_type, params)
+        self._solvers[key] = solver
+        if len(self._solvers) > self.size:
+            self._solvers.popitem(last=False)
+        return solver
+
+    def _create(self, solver_type: str, params: Dict[str, Any]) -> "CaptchaParams":
+        if solver_type not in SOLVER_MODULES:
+            raise ValueError(f"Unknown task type - {solver_type}, expected one of {sorted(SOLVER_MODULES)}")
+        module = importlib.import_module(f"python3_anticaptcha.{SOLVER_MODULES[solver_type]}")
+        solver = getattr(module, solver_type)(**{"api_key": self.api_key, **params})
+        if self.timeout is not None:
+            solver.set_timeout(total=self.timeout)
+        if self.request_url is not None:
+            solver.set_request_url(self.request_url)
+        return solver
+
+
+class Progress:
+    """
+    Counters of the running batch
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.read = 0
+        self.done = 0
+        self.failed = 0
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        rate = self.done / elapsed if elapsed else 0.0
+        return (
+            f"{self.done} done, {self.failed} failed, {self.read - self.done} in flight, "
+            f"{rate:.1f} tasks/s, {elapsed:.0f}s elapsed"
+        )
+
+
+async def _solve_line(cache: SolverCache, index: int, line: str) -> dict:
+    record: Dict[str, Any] = {"id": None, "index": index}
+    try:
+        spec = TASK_SPEC_DECODER.decode(line)
+        record["id"] = spec.id
+        solver = cache.get(spec.type, spec.params)
+        record["result"] = await solver.aio_captcha_handler(**spec.task)
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    return record
+
+
+async def solve_stream(
+    source: IO[str],
+    sink: IO[str],
+    cache: SolverCache,
+    concurrency: int = 50,
+    progress_interval: float = 10,
+    progress_sink: Optional[IO[str]] = None,
+) -> Progress:
+    """
+    Solve every JSONL task of ``source`` and write JSONL results to ``sink`` in completion order
+
+    Args:
+        source: Text stream with one task per line, blank lines are skipped
+        sink: Text stream for results, flushed after every line
+        cache: Cache which builds the solvers of the tasks
+        concurrency: Maximum number of tasks solved at the same time
+        progress_interval: Seconds between progress lines, ``0`` - only the final line
+        progress_sink: Text stream for progress lines, stderr by default
+
+    Returns:
+        Final counters of the batch
+    """
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be a positive number")
+
+    from .core.aio_session import AIO_SESSION_POOL
+
+    progress_sink = progress_sink or sys.stderr
+    loop = asyncio.get_running_loop()
+    progress = Progress()
+    indexes = itertools.count()
+    read_lock = asyncio.Lock()
+
+    async def next_line() -> Optional[tuple]:
+        async with read_lock:
+            while True:
+                # a slow producer on stdin must not block the event loop
+                line = await loop.run_in_executor(None, source.readline)
+                if not line:
+                    return None
+                if line.strip():
+                    progress.read += 1
+                    return next(indexes), line
+
+    async def worker() -> None:
+        while True:
+            item = await next_line()
+            if item is None:
+                return
+            record = await _solve_line(cache, *item)
+            result = record.get("result")
+            if result is None or result.get("errorId"):
+                progress.failed += 1
+            progress.done += 1
+            sink.write(RESULT_ENCODER.encode(record).decode() + "\n")
+            sink.flush()
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(progress_interval)
+            print(progress.line(), file=progress_sink, flush=True)
+
+    reporter = asyncio.create_task(report()) if progress_interval > 0 else None
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        await AIO_SESSION_POOL.close()
+    print(progress.line(), file=progress_sink, flush=True)
+    return progress
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m python3_anticaptcha", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-i", "--input", default="-", help="JSONL file with tasks, `-` - stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file for results, `-` - stdout")
+    parser.add_argument("-k", "--api-key", default=os.environ.get(API_KEY_ENV), help=f"default - ${API_KEY_ENV}")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="tasks solved at the same time")
+    parser.add_argument("--timeout", type=float, default=None, help="total seconds for every task")
+    parser.add_argument("--progress-interval", type=float, default=10, help="seconds between progress lines")
+    parser.add_argument("--request-url", default=None, help="API address, like a local fake server")
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error(f"API key is required, pass --api-key or set ${API_KEY_ENV}")
+
+    cache = SolverCache(api_key=args.api_key, timeout=args.timeout, request_url=args.request_url)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        asyncio.run(
+            solve_stream(
+                source=source,
+                sink=sink,
+                cache=cache,
+                concurrency=args.concurrency,
+                progress_interval=args.progress_interval,
+            )
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
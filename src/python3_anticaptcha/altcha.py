@@ -20,7 +20,7 @@ class Altcha(CaptchaParams):
         proxyLogin: Optional[str] = None,
         proxyPassword: Optional[str] = None,
         userAgent: Optional[str] = None,
-        sleep_time: Optional[int] = 10,
+        sleep_time: Optional[float] = 10,
     ):
         """
         The class is used to work with Altcha.
@@ -1,9 +1,5 @@
 from typing import Generator
 
-import urllib3
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 
 # Connection retry generator
 def attempts_generator(amount: int = 5) -> Generator:
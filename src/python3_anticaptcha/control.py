@@ -1,9 +1,11 @@
 from typing import Optional
 
-from .core.aio_captcha_instrument import AIOCaptchaInstrument
 from .core.base import CaptchaParams
 from .core.enum import ControlPostfixEnm
-from .core.sio_captcha_instrument import SIOCaptchaInstrument
+from .core.utils import lazy_instruments
+
+_lazy = lazy_instruments(globals())
+__getattr__ = _lazy.module_getattr
 
 __all__ = ("Control",)
 
@@ -134,9 +136,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getBalance
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.GET_BALANCE,
             payload={"clientKey": self.create_task_payload.clientKey},
         )
@@ -158,8 +162,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getBalance
         """
-        return await AIOCaptchaInstrument.send_post_request(
-            url_postfix=ControlPostfixEnm.GET_BALANCE, payload={"clientKey": self.create_task_payload.clientKey}
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
+            url_postfix=ControlPostfixEnm.GET_BALANCE,
+            payload={"clientKey": self.create_task_payload.clientKey},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     @staticmethod
@@ -195,7 +203,7 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getQueueStats
         """
-        return SIOCaptchaInstrument.send_post_request(
+        return _lazy.SIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.GET_QUEUE_STATS, payload={"queueId": queue_id}
         )
 
@@ -232,7 +240,7 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getQueueStats
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.GET_QUEUE_STATS, payload={"queueId": queue_id}
         )
 
@@ -288,9 +296,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getSpendingStats
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.GET_SPENDING_STATS,
             payload={"clientKey": self.create_task_payload.clientKey, **kwargs},
         )
@@ -349,9 +359,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getSpendingStats
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.GET_SPENDING_STATS,
             payload={"clientKey": self.create_task_payload.clientKey, **kwargs},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     def get_app_stats(self, softId: int, mode: Optional[str] = None) -> dict:
@@ -390,9 +403,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getAppStats
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.GET_APP_STATS,
             payload={"clientKey": self.create_task_payload.clientKey, "softId": softId, "mode": mode},
         )
@@ -433,9 +448,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/getAppStats
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.GET_APP_STATS,
             payload={"clientKey": self.create_task_payload.clientKey, "softId": softId, "mode": mode},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     def report_incorrect_image(self, taskId: int) -> dict:
@@ -456,9 +474,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectImageCaptcha
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_IMAGE_CAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
         )
@@ -481,9 +501,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectImageCaptcha
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_IMAGE_CAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     def report_incorrect_recaptcha(self, taskId: int) -> dict:
@@ -504,9 +527,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectRecaptcha
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_RECAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
         )
@@ -531,9 +556,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectRecaptcha
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_RECAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     def report_correct_recaptcha(self, taskId: int) -> dict:
@@ -554,9 +582,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportCorrectRecaptcha
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.REPORT_CORRECT_RECAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
         )
@@ -579,9 +609,12 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportCorrectRecaptcha
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.REPORT_CORRECT_RECAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
 
     def report_incorrect_hcaptcha(self, taskId: int) -> dict:
@@ -602,9 +635,11 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectHcaptcha
         """
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
+        self._captcha_handling_instrument = _lazy.SIOCaptchaInstrument(captcha_params=self)
         return self._captcha_handling_instrument.send_post_request(
             session=self._captcha_handling_instrument.session,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_HCAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
         )
@@ -627,7 +662,10 @@ class Control(CaptchaParams):
         Notes:
             https://anti-captcha.com/apidoc/methods/reportIncorrectHcaptcha
         """
-        return await AIOCaptchaInstrument.send_post_request(
+        return await _lazy.AIOCaptchaInstrument.send_post_request(
             url_postfix=ControlPostfixEnm.REPORT_INCORRECT_HCAPTCHA,
             payload={"clientKey": self.create_task_payload.clientKey, "taskId": taskId},
+            session_pool=self.aio_session_pool,
+            rate_limiter=self.rate_limiter,
+            request_url=self.request_url,
         )
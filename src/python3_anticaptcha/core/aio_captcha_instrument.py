@@ -1,16 +1,34 @@
 import asyncio
-import base64
 import logging
-from typing import Optional, Union
+import time
+from typing import Awaitable, Callable, Optional, Union
 from urllib import parse
 from urllib.parse import urljoin
 
 import aiohttp
 
-from .captcha_instrument import CaptchaInstrument
-from .const import ASYNC_RETRIES, BASE_REQUEST_URL, CREATE_TASK_POSTFIX, GET_RESULT_POSTFIX
-from .enum import SaveFormatsEnm
-from .serializer import CreateTaskResponseSer
+from .aio_session import AIO_SESSION_POOL, AIOSessionPool
+from .captcha_instrument import CaptchaFile, CaptchaInstrument, ImageBody
+from .const import (
+    ASYNC_RETRIES,
+    BASE_REQUEST_URL,
+    CONNECT_TIMEOUT,
+    CREATE_TASK_POSTFIX,
+    GET_RESULT_POSTFIX,
+    READ_TIMEOUT,
+)
+from .enum import LifecycleEventEnm, RateLimitScopeEnm, ResponseStatusEnm, SaveFormatsEnm
+from .serializer import (
+    CREATE_TASK_RESPONSE_DECODER,
+    GET_TASK_RESULT_RESPONSE_DECODER,
+    JSON_DECODER,
+    JSON_ENCODER,
+    JSON_HEADERS,
+    CreateTaskResponseSer,
+    GetTaskResultResponseSer,
+)
+from .task_context import TaskContext
+from .timeouts import DeadlineExceeded
 from .utils import attempts_generator
 
 __all__ = ("AIOCaptchaInstrument",)
@@ -21,32 +39,169 @@ class AIOCaptchaInstrument(CaptchaInstrument):
     Instrument for working with async captcha
     """
 
-    def __init__(self, captcha_params: "CaptchaParams"):
+    def __init__(self, captcha_params: "CaptchaParams", task_params: Optional[dict] = None):
         super().__init__()
         self.captcha_params = captcha_params
+        # per-call copies of the payloads, the solver itself is never changed
+        self.context = TaskContext(captcha_params=captcha_params, task_params=task_params)
+        # sessions are shared per event loop, connections are reused between solves
+        self.session_pool = captcha_params.aio_session_pool
+        # countdown of the whole solve call
+        self.deadline = captcha_params.timeout.deadline()
 
     async def processing_captcha(self) -> dict:
-        # added task params to payload
-        self.captcha_params.create_task_payload.task.update(self.captcha_params.task_params)
+        key = await self._aio_checkout_key()
+        result = None
+        try:
+            result = await self._processing(self._solve_task)
+        finally:
+            self._checkin_key(key, result)
+        return result
 
-        created_task = await self._create_task()
+    async def processing_resume(self, entry: "JournalEntry") -> dict:
+        """
+        Method poll the journaled task until the terminal result, without creating a new task
+        """
+        self._attach(entry)
+        return await self._processing(self._get_result)
+
+    async def _processing(self, solve: Callable[[], Awaitable[dict]]) -> dict:
+        result = None
+        try:
+            result = await solve()
+        except DeadlineExceeded:
+            result = self._deadline_result()
+        except asyncio.TimeoutError:
+            if not self.deadline.expired():
+                raise
+            result = self._deadline_result()
+        finally:
+            self._journal_result(result)
+            self._emit_result(result)
+        return result
+
+    async def _solve_task(self) -> dict:
+        self.context.get_result_params.taskId = None
+
+        await self._wait_queue()
+        created_task = await self._create_task_with_policy()
+        self.created_at = time.monotonic()
 
         if created_task.errorId == 0:
-            self.captcha_params.get_result_params.taskId = created_task.taskId
+            self.context.get_result_params.taskId = created_task.taskId
+            self._journal_created()
+            self._emit(LifecycleEventEnm.TASK_CREATED)
         else:
+            self._emit(LifecycleEventEnm.TASK_CREATED, error_code=created_task.errorCode)
             return created_task.to_dict()
 
-        await asyncio.sleep(self.captcha_params.sleep_time)
+        if self.captcha_params.callback_receiver is not None:
+            return await self._wait_callback()
+
+        if self.captcha_params.poller is not None:
+            return await self._wait_poller()
+
+        self._schedule_hedge()
+        self._polling_schedule()
+        await asyncio.sleep(self.deadline.clip(self._next_poll_delay()))
 
         return await self._get_result()
 
+    async def _wait_queue(self) -> None:
+        """
+        Method load the queue stats and hold a non-urgent task while the queue is overloaded
+        """
+        monitor = self.captcha_params.queue_monitor
+        if monitor is None:
+            return
+        held = 0.0
+        while True:
+            delay = self._queue_hold_delay(await monitor.aio_stats(self.captcha_type), held)
+            if delay is None:
+                return
+            await asyncio.sleep(self.deadline.clip(delay))
+            self.deadline.check()
+            held += delay
+
+    async def _create_task_with_policy(self) -> CreateTaskResponseSer:
+        """
+        Method create the task, transient errors are retried as the error policy decides
+        """
+        attempt = 0
+        try:
+            while True:
+                pause = self._create_task_pause()
+                if pause:
+                    await asyncio.sleep(self.deadline.clip(pause))
+                    self.deadline.check()
+                created_task = await self._create_task()
+                delay = self._create_task_retry_delay(created_task, attempt)
+                if delay is None:
+                    return created_task
+                await asyncio.sleep(self.deadline.clip(delay))
+                self.deadline.check()
+                attempt += 1
+        finally:
+            # a hedged task keeps the payload until `_schedule_hedge` decides, only polled tasks are hedged
+            if self.captcha_params.hedge_policy is None or not self._polled_directly():
+                self._create_task_data = None
+
+    def _polled_directly(self) -> bool:
+        return self.captcha_params.callback_receiver is None and self.captcha_params.poller is None
+
+    async def _wait_poller(self) -> dict:
+        """
+        Method hand the created task to the central poller and wait for the terminal result
+        """
+        json_result = await asyncio.wait_for(
+            self.captcha_params.poller.poll(
+                payload=self.context.get_result_params.to_dict(),
+                delays=self._polling_schedule(),
+                session_pool=self.session_pool,
+                request_url=self.captcha_params.request_url,
+                timeout=self.deadline.aio_timeout,
+                rate_limiter=self.captcha_params.rate_limiter,
+                on_response=self._on_poller_response,
+            ),
+            timeout=self.deadline.remaining(),
+        )
+        self._observe_result(json_result.get("status"), json_result.get("createTime"), json_result.get("endTime"))
+        return json_result
+
+    def _on_poller_response(self, captcha_response: GetTaskResultResponseSer) -> None:
+        self.poll_count += 1
+        self._emit(LifecycleEventEnm.POLLED, status=captcha_response.status, error_code=captcha_response.errorCode)
+
+    async def _wait_callback(self) -> dict:
+        """
+        Method wait for `callbackUrl` result, overdue tasks fall back to slow polling
+        """
+        receiver = self.captcha_params.callback_receiver
+        task_id = self.context.get_result_params.taskId
+        future = receiver.register(task_id)
+        try:
+            json_result = await asyncio.wait_for(future, timeout=self.deadline.clip(receiver.overdue_after))
+        except asyncio.TimeoutError:
+            self.deadline.check()
+            self.poll_delays = receiver.fallback_schedule()
+            await asyncio.sleep(self.deadline.clip(self._next_poll_delay()))
+            return await self._get_result()
+        finally:
+            receiver.unregister(task_id)
+
+        # the pushed result stands for the poll which would have delivered it
+        self.poll_count += 1
+        self._emit(LifecycleEventEnm.POLLED, status=json_result.get("status"), error_code=json_result.get("errorCode"))
+        self._observe_result(json_result.get("status"), json_result.get("createTime"), json_result.get("endTime"))
+        return json_result
+
     async def processing_image_captcha(
         self,
         save_format: Union[str, SaveFormatsEnm],
         img_clearing: bool,
         captcha_link: str,
-        captcha_file: str,
-        captcha_base64: bytes,
+        captcha_file: CaptchaFile,
+        captcha_base64: ImageBody,
         img_path: str,
     ) -> dict:
         await self.__body_file_processing(
@@ -57,9 +212,23 @@ class AIOCaptchaInstrument(CaptchaInstrument):
             captcha_file=captcha_file,
             captcha_base64=captcha_base64,
         )
-        if not self.result.errorId:
-            return await self.processing_captcha()
-        return self.result.to_dict()
+        if self.result.errorId:
+            return self.result.to_dict()
+
+        cache_key = self._result_cache_key()
+        if cache_key is not None:
+            cached_result = self.captcha_params.result_cache.get(cache_key)
+            if cached_result is not None:
+                self._release_body()
+                return cached_result
+
+        try:
+            result = await self.processing_captcha()
+        finally:
+            self._release_body()
+        if cache_key is not None:
+            self.captcha_params.result_cache.put(cache_key, result)
+        return result
 
     async def __body_file_processing(
         self,
@@ -68,20 +237,16 @@ class AIOCaptchaInstrument(CaptchaInstrument):
         file_path: str,
         file_extension: str = "png",
         captcha_link: Optional[str] = None,
-        captcha_file: Optional[str] = None,
-        captcha_base64: Optional[bytes] = None,
+        captcha_file: Optional[CaptchaFile] = None,
+        captcha_base64: Optional[ImageBody] = None,
         **kwargs,
     ):
         # if a local file link is passed
         if captcha_file:
-            self.captcha_params.create_task_payload.task.update(
-                {"body": base64.b64encode(self._local_file_captcha(captcha_file=captcha_file)).decode("utf-8")}
-            )
-        # if the file is transferred in base64 encoding
+            self._set_file_body(captcha_file=captcha_file)
+        # if the file is transferred in memory - raw bytes or already base64 encoded `str`
         elif captcha_base64:
-            self.captcha_params.create_task_payload.task.update(
-                {"body": base64.b64encode(captcha_base64).decode("utf-8")}
-            )
+            self._set_body(captcha_base64)
         # if a URL is passed
         elif captcha_link:
             try:
@@ -91,7 +256,7 @@ class AIOCaptchaInstrument(CaptchaInstrument):
                     full_file_path = self._file_const_saver(content, file_path, file_extension=file_extension)
                     if img_clearing:
                         self._file_clean(full_file_path=full_file_path)
-                self.captcha_params.create_task_payload.task.update({"body": base64.b64encode(content).decode("utf-8")})
+                self._set_body(content)
             except Exception as error:
                 self.result.errorId = 12
                 self.result.errorCode = self.NO_CAPTCHA_ERR
@@ -105,65 +270,116 @@ class AIOCaptchaInstrument(CaptchaInstrument):
         """
         Function send SYNC request to service and wait for result
         """
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    parse.urljoin(BASE_REQUEST_URL, url_postfix), json=self.captcha_params.create_task_payload.to_dict()
-                ) as resp:
-                    if resp.status == 200:
-                        return CreateTaskResponseSer(**await resp.json())
-                    else:
-                        raise ValueError(resp.reason)
-            except Exception as error:
-                logging.exception(error)
-                raise
+        session = self.session_pool.get_session()
+        await self._aio_acquire_rate_limit(RateLimitScopeEnm.CREATE_TASK)
+        timeout = self.deadline.aio_timeout()
+        # a retried `createTask` belongs to the same solve call, so the task is sent once
+        if self.sent_at is None:
+            self.sent_at = time.monotonic()
+            self._emit(LifecycleEventEnm.TASK_SENT)
+        try:
+            async with session.post(
+                parse.urljoin(self.captcha_params.request_url, url_postfix),
+                data=self._encode_create_task(),
+                headers=JSON_HEADERS,
+                timeout=timeout,
+            ) as resp:
+                if resp.status == 200:
+                    return CREATE_TASK_RESPONSE_DECODER.decode(await resp.read())
+                http_error = self._create_task_http_error(resp.status)
+                if http_error is not None:
+                    return http_error
+                raise ValueError(resp.reason)
+        except Exception as error:
+            logging.exception(error)
+            raise
 
     async def _get_result(self, url_response: str = GET_RESULT_POSTFIX) -> dict:
         attempts = attempts_generator()
+        task_id = self.context.get_result_params.taskId
+        # payloads are the same for every poll - encode them once, a hedged task adds its duplicate
+        polled = {task_id: JSON_ENCODER.encode(self.context.get_result_params)}
+        session = self.session_pool.get_session()
         # Send request for status of captcha solution.
-        async with aiohttp.ClientSession() as session:
-            for _ in attempts:
+        for _ in attempts:
+            for task_id, payload in list(polled.items()):
+                await self._aio_acquire_rate_limit(RateLimitScopeEnm.GET_TASK_RESULT)
                 async with session.post(
-                    url=urljoin(BASE_REQUEST_URL, url_response), json=self.captcha_params.get_result_params.to_dict()
+                    url=urljoin(self.captcha_params.request_url, url_response),
+                    data=payload,
+                    headers=JSON_HEADERS,
+                    timeout=self.deadline.aio_timeout(),
                 ) as resp:
-                    json_result = await resp.json()
-                    # if there is no error, check CAPTCHA status
-                    if json_result["errorId"] == 0:
-                        # If not yet resolved, wait
-                        if json_result["status"] == "processing":
-                            await asyncio.sleep(self.captcha_params.sleep_time)
-                        # otherwise return response
-                        else:
-                            json_result.update({"taskId": self.captcha_params.get_result_params.taskId})
-                            return json_result
-                    else:
-                        json_result.update({"taskId": self.captcha_params.get_result_params.taskId})
-                        return json_result
+                    captcha_response = GET_TASK_RESULT_RESPONSE_DECODER.decode(await resp.read())
+                captcha_response.taskId = task_id
+                self.poll_count += 1
+                self._emit(
+                    LifecycleEventEnm.POLLED, status=captcha_response.status, error_code=captcha_response.errorCode
+                )
+                # if there is an error, return it, unless the other hedged task goes on
+                if captcha_response.errorId != 0:
+                    if len(polled) > 1:
+                        self._drop_hedged_task(task_id, polled, captcha_response.to_dict())
+                        continue
+                    return captcha_response.to_dict()
+                # if resolved, return response, the other hedged task is abandoned
+                if captcha_response.status != ResponseStatusEnm.processing:
+                    self._settle_hedge(task_id, polled)
+                    self._observe_result(captcha_response.status, captcha_response.createTime, captcha_response.endTime)
+                    return captcha_response.to_dict()
+            # If not yet resolved, create the duplicate of a slow task and wait
+            if self._hedge_due():
+                self._hedge_created(await self._create_hedge(), polled)
+            await asyncio.sleep(self.deadline.clip(self._next_poll_delay()))
 
-    @staticmethod
-    async def _url_read(url: str, **kwargs) -> bytes:
+    async def _create_hedge(self) -> CreateTaskResponseSer:
+        """
+        Method create the duplicate task, its failure never fails the solve call
+        """
+        try:
+            return await self._create_task()
+        except Exception as error:
+            return self._hedge_error(error)
+
+    async def _url_read(self, url: str, **kwargs) -> bytes:
         """
         Async method read bytes from link
         """
-        async with aiohttp.ClientSession() as session:
-            async for attempt in ASYNC_RETRIES:
-                with attempt:
-                    async with session.get(url=url, **kwargs) as resp:
-                        return await resp.content.read()
+        session = self.session_pool.get_session()
+        async for attempt in ASYNC_RETRIES:
+            # checked outside of the attempt, so an expired deadline is not retried
+            timeout = kwargs.get("timeout") or self.deadline.aio_timeout()
+            with attempt:
+                async with session.get(url=url, **{**kwargs, "timeout": timeout}) as resp:
+                    return await resp.content.read()
 
     @staticmethod
-    async def send_post_request(payload: Optional[dict] = None, url_postfix: str = CREATE_TASK_POSTFIX) -> dict:
+    async def send_post_request(
+        payload: Optional[dict] = None,
+        url_postfix: str = CREATE_TASK_POSTFIX,
+        session_pool: Optional[AIOSessionPool] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        request_url: str = BASE_REQUEST_URL,
+    ) -> dict:
         """
         Function send ASYNC request to service and wait for result
         """
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(parse.urljoin(BASE_REQUEST_URL, url_postfix), json=payload) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        raise ValueError(resp.reason)
-            except Exception as error:
-                logging.exception(error)
-                raise
+        session = (session_pool or AIO_SESSION_POOL).get_session()
+        try:
+            if rate_limiter is not None:
+                await rate_limiter.aio_acquire(
+                    scope=RateLimitScopeEnm.CONTROL, api_key=(payload or {}).get("clientKey")
+                )
+            async with session.post(
+                parse.urljoin(request_url, url_postfix),
+                data=JSON_ENCODER.encode(payload),
+                headers=JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT),
+            ) as resp:
+                if resp.status == 200:
+                    return JSON_DECODER.decode(await resp.read())
+                else:
+                    raise ValueError(resp.reason)
+        except Exception as error:
+            logging.exception(error)
+            raise
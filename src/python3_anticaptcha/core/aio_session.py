@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from .utils import running_loop
+
+__all__ = ("AIOSessionPool", "AIO_SESSION_POOL")
+
+
+class AIOSessionPool:
+    """
+    Long-lived ``aiohttp.ClientSession`` + ``TCPConnector`` shared by every coroutine on the same event loop
+
+    Args:
+        limit: Total number of simultaneous connections of one connector
+        limit_per_host: Number of simultaneous connections to one host, ``0`` - no limit
+        ttl_dns_cache: Time in seconds to cache resolved DNS records, ``None`` - cache forever
+
+    Notes:
+        aiohttp sessions are bound to the loop they were created in, so the pool keeps one
+        session per running loop. Deployments with one loop per thread get an independent
+        session in every thread and never share a connector between loops.
+
+        Context managers of the solvers never close the session - bare handler calls on the same
+        loop may still be polling with it. It is closed only by ``close()`` / ``aio_close()``,
+        which the owner of the loop must await before the loop stops - ``solve_many``,
+        the background engine and the CLI do it for the loops they run. Sessions of loops
+        which were closed without it can't be closed any more, they are dropped with a warning.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, ttl_dns_cache: Optional[int] = 300):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+
+        # every session references its loop, so entries are evicted by `close()`, not by the GC
+        self._sessions: "Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        ttl_dns_cache: Optional[int] = None,
+    ) -> None:
+        """
+        Method change connector settings, they are applied to sessions created after the call
+
+        Args:
+            limit: Total number of simultaneous connections of one connector
+            limit_per_host: Number of simultaneous connections to one host
+            ttl_dns_cache: Time in seconds to cache resolved DNS records
+        """
+        if limit is not None:
+            self.limit = limit
+        if limit_per_host is not None:
+            self.limit_per_host = limit_per_host
+        if ttl_dns_cache is not None:
+            self.ttl_dns_cache = ttl_dns_cache
+
+    def get_session(self) -> "aiohttp.ClientSession":
+        """
+        Method return the session of the running event loop, creating it on first use
+        """
+        loop = running_loop()
+        with self._lock:
+            self._drop_closed_loops()
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                # aiohttp is loaded by the first async request only
+                import aiohttp
+
+                session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=self.ttl_dns_cache
+                    )
+                )
+                self._sessions[loop] = session
+        return session
+
+    def _drop_closed_loops(self) -> None:
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            if not self._sessions.pop(loop).closed:
+                logging.warning("aiohttp session of a closed event loop was not closed by `aio_close()`")
+
+    async def close(self) -> None:
+        """
+        Method close the session and connector of the running event loop
+        """
+        with self._lock:
+            session = self._sessions.pop(running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# default pool used by all async solvers and `Control` methods
+AIO_SESSION_POOL = AIOSessionPool()
@@ -1,8 +1,25 @@
-from .aio_captcha_instrument import AIOCaptchaInstrument
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
 from .captcha_instrument import CaptchaInstrument
+from .const import BASE_REQUEST_URL, CONNECT_TIMEOUT, READ_TIMEOUT
 from .context_instr import AIOContextManager, SIOContextManager
+from .error_policy import ERROR_POLICY
+from .hedging import HEDGE_POLICY
+from .metrics import METRICS
+from .polling import POLLING_PROFILES
 from .serializer import CreateTaskBaseSer, GetTaskResultRequestSer
-from .sio_captcha_instrument import SIOCaptchaInstrument
+from .timeouts import SolveTimeout
+from .utils import lazy_instruments
+
+_lazy = lazy_instruments(
+    globals(),
+    aio_solve_many="python3_anticaptcha.core.batch",
+    aio_solve_as_completed="python3_anticaptcha.core.batch",
+    SolveExecutor="python3_anticaptcha.core.executor",
+    ENGINE="python3_anticaptcha.core.engine",
+    QUEUE_MONITOR="python3_anticaptcha.core.queue_monitor",
+)
+__getattr__ = _lazy.module_getattr
 
 __all__ = ("CaptchaParams",)
 
@@ -13,12 +30,15 @@ class CaptchaParams(SIOContextManager, AIOContextManager):
 
     Args:
         api_key: Capsolver API key
-        sleep_time: The waiting time between requests to get the result of the Captcha
+        sleep_time: The waiting time between requests to get the result of the Captcha,
+                    used until the polling engine learns solve times of the captcha type
     """
 
-    def __init__(self, api_key: str, sleep_time: int = 15, *args, **kwargs):
+    def __init__(self, api_key: str, sleep_time: float = 15, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.sleep_time = sleep_time
+        # adaptive per-captcha-type polling schedule
+        self.polling_profiles = POLLING_PROFILES
 
         # assign args to validator
         self.create_task_payload = CreateTaskBaseSer(clientKey=api_key)
@@ -28,6 +48,33 @@ class CaptchaParams(SIOContextManager, AIOContextManager):
         self.get_result_params = GetTaskResultRequestSer(clientKey=api_key)
 
         self._captcha_handling_instrument = CaptchaInstrument()
+        # optional embedded `callbackUrl` receiver, replaces polling in async solving
+        self.callback_receiver: Optional["CallbackReceiver"] = None
+        # optional central `getTaskResult` scheduler for async solving
+        self.poller: Optional["AIOPoller"] = None
+        # optional content-hash cache of image captcha results
+        self.result_cache: Optional["ResultCache"] = None
+        # optional client-side limiter of API calls
+        self.rate_limiter: Optional["RateLimiter"] = None
+        # optional balancer of tasks between several API keys
+        self.key_pool: Optional["KeyPool"] = None
+        # deadline of every solve call and timeouts of its HTTP calls
+        self.timeout = SolveTimeout()
+        # API address, overridden to run against a local server
+        self.request_url = BASE_REQUEST_URL
+        # lifecycle hooks of every solve call
+        self.hooks: List["Hook"] = []
+        # optional background event loop which runs sync handler calls with the async instrument
+        self.engine: Optional["AIOEngine"] = None
+        # optional durable journal of created tasks, unfinished ones can be resumed after a crash
+        self.journal: Optional["TaskJournal"] = None
+        # optional error-code-aware backoff of failed `createTask` calls
+        self.error_policy: Optional["ErrorPolicy"] = None
+        # optional `getQueueStats` cache, tunes the first poll and holds non-urgent tasks under peak load
+        self.queue_monitor: Optional["QueueMonitor"] = None
+        self.queue_hold = False
+        # optional duplicate submission of the tasks which are slower than usual
+        self.hedge_policy: Optional["HedgePolicy"] = None
 
     def set_callback_url(self, callbackUrl: str) -> None:
         """
@@ -43,6 +90,233 @@ class CaptchaParams(SIOContextManager, AIOContextManager):
         """
         self.create_task_payload.callbackUrl = callbackUrl
 
+    def set_callback_receiver(self, receiver: "CallbackReceiver") -> None:
+        """
+        Method for embedded `callbackUrl` receiver set.
+            Async solving then waits for the callback instead of polling `getTaskResult`,
+            tasks whose callback is overdue are polled slowly.
+
+        Args:
+            receiver: Started ``CallbackReceiver`` instance
+
+        Notes:
+            https://anti-captcha.com/apidoc/methods/createTask
+        """
+        self.callback_receiver = receiver
+        self.set_callback_url(callbackUrl=receiver.callback_url)
+
+    def set_poller(self, poller: "AIOPoller") -> None:
+        """
+        Method for central `getTaskResult` poller set.
+            Async solving then hands created tasks to the poller instead of polling in every coroutine.
+
+        Args:
+            poller: ``AIOPoller`` instance, can be shared by many solvers
+        """
+        self.poller = poller
+
+    def set_result_cache(self, cache: "ResultCache") -> None:
+        """
+        Method for image captcha result cache set.
+            Repeated images with the same task options are then served from the cache
+            without a paid `createTask`.
+
+        Args:
+            cache: ``ResultCache`` instance, can be shared by many solvers
+
+        Notes:
+            Used by image captcha types only - ``ImageToText`` and ``ImageToCoordinates``
+        """
+        self.result_cache = cache
+
+    def set_rate_limiter(self, limiter: "RateLimiter") -> None:
+        """
+        Method for client-side rate limiter set.
+            `createTask`, `getTaskResult` and account method calls then wait for the limiter
+            instead of bursting past the account limits.
+
+        Args:
+            limiter: ``RateLimiter`` instance, can be shared by many solvers
+        """
+        self.rate_limiter = limiter
+
+    def set_key_pool(self, pool: "KeyPool") -> None:
+        """
+        Method for API key pool set.
+            Every task is then created with a key picked by the pool, instead of the ``api_key``
+
+        Args:
+            pool: ``KeyPool`` instance, can be shared by many solvers
+        """
+        self.key_pool = pool
+
+    def set_request_url(self, request_url: str) -> None:
+        """
+        Method for API address set, all requests of the solver are then sent to it.
+            Used to run the solver against a local or proxy server.
+
+        Args:
+            request_url: API address, like ``http://127.0.0.1:8080/``
+        """
+        self.request_url = request_url
+
+    def set_timeout(
+        self,
+        total: Optional[float] = None,
+        connect: Optional[float] = CONNECT_TIMEOUT,
+        read: Optional[float] = READ_TIMEOUT,
+    ) -> None:
+        """
+        Method for solve timeouts set.
+            The ``total`` countdown starts at every handler call and bounds task creation,
+            all polls and sleeps. When it expires the handler returns the `processing` result
+            with `errorCode` - `ERROR_DEADLINE_EXCEEDED` and the `taskId`, so the task can be checked later.
+
+        Args:
+            total: Seconds for the whole solve call, ``None`` - no limit
+            connect: Seconds to establish a connection of every HTTP call
+            read: Seconds to wait for the response data of every HTTP call
+        """
+        self.timeout = SolveTimeout(total=total, connect=connect, read=read)
+
+    def add_hook(self, hook: "Hook") -> None:
+        """
+        Method for lifecycle hook registration.
+            The hook is called when `createTask` is sent and answered, on every `getTaskResult`
+            response and when the solve call finishes.
+
+        Args:
+            hook: ``LifecycleHook`` instance or any callable which accepts one ``LifecycleEvent``
+        """
+        self.hooks.append(hook)
+
+    def set_metrics(self, registry: Optional["MetricsRegistry"] = None) -> None:
+        """
+        Method for metrics registry set.
+            Submits, polls, errors, running tasks, cost and solve latency of every solve call
+            are then counted in the registry.
+
+        Args:
+            registry: ``MetricsRegistry`` instance, the process-wide ``METRICS`` by default
+        """
+        self.add_hook((registry or METRICS).hook)
+
+    def set_engine(self, engine: Optional["AIOEngine"] = None) -> None:
+        """
+        Method for background engine set.
+            Sync handler calls are then solved by the async instrument on the engine event loop,
+            the calling thread only waits for the result. Pending solves don't hold a thread each,
+            so thousands of concurrent sync calls need only as many threads as callers.
+
+        Args:
+            engine: ``AIOEngine`` instance, the process-wide ``ENGINE`` by default
+        """
+        self.engine = engine or _lazy.ENGINE
+
+    def set_journal(self, journal: "TaskJournal") -> None:
+        """
+        Method for task journal set.
+            Every created task is recorded with its `taskId` and API key and marked finished with
+            the terminal result, so tasks interrupted by a crash can be polled by ``resume_tasks``.
+
+        Args:
+            journal: ``TaskJournal`` instance, can be shared by many solvers
+        """
+        self.journal = journal
+
+    def set_error_policy(self, policy: Optional["ErrorPolicy"] = None) -> None:
+        """
+        Method for `createTask` error policy set.
+            Transient `createTask` errors, like `ERROR_NO_SLOT_AVAILABLE` or 5xx responses, are then
+            retried with jittered backoff, throttling errors pause task creation of every solver
+            sharing the policy, and the rest are returned at once.
+
+        Args:
+            policy: ``ErrorPolicy`` instance, the process-wide ``ERROR_POLICY`` by default
+        """
+        self.error_policy = policy or ERROR_POLICY
+
+    def set_queue_monitor(self, monitor: Optional["QueueMonitor"] = None, hold: bool = False) -> None:
+        """
+        Method for queue monitor set.
+            The first poll of a task is then sent after the average solve time of its queue,
+            until the polling profile engine has learned solve times of the captcha type.
+
+        Args:
+            monitor: ``QueueMonitor`` instance, the process-wide ``QUEUE_MONITOR`` by default
+            hold: Tasks of the solver are not urgent - `createTask` waits while the queue load
+                    is above the ``load_threshold`` of the monitor, at most ``max_hold`` seconds
+
+        Raises:
+            ValueError: ``hold`` is set, but the monitor has no ``load_threshold`` - nothing would be held
+        """
+        monitor = monitor or _lazy.QUEUE_MONITOR
+        if hold and monitor.load_threshold is None:
+            raise ValueError("`hold` needs a queue monitor with `load_threshold`, e.g. QueueMonitor(load_threshold=95)")
+        self.queue_monitor = monitor
+        self.queue_hold = hold
+
+    def set_hedge_policy(self, policy: Optional["HedgePolicy"] = None) -> None:
+        """
+        Method for hedge policy set.
+            A task which is not ready after the usual solve time of its captcha type then gets
+            one duplicate task, the first ready result is returned. Duplicates are paid tasks,
+            their number is limited by the budget of the policy.
+
+        Args:
+            policy: ``HedgePolicy`` instance, the process-wide ``HEDGE_POLICY`` by default
+        """
+        self.hedge_policy = policy or HEDGE_POLICY
+
+    def resume_tasks(self) -> List[dict]:
+        """
+        Synchronous method for polling the unfinished tasks of the journal, without paying for them again
+
+        Examples:
+            >>> solver.set_journal(TaskJournal("anticaptcha-journal.sqlite3"))
+            >>> solver.resume_tasks()
+            [{"errorId": 0, "status": "ready", "taskId": 4242, ...}]
+
+        Returns:
+            Results of the unfinished tasks, oldest task first
+
+        Notes:
+            Call it on startup, before new tasks are solved - running tasks are unfinished too.
+            Every task is polled with its own API key and task type, whatever the solver type is.
+        """
+        if self.engine is not None:
+            return self.engine.run(self.aio_resume_tasks())
+        return [
+            _lazy.SIOCaptchaInstrument(captcha_params=self).processing_resume(entry)
+            for entry in self._unfinished_tasks()
+        ]
+
+    async def aio_resume_tasks(self) -> List[dict]:
+        """
+        Asynchronous method for polling the unfinished tasks of the journal, tasks are polled concurrently
+
+        Returns:
+            Results of the unfinished tasks, oldest task first
+
+        Notes:
+            Check ``resume_tasks`` for more info
+        """
+        import asyncio
+
+        return list(
+            await asyncio.gather(
+                *(
+                    _lazy.AIOCaptchaInstrument(captcha_params=self).processing_resume(entry)
+                    for entry in self._unfinished_tasks()
+                )
+            )
+        )
+
+    def _unfinished_tasks(self) -> List["JournalEntry"]:
+        if self.journal is None:
+            raise ValueError("Task journal is not set, call `set_journal` first")
+        return self.journal.unfinished()
+
     def captcha_handler(self, **additional_params) -> dict:
         """
         Synchronous method for captcha solving
@@ -58,9 +332,9 @@ class CaptchaParams(SIOContextManager, AIOContextManager):
         Notes:
             Check class docstirng for more info
         """
-        self.task_params.update({**additional_params})
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
-        return self._captcha_handling_instrument.processing_captcha()
+        if self.engine is not None:
+            return self.engine.run(self.aio_captcha_handler(**additional_params))
+        return _lazy.SIOCaptchaInstrument(captcha_params=self, task_params=additional_params).processing_captcha()
 
     async def aio_captcha_handler(self, **additional_params) -> dict:
         """
@@ -77,6 +351,143 @@ class CaptchaParams(SIOContextManager, AIOContextManager):
         Notes:
             Check class docstirng for more info
         """
-        self.task_params.update({**additional_params})
-        self._captcha_handling_instrument = AIOCaptchaInstrument(captcha_params=self)
-        return await self._captcha_handling_instrument.processing_captcha()
+        return await _lazy.AIOCaptchaInstrument(captcha_params=self, task_params=additional_params).processing_captcha()
+
+    def solve_many(
+        self, inputs: Iterable[Optional[dict]], concurrency: int = 10, return_exceptions: bool = False
+    ) -> List["BatchResult"]:
+        """
+        Synchronous method for batch captcha solving with bounded concurrency
+
+        Args:
+            inputs: Keyword arguments for the handler of every task, like
+                        ``{"captcha_file": "img.png"}`` or ``{"websiteURL": "https://..."}``
+            concurrency: Maximum number of tasks submitted and polled at the same time
+            return_exceptions: True - exceptions are returned as results,
+                                False - the first exception cancels the batch and is raised
+
+        Examples:
+            >>> ImageToText(api_key="99d7d111a0111dc11184111c8bb111da").solve_many(
+            ...     [{"captcha_file": "files/captcha-image.jpg"}, {"captcha_link": "https://........../img.jpg"}],
+            ...     concurrency=50,
+            ... )
+            [{"errorId": 0, "status": "ready", ...}, {"errorId": 0, "status": "ready", ...}]
+
+        Returns:
+            List of results in input order
+
+        Notes:
+            Runs the async batch in a new event loop, can't be called from a running loop.
+            The session of the loop is closed when the batch ends
+        """
+        import asyncio
+
+        async def run() -> List["BatchResult"]:
+            try:
+                return await self.aio_solve_many(
+                    inputs=inputs, concurrency=concurrency, return_exceptions=return_exceptions
+                )
+            finally:
+                await self.aio_close()
+
+        return asyncio.run(run())
+
+    def solve_many_sync(
+        self,
+        inputs: Iterable[Optional[dict]],
+        max_workers: int = 10,
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> List["BatchResult"]:
+        """
+        Synchronous method for batch captcha solving in a thread pool, without asyncio
+
+        Args:
+            inputs: Keyword arguments for the handler of every task
+            max_workers: Number of worker threads, i.e. tasks submitted and polled at the same time
+            timeout: Time limit of the whole batch in seconds, ``None`` - no limit
+            return_exceptions: True - exceptions are returned as results,
+                                False - the first exception stops the batch and is raised
+
+        Examples:
+            >>> ImageToText(api_key="99d7d111a0111dc11184111c8bb111da").solve_many_sync(
+            ...     [{"captcha_file": "files/captcha-image.jpg"}, {"captcha_link": "https://........../img.jpg"}],
+            ...     max_workers=50,
+            ...     timeout=600,
+            ... )
+            [{"errorId": 0, "status": "ready", ...}, {"errorId": 0, "status": "ready", ...}]
+
+        Returns:
+            List of results in input order
+
+        Notes:
+            Works inside Django views and Celery tasks. Check ``executor`` for futures,
+            ``as_completed`` iteration and cancellation.
+        """
+        with self.executor(max_workers=max_workers) as executor:
+            return executor.solve_many(inputs=inputs, timeout=timeout, return_exceptions=return_exceptions)
+
+    def executor(self, max_workers: int = 10) -> "SolveExecutor":
+        """
+        Method create a thread pool running ``captcha_handler`` of the solver
+
+        Args:
+            max_workers: Number of worker threads, the shared sync connection pool is grown to it
+
+        Examples:
+            >>> with solver.executor(max_workers=20) as executor:
+            ...     futures = [executor.submit(captcha_file=path) for path in paths]
+            ...     for index, result in executor.as_completed(inputs, timeout=300):
+            ...         ...
+
+        Returns:
+            ``SolveExecutor``, use it as a context manager to stop the threads
+        """
+        return _lazy.SolveExecutor(captcha_params=self, max_workers=max_workers)
+
+    async def aio_solve_many(
+        self, inputs: Iterable[Optional[dict]], concurrency: int = 10, return_exceptions: bool = False
+    ) -> List["BatchResult"]:
+        """
+        Asynchronous method for batch captcha solving with bounded concurrency
+
+        Examples:
+            >>> await Turnstile(
+            ...     api_key="99d7d111a0111dc11184111c8bb111da",
+            ...     captcha_type="TurnstileTaskProxyless",
+            ...     websiteURL="https://demo.turnstile.workers.dev/",
+            ...     websiteKey="1x00000000000000000000AA",
+            ... ).aio_solve_many([{}] * 5000, concurrency=200)
+            [{"errorId": 0, "status": "ready", ...}, ...]
+
+        Returns:
+            List of results in input order
+
+        Notes:
+            Check ``solve_many`` for arguments description
+        """
+        return await _lazy.aio_solve_many(
+            captcha_params=self, inputs=inputs, concurrency=concurrency, return_exceptions=return_exceptions
+        )
+
+    def aio_solve_as_completed(
+        self, inputs: Iterable[Optional[dict]], concurrency: int = 10, return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[int, "BatchResult"]]:
+        """
+        Asynchronous iterator for batch captcha solving, results are yielded as soon as they are ready
+
+        Examples:
+            >>> async for index, result in ImageToText(
+            ...     api_key="99d7d111a0111dc11184111c8bb111da"
+            ... ).aio_solve_as_completed(({"captcha_file": path} for path in paths), concurrency=50):
+            ...     print(index, result["solution"])
+
+        Returns:
+            Async iterator of ``(input index, result)`` tuples in completion order
+
+        Notes:
+            Check ``solve_many`` for arguments description
+        """
+        return _lazy.aio_solve_as_completed(
+            captcha_params=self, inputs=inputs, concurrency=concurrency, return_exceptions=return_exceptions
+        )
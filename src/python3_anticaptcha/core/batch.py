@@ -0,0 +1,95 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+__all__ = ("aio_solve_as_completed", "aio_solve_many")
+
+BatchResult = Union[dict, BaseException]
+
+
+async def aio_solve_as_completed(
+    captcha_params: "CaptchaParams",
+    inputs: Iterable[Optional[dict]],
+    concurrency: int = 10,
+    return_exceptions: bool = False,
+) -> AsyncIterator[Tuple[int, BatchResult]]:
+    """
+    Async generator solving every input with at most ``concurrency`` tasks in flight
+
+    Args:
+        captcha_params: Configured solver used as a template for every task
+        inputs: Keyword arguments for ``aio_captcha_handler`` of every task, like
+                    ``{"captcha_file": "img.png"}`` or ``{"websiteURL": "https://..."}``
+        concurrency: Maximum number of tasks submitted and polled at the same time
+        return_exceptions: True - exceptions are yielded as results,
+                            False - the first exception cancels the batch and is raised
+
+    Yields:
+        Tuple of input index and the solving result, in completion order
+
+    Notes:
+        Inputs are pulled lazily, so memory usage depends on ``concurrency``, not on the inputs size.
+        All tasks share the pooled async transport of ``captcha_params``.
+    """
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be a positive number")
+
+    source = enumerate(inputs)
+    results: asyncio.Queue = asyncio.Queue()
+    done_marker = object()
+
+    async def worker():
+        try:
+            for index, task_kwargs in source:
+                try:
+                    result = await captcha_params.aio_captcha_handler(**(task_kwargs or {}))
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    result = error
+                await results.put((index, result))
+        except BaseException as error:
+            await results.put((None, error))
+            raise
+        finally:
+            await results.put(done_marker)
+
+    async with captcha_params:
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                item = await results.get()
+                if item is done_marker:
+                    running -= 1
+                    continue
+                index, result = item
+                if index is None:
+                    raise result
+                yield index, result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def aio_solve_many(
+    captcha_params: "CaptchaParams",
+    inputs: Iterable[Optional[dict]],
+    concurrency: int = 10,
+    return_exceptions: bool = False,
+) -> List[BatchResult]:
+    """
+    Solve every input with bounded concurrency and return results in input order
+
+    Notes:
+        Check ``aio_solve_as_completed`` for arguments description
+    """
+    results: Dict[int, BatchResult] = {}
+    async for index, result in aio_solve_as_completed(
+        captcha_params=captcha_params,
+        inputs=inputs,
+        concurrency=concurrency,
+        return_exceptions=return_exceptions,
+    ):
+        results[index] = result
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,94 @@
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .enum import ResponseStatusEnm
+from .serializer import JSON_ENCODER
+
+__all__ = ("ResultCache",)
+
+
+class ResultCache:
+    """
+    Content-hash cache of image captcha results
+
+    Results are keyed by SHA-256 of the image bytes plus all other task options
+    (`type`, `numeric`, `case`, `math`, `comment` and etc.), so the same image sent with
+    other options is solved again. Only `ready` results are stored.
+
+    Args:
+        maxsize: Maximum number of stored results, least recently used are evicted first
+        ttl: Seconds a result is kept, ``None`` - until evicted by size
+
+    Examples:
+        >>> cache = ResultCache(maxsize=5000, ttl=24 * 60 * 60)
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.set_result_cache(cache)
+        >>> solver.captcha_handler(captcha_file="captcha.png")  # paid task
+        >>> solver.captcha_handler(captcha_file="captcha.png")  # served from the cache
+
+    Notes:
+        One cache can be shared by many solvers and threads.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._results: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def key(task: dict) -> Optional[str]:
+        """
+        Method build cache key of the task, ``None`` if the task has no image body
+
+        Args:
+            task: `task` payload with `body` - raw image buffer or base64 encoded `str`
+        """
+        body = task.get("body")
+        if not body:
+            return None
+        if isinstance(body, str):
+            body = base64.b64decode(body)
+        digest = hashlib.sha256(body)
+        digest.update(JSON_ENCODER.encode({name: task[name] for name in sorted(task) if name != "body"}))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Method return copy of the stored result, ``None`` if it is missing or expired
+        """
+        with self._lock:
+            item = self._results.get(key)
+            if item is None:
+                return None
+            expires, result = item
+            if expires < time.monotonic():
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+        return {**result, "solution": dict(result.get("solution") or {})}
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        Method store the result, anything but successful `ready` results is ignored
+        """
+        if result.get("errorId") or result.get("status") != ResponseStatusEnm.ready:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._results[key] = (expires, {**result, "solution": dict(result.get("solution") or {})})
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
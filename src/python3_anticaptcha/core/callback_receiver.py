@@ -0,0 +1,183 @@
+import asyncio
+import hmac
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional
+
+from aiohttp import web
+
+from .polling import StaticPollingProfile
+from .serializer import GET_TASK_RESULT_RESPONSE_DECODER
+
+__all__ = ("CallbackReceiver",)
+
+
+class CallbackReceiver:
+    """
+    Embedded aiohttp web receiver for `callbackUrl` results
+
+    Every created task is registered as a future which is resolved the moment anti-captcha
+    POSTs the result. Tasks whose callback is overdue fall back to slow `getTaskResult` polling.
+
+    The endpoint URL ends with a random secret, requests without it are rejected,
+    so nobody who can reach the port is able to post a forged solution by a guessed `taskId`.
+
+    Args:
+        host: Interface to listen on, expose the receiver with a reverse proxy or ``0.0.0.0``
+        port: Port to listen on, ``0`` - pick a free port on start
+        path: URL path of the callback endpoint, the secret is appended to it
+        public_url: Externally reachable address of ``path``, the secret is appended to it
+                        and the result is sent to the service as `callbackUrl`.
+                        By default built from ``host``, ``port`` and ``path``
+        secret: Secret part of the callback URL, random by default
+        overdue_after: Seconds to wait for the callback before polling the task
+        fallback_interval: Seconds between `getTaskResult` calls for overdue tasks
+        max_unclaimed: Number of results kept for callbacks which arrive before the task is registered
+
+    Examples:
+        >>> async with CallbackReceiver(port=8080, public_url="https://my.host/anticaptcha/callback") as receiver:
+        ...     # anti-captcha posts to https://my.host/anticaptcha/callback/<secret>
+        ...     solver = Turnstile(...)
+        ...     solver.set_callback_receiver(receiver)
+        ...     await solver.aio_captcha_handler()
+
+    Notes:
+        https://anti-captcha.com/apidoc/methods/createTask
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        path: str = "/anticaptcha/callback",
+        public_url: Optional[str] = None,
+        secret: Optional[str] = None,
+        overdue_after: float = 120,
+        fallback_interval: float = 30,
+        max_unclaimed: int = 1000,
+    ):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.public_url = public_url
+        self.secret = secret or secrets.token_urlsafe(16)
+        self.overdue_after = overdue_after
+        self.fallback_interval = fallback_interval
+        self.max_unclaimed = max_unclaimed
+
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._unclaimed: "OrderedDict[int, dict]" = OrderedDict()
+        self._runner: Optional[web.AppRunner] = None
+        # the server and the solvers may run in different threads and loops
+        self._lock = threading.Lock()
+
+    @property
+    def callback_url(self) -> str:
+        base = self.public_url or f"http://{self.host}:{self.port}{self.path}"
+        return f"{base.rstrip('/')}/{self.secret}"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+        if exc_type:
+            return False
+        return True
+
+    async def start(self) -> None:
+        """
+        Method start listening for callbacks
+        """
+        app = web.Application()
+        app.router.add_post(f"{self.path.rstrip('/')}/{{secret}}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """
+        Method stop the web server and cancel all pending waiters
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        with self._lock:
+            waiters = list(self._waiters.values())
+            self._waiters.clear()
+            self._unclaimed.clear()
+        for future in waiters:
+            self._call_in_loop(future, future.cancel)
+
+    def register(self, task_id: int) -> asyncio.Future:
+        """
+        Method register created task and return the future resolved by its callback
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            result = self._unclaimed.pop(task_id, None)
+            if result is None:
+                self._waiters[task_id] = future
+        if result is not None:
+            future.set_result(result)
+        return future
+
+    def unregister(self, task_id: int) -> None:
+        with self._lock:
+            future = self._waiters.pop(task_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def fallback_schedule(self) -> Iterator[float]:
+        """
+        Polling schedule for tasks whose callback is overdue - poll right away, then slowly
+        """
+        return StaticPollingProfile(first_delay=0, interval=self.fallback_interval).delays()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not hmac.compare_digest(request.match_info.get("secret", ""), self.secret):
+            logging.warning("Anti-captcha callback without the receiver secret is rejected")
+            return web.Response(status=403)
+        try:
+            captcha_response = GET_TASK_RESULT_RESPONSE_DECODER.decode(await request.read())
+            task_id = int(captcha_response.taskId or request.query["taskId"])
+        except Exception as error:
+            logging.warning("Invalid anti-captcha callback: %s", error)
+            return web.Response(status=400)
+
+        captcha_response.taskId = task_id
+        result = captcha_response.to_dict()
+        with self._lock:
+            future = self._waiters.pop(task_id, None)
+            if future is None:
+                # the callback beat `createTask` response - keep the result until the task is registered
+                self._unclaimed[task_id] = result
+                while len(self._unclaimed) > self.max_unclaimed:
+                    self._unclaimed.popitem(last=False)
+        if future is not None:
+            self._call_in_loop(future, self._set_result, future, result)
+        return web.Response(text="OK")
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: dict) -> None:
+        if not future.done():
+            future.set_result(result)
+
+    @staticmethod
+    def _call_in_loop(future: asyncio.Future, callback: Callable, *args) -> None:
+        # the future belongs to the loop of the solver, e.g. the background engine, not of the server
+        loop = future.get_loop()
+        if loop is asyncio.get_running_loop():
+            callback(*args)
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # the loop of the solver is closed - nobody waits for the result
+            pass
@@ -1,12 +1,32 @@
+import io
+import logging
+import mmap
 import os
 import shutil
+import sys
+import time
 import uuid
 from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple, Union
 
-from .serializer import GetTaskResultResponseSer
+from msgspec import structs
+
+from .enum import LifecycleEventEnm, RateLimitScopeEnm, ResponseStatusEnm
+from .hooks import LifecycleEvent
+from .polling import StaticPollingProfile
+from .serializer import JSON_ENCODER, CreateTaskResponseSer, GetTaskResultResponseSer
 
 __all__ = ("CaptchaInstrument",)
 
+# image body accepted by the task payload - `str` is already base64 encoded,
+# binary buffers are base64 encoded by msgspec straight into the request body
+ImageBody = Union[str, bytes, bytearray, memoryview]
+CaptchaFile = Union[str, os.PathLike, BinaryIO]
+
+
+def _noop() -> None:
+    pass
+
 
 class FileInstrument:
     @staticmethod
@@ -17,6 +37,41 @@ class FileInstrument:
         with open(captcha_file, "rb") as file:
             return file.read()
 
+    @staticmethod
+    def _map_file_captcha(captcha_file: CaptchaFile) -> Tuple[Union[bytes, memoryview], Callable[[], None]]:
+        """
+        Method map local file or binary file object into memory, so the image is not copied before sending
+
+        Empty files, pipes and partially read file objects can't be mapped - they are read as usual.
+
+        Returns:
+            Image buffer and the callable which releases it
+        """
+        if isinstance(captcha_file, io.BytesIO) and not captcha_file.tell():
+            view = captcha_file.getbuffer()
+            return view, view.release
+
+        owned = not hasattr(captcha_file, "read")
+        file = open(captcha_file, "rb") if owned else captcha_file
+        try:
+            if file.tell():
+                return file.read(), _noop
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError):
+                return file.read(), _noop
+        finally:
+            if owned:
+                file.close()
+
+        view = memoryview(mapped)
+
+        def release():
+            view.release()
+            mapped.close()
+
+        return view, release
+
     @staticmethod
     def _file_const_saver(content: bytes, file_path: str, file_extension: str = "png") -> str:
         """
@@ -50,6 +105,7 @@ class FileInstrument:
 
 class CaptchaInstrument(FileInstrument):
     NO_CAPTCHA_ERR = "You did not send any file, local link or URL."
+    DEADLINE_ERR = "ERROR_DEADLINE_EXCEEDED"
     """
     Basic Captcha solving class
 
@@ -62,3 +118,365 @@ class CaptchaInstrument(FileInstrument):
 
     def __init__(self):
         self.result = GetTaskResultResponseSer()
+        # delays before each `getTaskResult` call, prepared when the task is created
+        self.poll_delays: Optional[Iterator[float]] = None
+        # releases memory-mapped image body once the task payload is encoded
+        self._body_release: Optional[Callable[[], None]] = None
+        # lifecycle timestamps and counters, sent to the hooks
+        self.started_at = time.monotonic()
+        self.sent_at: Optional[float] = None
+        self.created_at: Optional[float] = None
+        self.poll_count = 0
+        # hash of the encoded `createTask` payload, computed only for the task journal
+        self.payload_hash: Optional[str] = None
+        # encoded `createTask` payload, kept only while the error policy may send it again
+        self._create_task_data: Optional[bytes] = None
+        # seconds after task creation when the duplicate task is created, ``None`` - not hedged
+        self.hedge_after: Optional[float] = None
+        self.hedged = False
+
+    @property
+    def captcha_type(self) -> Optional[str]:
+        return self.context.create_task_payload.task.get("type")
+
+    def _polling_schedule(self) -> Iterator[float]:
+        """
+        Method prepare adaptive polling schedule for the current captcha type
+        """
+        first_delay = self._queue_first_delay()
+        if first_delay is not None:
+            self.poll_delays = StaticPollingProfile(
+                first_delay=first_delay, interval=self.captcha_params.sleep_time
+            ).delays()
+        else:
+            self.poll_delays = self.captcha_params.polling_profiles.schedule(
+                captcha_type=self.captcha_type, sleep_time=self.captcha_params.sleep_time
+            )
+        return self.poll_delays
+
+    def _queue_first_delay(self) -> Optional[float]:
+        """
+        Method return first poll delay from the queue speed, learned solve times of the captcha type win
+        """
+        monitor = self.captcha_params.queue_monitor
+        if monitor is None:
+            return None
+        profiles = self.captcha_params.polling_profiles
+        if profiles.quantile(self.captcha_type, profiles.first_quantile) is not None:
+            return None
+        return monitor.first_poll_delay(self.captcha_type)
+
+    def _queue_hold_delay(self, stats: Optional["QueueStats"], held: float) -> Optional[float]:
+        """
+        Method return seconds a non-urgent task waits for the queue load to drop, ``None`` - create it now
+        """
+        monitor = self.captcha_params.queue_monitor
+        if not self.captcha_params.queue_hold or held >= monitor.max_hold or not monitor.overloaded(stats):
+            return None
+        return min(monitor.hold_interval, monitor.max_hold - held)
+
+    def _next_poll_delay(self) -> float:
+        if self.poll_delays is None:
+            self._polling_schedule()
+        return next(self.poll_delays)
+
+    def _observe_result(self, status: str, create_time: Optional[int], end_time: Optional[int]) -> None:
+        """
+        Method feed solve time of a ready task to the polling profile engine
+        """
+        if status == ResponseStatusEnm.ready:
+            self.captcha_params.polling_profiles.observe(
+                captcha_type=self.captcha_type, create_time=create_time, end_time=end_time
+            )
+
+    def _set_body(self, body: ImageBody) -> None:
+        """
+        Method put image into the task payload without encoding it
+
+        Binary buffers are base64 encoded once, while the request body is serialized,
+        `str` is sent as is, since it is already base64 encoded.
+        """
+        self.context.create_task_payload.task.update({"body": body})
+
+    def _set_file_body(self, captcha_file: CaptchaFile) -> None:
+        body, self._body_release = self._map_file_captcha(captcha_file=captcha_file)
+        self._set_body(body)
+
+    def _release_body(self) -> None:
+        """
+        Method drop memory-mapped image from the task payload and close the mapping
+        """
+        if self._body_release is not None:
+            self.context.create_task_payload.task.pop("body", None)
+            self._body_release()
+            self._body_release = None
+
+    def _emit(
+        self,
+        event: LifecycleEventEnm,
+        status: Optional[str] = None,
+        error_code: Optional[str] = None,
+        cost: Optional[float] = None,
+    ) -> None:
+        """
+        Method send lifecycle event to the registered hooks, costs one check when there are no hooks
+        """
+        hooks = self.captcha_params.hooks
+        if not hooks:
+            return
+        lifecycle_event = LifecycleEvent(
+            event=event,
+            captcha_type=self.captcha_type,
+            timestamp=time.monotonic(),
+            started_at=self.started_at,
+            sent_at=self.sent_at,
+            created_at=self.created_at,
+            task_id=self.context.get_result_params.taskId,
+            poll_count=self.poll_count,
+            status=status,
+            error_code=error_code,
+            cost=cost,
+        )
+        for hook in hooks:
+            try:
+                hook(lifecycle_event)
+            except Exception:
+                logging.exception("Lifecycle hook %r failed on %s event", hook, event.value)
+
+    def _emit_result(self, result: Optional[dict]) -> None:
+        """
+        Method send terminal event of the solve call, called while the solve exception is propagated too
+        """
+        if not self.captcha_params.hooks:
+            return
+        if result is None:
+            error = sys.exc_info()[0]
+            self._emit(LifecycleEventEnm.FAILED, error_code=error.__name__ if error else None)
+        elif result.get("errorId") == 0 and result.get("status") == ResponseStatusEnm.ready:
+            self._emit(LifecycleEventEnm.SOLVED, status=result["status"], cost=result.get("cost"))
+        else:
+            self._emit(
+                LifecycleEventEnm.FAILED,
+                status=result.get("status"),
+                error_code=result.get("errorCode"),
+                cost=result.get("cost"),
+            )
+
+    def _deadline_result(self) -> dict:
+        """
+        Method return partial result of the task whose solve deadline expired
+        """
+        return GetTaskResultResponseSer(
+            errorId=1,
+            errorCode=self.DEADLINE_ERR,
+            errorDescription="Solve deadline expired before the task was ready",
+            status=ResponseStatusEnm.processing,
+            taskId=self.context.get_result_params.taskId,
+        ).to_dict()
+
+    def _checkout_key(self) -> Optional[str]:
+        """
+        Method pick API key of the task from the key pool, if the pool is set
+        """
+        pool = self.captcha_params.key_pool
+        if pool is None:
+            return None
+        if pool.strategy == "balance":
+            pool.refresh_balances()
+        return self._use_key(pool.acquire())
+
+    async def _aio_checkout_key(self) -> Optional[str]:
+        pool = self.captcha_params.key_pool
+        if pool is None:
+            return None
+        if pool.strategy == "balance":
+            await pool.aio_refresh_balances()
+        return self._use_key(pool.acquire())
+
+    def _use_key(self, key: str) -> str:
+        # `getTaskResult` must be sent with the key which created the task
+        self.context.create_task_payload.clientKey = key
+        self.context.get_result_params.clientKey = key
+        return key
+
+    def _checkin_key(self, key: Optional[str], result: Optional[dict]) -> None:
+        if key is not None:
+            result = result or {}
+            self.captcha_params.key_pool.release(key, error_code=result.get("errorCode"), cost=result.get("cost"))
+
+    def _acquire_rate_limit(self, scope: RateLimitScopeEnm) -> None:
+        """
+        Method wait until the client-side rate limiter allows the call, if the limiter is set,
+            the wait is clipped to the solve deadline
+        """
+        if self.captcha_params.rate_limiter is not None:
+            self.captcha_params.rate_limiter.acquire(
+                scope=scope, api_key=self.context.create_task_payload.clientKey, max_wait=self.deadline.remaining()
+            )
+            self.deadline.check()
+
+    async def _aio_acquire_rate_limit(self, scope: RateLimitScopeEnm) -> None:
+        if self.captcha_params.rate_limiter is not None:
+            await self.captcha_params.rate_limiter.aio_acquire(
+                scope=scope, api_key=self.context.create_task_payload.clientKey, max_wait=self.deadline.remaining()
+            )
+            self.deadline.check()
+
+    def _result_cache_key(self) -> Optional[str]:
+        """
+        Method return result cache key of the image task, ``None`` if the cache is not set
+        """
+        if self.captcha_params.result_cache is None:
+            return None
+        return self.captcha_params.result_cache.key(self.context.create_task_payload.task)
+
+    def _encode_create_task(self) -> bytes:
+        """
+        Method encode `createTask` payload, image body is written into the request buffer once
+        """
+        if self._create_task_data is not None:
+            return self._create_task_data
+        try:
+            data = JSON_ENCODER.encode(self.context.create_task_payload)
+            if self.captcha_params.journal is not None:
+                self.payload_hash = self.captcha_params.journal.payload_hash(data)
+            # the image body is released below, a retried or hedged `createTask` sends the same bytes
+            if self.captcha_params.error_policy is not None or self.captcha_params.hedge_policy is not None:
+                self._create_task_data = data
+            return data
+        finally:
+            self._release_body()
+
+    def _create_task_http_error(self, status: int) -> Optional[CreateTaskResponseSer]:
+        """
+        Method turn 5xx `createTask` response into the error result, if the error policy is set
+        """
+        if self.captcha_params.error_policy is None or status < 500:
+            return None
+        return CreateTaskResponseSer(
+            errorId=1, errorCode=f"HTTP_{status}", errorDescription=f"`createTask` failed with HTTP status {status}"
+        )
+
+    def _create_task_retry_delay(self, created_task: CreateTaskResponseSer, attempt: int) -> Optional[float]:
+        """
+        Method ask the error policy whether the failed `createTask` is sent again
+
+        Returns:
+            Seconds to wait before the next `createTask`, ``None`` - the result is final
+        """
+        policy = self.captcha_params.error_policy
+        if policy is None:
+            return None
+        if created_task.errorId == 0:
+            policy.on_success()
+            return None
+        delay = policy.on_error(created_task.errorCode, attempt)
+        if delay is not None:
+            logging.warning("`createTask` failed with %s, retry in %.2fs", created_task.errorCode, delay)
+        return delay
+
+    def _create_task_pause(self) -> float:
+        """
+        Method return seconds left of the `createTask` pause of the error policy
+        """
+        policy = self.captcha_params.error_policy
+        return 0.0 if policy is None else policy.pause_remaining()
+
+    def _journal_created(self, task_id: Optional[int] = None) -> None:
+        """
+        Method record the created task in the journal, if the journal is set
+        """
+        if self.captcha_params.journal is not None:
+            self.captcha_params.journal.record(
+                task_id=task_id or self.context.get_result_params.taskId,
+                captcha_type=self.captcha_type,
+                client_key=self.context.get_result_params.clientKey,
+                payload_hash=self.payload_hash,
+            )
+
+    def _journal_result(self, result: Optional[dict]) -> None:
+        """
+        Method mark the task finished in the journal, unless it may still be resumed
+        """
+        journal = self.captcha_params.journal
+        task_id = self.context.get_result_params.taskId
+        if journal is None or task_id is None or result is None:
+            return
+        # an expired deadline or exhausted attempts leave the task `processing` on the service side
+        if result.get("status") == ResponseStatusEnm.processing or result.get("errorCode") == self.DEADLINE_ERR:
+            return
+        journal.finish(task_id=task_id, status=result.get("status"), error_code=result.get("errorCode"))
+
+    def _schedule_hedge(self) -> None:
+        """
+        Method set the delay of the duplicate task, the encoded payload is kept only for it
+        """
+        policy = self.captcha_params.hedge_policy
+        if policy is not None:
+            self.hedge_after = policy.hedge_after(self.captcha_type, self.captcha_params.polling_profiles)
+        if self.hedge_after is None:
+            self._create_task_data = None
+
+    def _hedge_due(self) -> bool:
+        """
+        Method check whether the duplicate task must be created now and take it from the budget
+        """
+        if self.hedge_after is None or self.hedged or time.monotonic() - self.created_at < self.hedge_after:
+            return False
+        if not self.captcha_params.hedge_policy.acquire():
+            return False
+        self.hedged = True
+        return True
+
+    @staticmethod
+    def _hedge_error(error: Exception) -> CreateTaskResponseSer:
+        return CreateTaskResponseSer(errorId=1, errorCode=type(error).__name__, errorDescription=str(error))
+
+    def _hedge_created(self, created_task: CreateTaskResponseSer, polled: Dict[int, bytes]) -> None:
+        """
+        Method add the duplicate task to the polled ones
+        """
+        if created_task.errorId:
+            self._emit(LifecycleEventEnm.HEDGED, error_code=created_task.errorCode)
+            return
+        self._emit(LifecycleEventEnm.HEDGED)
+        polled[created_task.taskId] = JSON_ENCODER.encode(
+            structs.replace(self.context.get_result_params, taskId=created_task.taskId)
+        )
+        self._journal_created(task_id=created_task.taskId)
+
+    def _drop_hedged_task(self, task_id: int, polled: Dict[int, bytes], result: dict) -> None:
+        """
+        Method stop polling one of the hedged tasks which failed, the other one goes on
+        """
+        polled.pop(task_id)
+        self._journal_finish(task_id, result)
+        if self.context.get_result_params.taskId == task_id:
+            self.context.get_result_params.taskId = next(iter(polled))
+
+    def _settle_hedge(self, task_id: int, polled: Dict[int, bytes]) -> None:
+        """
+        Method make the first ready task the result of the call and abandon the other one
+        """
+        if len(polled) == 1:
+            return
+        self.context.get_result_params.taskId = task_id
+        for other_id in polled:
+            if other_id != task_id:
+                self._journal_finish(other_id, {"status": "abandoned"})
+
+    def _journal_finish(self, task_id: int, result: dict) -> None:
+        if self.captcha_params.journal is not None:
+            self.captcha_params.journal.finish(
+                task_id=task_id, status=result.get("status"), error_code=result.get("errorCode")
+            )
+
+    def _attach(self, entry: "JournalEntry") -> None:
+        """
+        Method point the instrument to the journaled task, so it is polled instead of created
+        """
+        self.context.create_task_payload.task["type"] = entry.captcha_type
+        # the task belongs to the journaled key - polls are rate-limited and duplicates billed under it
+        self.context.create_task_payload.clientKey = entry.client_key
+        self.context.get_result_params.clientKey = entry.client_key
+        self.context.get_result_params.taskId = entry.task_id
@@ -1,13 +1,24 @@
-import urllib3
-from requests.adapters import Retry
-from tenacity import AsyncRetrying, stop_after_attempt, wait_fixed
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-RETRIES = Retry(total=5, backoff_factor=0.9, status_forcelist=[500, 502, 503, 504])
-ASYNC_RETRIES = AsyncRetrying(wait=wait_fixed(5), stop=stop_after_attempt(5), reraise=True)
+# default timeouts of every HTTP call, seconds
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
 
 BASE_REQUEST_URL = "https://api.anti-captcha.com/"
 CREATE_TASK_POSTFIX = "/createTask"
 GET_RESULT_POSTFIX = "/getTaskResult"
 APP_KEY = "867"
+
+
+def __getattr__(name: str):
+    # retry policies import their transport libraries, so they are built on first use
+    if name == "RETRIES":
+        from urllib3.util.retry import Retry
+
+        value = Retry(total=5, backoff_factor=0.9, status_forcelist=[500, 502, 503, 504])
+    elif name == "ASYNC_RETRIES":
+        from tenacity import AsyncRetrying, stop_after_attempt, wait_fixed
+
+        value = AsyncRetrying(wait=wait_fixed(5), stop=stop_after_attempt(5), reraise=True)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
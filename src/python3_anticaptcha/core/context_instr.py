@@ -1,8 +1,14 @@
+from .aio_session import AIO_SESSION_POOL, AIOSessionPool
+from .sio_session import SIO_SESSION_POOL, SIOSessionPool
+
 __all__ = ("SIOContextManager", "AIOContextManager")
 
 
 class SIOContextManager:
-    # Context methods
+    # shared keep-alive connection pool used by sync instruments
+    sio_session_pool: SIOSessionPool = SIO_SESSION_POOL
+
+    # Context methods, the shared pool outlives the block - it is closed only by `close()`
     def __enter__(self):
         return self
 
@@ -11,9 +17,18 @@ class SIOContextManager:
             return False
         return True
 
+    def close(self) -> None:
+        """
+        Method close pooled sync connections, next request will open a new pool
+        """
+        self.sio_session_pool.close()
+
 
 class AIOContextManager:
-    # Context methods
+    # shared per-loop aiohttp session used by async instruments
+    aio_session_pool: AIOSessionPool = AIO_SESSION_POOL
+
+    # Context methods, the shared session outlives the block - it is closed only by `aio_close()`
     async def __aenter__(self):
         return self
 
@@ -21,3 +36,9 @@ class AIOContextManager:
         if exc_type:
             return False
         return True
+
+    async def aio_close(self) -> None:
+        """
+        Method close the async session of the running event loop, next request will open a new one
+        """
+        await self.aio_session_pool.close()
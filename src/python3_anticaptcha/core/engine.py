@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+from .aio_session import AIO_SESSION_POOL
+
+__all__ = ("AIOEngine", "ENGINE")
+
+
+class AIOEngine:
+    """
+    Background thread with an event loop which runs async solves for sync callers
+
+    A sync ``captcha_handler`` of a solver with an engine submits ``aio_captcha_handler``
+    to the engine loop and waits on a future. Polling sleeps are timers of the loop,
+    so thousands of pending solves share one thread, its aiohttp session and the optional ``AIOPoller``.
+
+    Args:
+        name: Name of the engine thread
+
+    Examples:
+        >>> solver = Turnstile(api_key="99d7d111a0111dc11184111c8bb111da", ...)
+        >>> solver.set_engine()  # process-wide `ENGINE`
+        >>> solver.captcha_handler()  # blocks the calling thread only
+        {"errorId": 0, "status": "ready", ...}
+
+    Notes:
+        The thread is started on the first submitted solve and is a daemon, so it never
+        blocks interpreter exit. ``stop()`` closes the loop and its session, the next solve starts it again.
+    """
+
+    def __init__(self, name: str = "anticaptcha-engine"):
+        self.name = name
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop of the engine thread, the thread is started on first access
+        """
+        loop = self._loop
+        if loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+                loop = self._loop
+        return loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Method schedule a coroutine on the engine loop
+
+        Args:
+            coro: Coroutine to run, like ``solver.aio_captcha_handler()``
+
+        Returns:
+            ``concurrent.futures.Future`` of the coroutine result, cancelling it cancels the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Method run a coroutine on the engine loop and wait for its result in the calling thread
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait for the result, ``None`` - no limit
+
+        Returns:
+            Result of the coroutine
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise ValueError("Sync handler can't be called from the engine loop, await `aio_captcha_handler` instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except BaseException:
+            # the caller gave up - timeout or KeyboardInterrupt, the solve must not keep running
+            future.cancel()
+            raise
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Method cancel running solves, close the session of the engine loop and stop the thread
+
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+
+    def _start(self) -> None:
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, args=(self._loop, started), name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+        loop.close()
+
+    @staticmethod
+    async def _shutdown() -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await AIO_SESSION_POOL.close()
+
+
+# process-wide default engine shared by all sync solvers which opted in
+ENGINE = AIOEngine()
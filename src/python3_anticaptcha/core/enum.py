@@ -112,3 +112,36 @@ class ControlPostfixEnm(str, MyEnum):
 class SaveFormatsEnm(str, MyEnum):
     TEMP = "temp"
     CONST = "const"
+
+
+class RateLimitScopeEnm(str, MyEnum):
+    """
+    Enum with groups of API methods limited by the client-side rate limiter
+    """
+
+    CREATE_TASK = "createTask"
+    GET_TASK_RESULT = "getTaskResult"
+    CONTROL = "control"
+
+
+class LifecycleEventEnm(str, MyEnum):
+    """
+    Enum with lifecycle events of one solve call, sent to the registered hooks
+    """
+
+    TASK_SENT = "task_sent"
+    TASK_CREATED = "task_created"
+    POLLED = "polled"
+    HEDGED = "hedged"
+    SOLVED = "solved"
+    FAILED = "failed"
+
+
+class ErrorActionEnm(str, MyEnum):
+    """
+    Enum with reactions of the error policy to a `createTask` error
+    """
+
+    RETRY = "retry"  # back off with jitter and create the task again
+    PAUSE = "pause"  # pause `createTask` of every task in the process, then create the task again
+    FAIL = "fail"  # return the error result at once
@@ -0,0 +1,160 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from msgspec import Struct
+
+from .enum import ErrorActionEnm
+
+__all__ = ("ErrorRule", "ErrorPolicy", "ERROR_RULES", "ERROR_POLICY")
+
+
+class ErrorRule(Struct, frozen=True):
+    """
+    Reaction to one `createTask` error code
+
+    Args:
+        action: What to do with the task
+        pause: Seconds `createTask` is paused in the whole process, only for ``PAUSE``
+    """
+
+    action: ErrorActionEnm
+    pause: float = 0.0
+
+
+_FAIL = ErrorRule(ErrorActionEnm.FAIL)
+
+# `createTask` error codes of the service, errors of finished tasks (`getTaskResult`) are never retried
+ERROR_RULES: Dict[str, ErrorRule] = {
+    # overload of the service or of the account - transient
+    "ERROR_NO_SLOT_AVAILABLE": ErrorRule(ErrorActionEnm.RETRY),
+    "ERROR_TOO_MUCH_REQUESTS": ErrorRule(ErrorActionEnm.PAUSE, pause=10),
+    "ERROR_IP_BLOCKED": ErrorRule(ErrorActionEnm.PAUSE, pause=60),
+    # 5xx responses of `createTask`, the task was not created
+    "HTTP_500": ErrorRule(ErrorActionEnm.RETRY),
+    "HTTP_502": ErrorRule(ErrorActionEnm.RETRY),
+    "HTTP_503": ErrorRule(ErrorActionEnm.RETRY),
+    "HTTP_504": ErrorRule(ErrorActionEnm.RETRY),
+    # account and key problems - retrying never helps
+    "ERROR_KEY_DOES_NOT_EXIST": _FAIL,
+    "ERROR_ZERO_BALANCE": _FAIL,
+    "ERROR_ACCOUNT_SUSPENDED": _FAIL,
+    "ERROR_IP_NOT_ALLOWED": _FAIL,
+    # bad task payload
+    "ERROR_NO_SUCH_METHOD": _FAIL,
+    "ERROR_ZERO_CAPTCHA_FILESIZE": _FAIL,
+    "ERROR_TOO_BIG_CAPTCHA_FILESIZE": _FAIL,
+    "ERROR_IMAGE_TYPE_NOT_SUPPORTED": _FAIL,
+    "ERROR_TASK_ABSENT": _FAIL,
+    "ERROR_TASK_NOT_SUPPORTED": _FAIL,
+    "ERROR_RECAPTCHA_INVALID_SITEKEY": _FAIL,
+    "ERROR_RECAPTCHA_INVALID_DOMAIN": _FAIL,
+    "ERROR_TEMPLATE_NOT_FOUND": _FAIL,
+    "ERROR_FUNCAPTCHA_NOT_ALLOWED": _FAIL,
+    "ERROR_PROXY_TRANSPARENT": _FAIL,
+    "ERROR_PROXY_NOT_AUTHORISED": _FAIL,
+}
+
+
+class ErrorPolicy:
+    """
+    Error-code-aware `createTask` backoff shared by every task of the process
+
+    Every `createTask` error code is classified by a rule:
+
+    * ``RETRY`` - the task is created again after an exponential backoff with full jitter;
+    * ``PAUSE`` - `createTask` of every task using the policy is paused for the rule ``pause``,
+      then the task is created again;
+    * ``FAIL`` - the error result is returned at once.
+
+    The state is shared: every retried overload error raises the backoff level of all
+    in-flight tasks and every created task lowers it, so one overload signal slows the whole fleet.
+
+    Args:
+        rules: Rules which override ``ERROR_RULES``
+        default: Rule of the codes without a rule
+        max_retries: Maximum number of repeated `createTask` calls of one task
+        base_delay: Backoff of the first retry in seconds
+        max_delay: Maximum backoff in seconds
+
+    Examples:
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.set_error_policy()  # process-wide `ERROR_POLICY`
+        >>> solver.set_error_policy(ErrorPolicy(rules={"ERROR_ZERO_BALANCE": ErrorRule(ErrorActionEnm.PAUSE, 300)}))
+
+    Notes:
+        5xx responses of `createTask` are classified as ``HTTP_<status>`` codes, the task is not created then.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, ErrorRule]] = None,
+        default: ErrorRule = _FAIL,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.rules = {**ERROR_RULES, **(rules or {})}
+        self.default = default
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        # overload level shared by all tasks, raised by retried errors and lowered by created tasks
+        self._level = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def classify(self, error_code: Optional[str]) -> ErrorRule:
+        return self.rules.get(error_code or "", self.default)
+
+    def pause_remaining(self) -> float:
+        """
+        Method return seconds left of the process-wide `createTask` pause
+        """
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def on_error(self, error_code: Optional[str], attempt: int) -> Optional[float]:
+        """
+        Method register `createTask` error of a task
+
+        Args:
+            error_code: `errorCode` of the response
+            attempt: Number of already repeated `createTask` calls of the task
+
+        Returns:
+            Seconds to wait before the task is created again, ``None`` - fail the task
+        """
+        rule = self.classify(error_code)
+        if rule.action == ErrorActionEnm.FAIL or attempt >= self.max_retries:
+            return None
+        with self._lock:
+            if rule.action == ErrorActionEnm.PAUSE:
+                self._paused_until = max(self._paused_until, time.monotonic() + rule.pause)
+            self._level += 1
+            level = max(self._level, attempt + 1)
+        return self.pause_remaining() + self.backoff(level)
+
+    def on_success(self) -> None:
+        """
+        Method register created task
+        """
+        if self._level:
+            with self._lock:
+                self._level = max(self._level - 1, 0)
+
+    def backoff(self, level: int) -> float:
+        """
+        Method return backoff with full jitter for the overload level
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (level - 1)))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._level = 0
+            self._paused_until = 0.0
+
+
+# process-wide default policy, shared by every solver which opted in
+ERROR_POLICY = ErrorPolicy()
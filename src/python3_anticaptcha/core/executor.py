@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, TimeoutError, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+__all__ = ("SolveExecutor",)
+
+
+class SolveExecutor:
+    """
+    Thread pool running the sync handler of one solver, for code which can't use asyncio
+
+    The shared keep-alive connection pool of sync solvers is grown to ``max_workers``,
+    so every worker thread keeps its own warm connection instead of opening a new one per request.
+
+    Args:
+        captcha_params: Configured solver, shared by all worker threads
+        max_workers: Number of worker threads, i.e. tasks submitted and polled at the same time
+
+    Examples:
+        >>> with SolveExecutor(ImageToText(api_key="99d7d111a0111dc11184111c8bb111da"), max_workers=50) as executor:
+        ...     future = executor.submit(captcha_file="files/captcha-image.jpg")
+        ...     for index, result in executor.as_completed(({"captcha_file": path} for path in paths), timeout=600):
+        ...         print(index, result["solution"])
+        ...     print(future.result())
+
+    Notes:
+        Running ``captcha_handler`` calls can't be interrupted, a batch timeout or ``cancel()``
+        only stops tasks which were not started yet. Use ``set_timeout`` of the solver
+        to bound every single call too. Solvers with ``set_engine`` run tasks on the engine
+        loop instead of the worker threads and the timeout cancels running tasks as well.
+    """
+
+    def __init__(self, captcha_params: "CaptchaParams", max_workers: int = 10):
+        if max_workers < 1:
+            raise ValueError("`max_workers` must be a positive number")
+        self.captcha_params = captcha_params
+        self.max_workers = max_workers
+        self.captcha_params.sio_session_pool.ensure_maxsize(max_workers)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="anticaptcha-solve")
+        self._cancelled = threading.Event()
+
+    def __enter__(self) -> "SolveExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # after an error nobody waits for the results, queued tasks are dropped
+        self.shutdown(wait=exc_type is None, cancel_futures=exc_type is not None)
+        return False
+
+    def submit(self, **task_kwargs) -> Future:
+        """
+        Method schedule one ``captcha_handler`` call
+
+        Args:
+            task_kwargs: Keyword arguments for ``captcha_handler``
+
+        Returns:
+            ``concurrent.futures.Future`` of the solving result
+
+        Notes:
+            Solvers with an engine run the task on the engine loop, without a worker thread
+        """
+        if self.captcha_params.engine is not None:
+            return self.captcha_params.engine.submit(self.captcha_params.aio_captcha_handler(**task_kwargs))
+        return self._executor.submit(self.captcha_params.captcha_handler, **task_kwargs)
+
+    def as_completed(
+        self,
+        inputs: Iterable[Optional[dict]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> Iterator[Tuple[int, "BatchResult"]]:
+        """
+        Method solve every input and yield results as soon as they are ready
+
+        Args:
+            inputs: Keyword arguments for ``captcha_handler`` of every task, like
+                        ``{"captcha_file": "img.png"}`` or ``{"websiteURL": "https://..."}``
+            timeout: Time limit of the whole batch in seconds, ``None`` - no limit
+            return_exceptions: True - exceptions are yielded as results,
+                                False - the first exception stops the batch and is raised
+
+        Yields:
+            Tuple of input index and the solving result, in completion order
+
+        Raises:
+            concurrent.futures.TimeoutError: The batch was not finished in ``timeout`` seconds
+
+        Notes:
+            Inputs are pulled lazily, at most ``max_workers`` tasks are submitted at a time.
+            After ``cancel()`` no more inputs are submitted and the iterator ends once
+            the running tasks are finished.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        source = enumerate(inputs)
+        running: Dict[Future, int] = {}
+        self._cancelled.clear()
+        try:
+            while True:
+                while len(running) < self.max_workers and not self._cancelled.is_set():
+                    item = next(source, None)
+                    if item is None:
+                        break
+                    index, task_kwargs = item
+                    running[self.submit(**(task_kwargs or {}))] = index
+                if not running:
+                    return
+
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f"Batch was not finished in {timeout} seconds")
+                for future in done:
+                    index = running.pop(future)
+                    try:
+                        result = future.result()
+                    except CancelledError:
+                        continue
+                    except Exception as error:
+                        if not return_exceptions:
+                            raise
+                        result = error
+                    yield index, result
+        finally:
+            # also runs when the consumer stops iterating, queued tasks are not started
+            for future in running:
+                future.cancel()
+
+    def solve_many(
+        self,
+        inputs: Iterable[Optional[dict]],
+        timeout: Optional[float] = None,
+        return_exceptions: bool = False,
+    ) -> List["BatchResult"]:
+        """
+        Method solve every input and return results in input order
+
+        Raises:
+            concurrent.futures.TimeoutError: The batch was not finished in ``timeout`` seconds
+            CancelledError: The batch was stopped by ``cancel()``
+
+        Notes:
+            Check ``as_completed`` for arguments description
+        """
+        results: Dict[int, "BatchResult"] = {}
+        total = 0
+        for total, (index, result) in enumerate(
+            self.as_completed(inputs=inputs, timeout=timeout, return_exceptions=return_exceptions), start=1
+        ):
+            results[index] = result
+        if self._cancelled.is_set():
+            raise CancelledError(f"Batch was cancelled after {total} results")
+        return [results[index] for index in range(len(results))]
+
+    def cancel(self) -> None:
+        """
+        Method stop the running batch: inputs which were not submitted yet are skipped,
+        queued tasks are cancelled, running tasks are finished
+        """
+        self._cancelled.set()
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """
+        Method stop the worker threads
+
+        Args:
+            wait: True - wait until running tasks are finished
+            cancel_futures: True - cancel tasks which were submitted but not started yet
+        """
+        if cancel_futures:
+            self._cancelled.set()
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -0,0 +1,99 @@
+import threading
+from typing import Iterable, Optional, Set, Union
+
+from .enum import CaptchaTypeEnm
+
+__all__ = ("HedgePolicy", "HEDGE_POLICY")
+
+
+class HedgePolicy:
+    """
+    Hedged duplicate submission which cuts the solve time tail of slow workers
+
+    A task which is not `ready` after the ``quantile`` of the solve times learned by the polling
+    profile engine gets one duplicate task with the same payload. Both tasks are polled,
+    the first `ready` result is returned and the other task is abandoned - it is not polled any more.
+
+    Duplicates are paid tasks, so they are limited by a budget: at most ``budget`` duplicates
+    per created task, counted over the whole life of the policy.
+
+    Args:
+        quantile: Quantile of the solve time after which the duplicate is created
+        budget: Maximum share of duplicates among created tasks, ``0.05`` - one duplicate per 20 tasks
+        min_delay: Lower bound of the hedge delay, seconds
+        captcha_types: Task types which are hedged, ``None`` - every type
+
+    Examples:
+        >>> solver = ReCaptchaV2(api_key="99d7d111a0111dc11184111c8bb111da", ...)
+        >>> solver.set_hedge_policy()  # process-wide `HEDGE_POLICY`
+        >>> solver.set_hedge_policy(HedgePolicy(quantile=0.95, budget=0.02))
+
+    Notes:
+        Types are hedged only after the polling profile engine has ``min_samples`` solve times of them.
+        Hedging applies to tasks polled by the solve call itself - tasks waiting for `callbackUrl`
+        or the central poller are not hedged and don't count towards the budget, neither are
+        overdue callback tasks in their polling fallback. Duplicates are counted by the ``hedged``
+        lifecycle event.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.9,
+        budget: float = 0.05,
+        min_delay: float = 1.0,
+        captcha_types: Optional[Iterable[Union[CaptchaTypeEnm, str]]] = None,
+    ):
+        self.quantile = quantile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.captcha_types: Optional[Set[str]] = None if captcha_types is None else set(captcha_types)
+
+        self._tasks = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    @property
+    def tasks(self) -> int:
+        return self._tasks
+
+    @property
+    def hedges(self) -> int:
+        return self._hedges
+
+    def hedge_after(
+        self, captcha_type: Optional[Union[CaptchaTypeEnm, str]], polling_profiles: "PollingProfiles"
+    ) -> Optional[float]:
+        """
+        Method register created task and return seconds after which it is hedged
+
+        Returns:
+            Hedge delay, ``None`` - the task is not hedged
+        """
+        if self.captcha_types is not None and captcha_type not in self.captcha_types:
+            return None
+        with self._lock:
+            self._tasks += 1
+        delay = polling_profiles.quantile(captcha_type, self.quantile)
+        return None if delay is None else max(delay, self.min_delay)
+
+    def acquire(self) -> bool:
+        """
+        Method take one duplicate from the budget
+
+        Returns:
+            ``True`` if the duplicate may be created
+        """
+        with self._lock:
+            if self._hedges + 1 > self._tasks * self.budget:
+                return False
+            self._hedges += 1
+            return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tasks = 0
+            self._hedges = 0
+
+
+# process-wide policy, its budget is shared by every solver which opted in
+HEDGE_POLICY = HedgePolicy()
@@ -0,0 +1,103 @@
+from typing import Callable, Optional, Union
+
+from msgspec import Struct
+
+from .enum import LifecycleEventEnm
+
+__all__ = ("LifecycleEvent", "LifecycleHook", "Hook")
+
+
+class LifecycleEvent(Struct, frozen=True, kw_only=True):
+    """
+    One lifecycle event of a solve call
+
+    All timestamps are ``time.monotonic()`` seconds, so they can be subtracted
+    from each other, but not compared with the wall clock.
+
+    Args:
+        event: Event name
+        captcha_type: Task type, like `ImageToTextTask`
+        timestamp: Time of the event
+        started_at: Time the solve call started
+        sent_at: Time the `createTask` request was sent
+        created_at: Time the `createTask` response was received
+        task_id: `taskId`, ``None`` before the task is created
+        poll_count: Number of `getTaskResult` responses received so far
+        status: Task status of the last response
+        error_code: `errorCode` of the last response, or name of the raised exception
+        cost: Task cost, set in terminal events
+    """
+
+    event: LifecycleEventEnm
+    captcha_type: Optional[str] = None
+    timestamp: float
+    started_at: float
+    sent_at: Optional[float] = None
+    created_at: Optional[float] = None
+    task_id: Optional[int] = None
+    poll_count: int = 0
+    status: Optional[str] = None
+    error_code: Optional[str] = None
+    cost: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Seconds since the solve call started
+        """
+        return self.timestamp - self.started_at
+
+
+class LifecycleHook:
+    """
+    Base class of lifecycle hooks, override the methods of the events you need
+
+    Hooks are called synchronously in the solving thread or event loop, so they must be fast
+    and must not block. Exceptions raised by a hook are logged and never break the solve.
+
+    Examples:
+        >>> class SolveTimer(LifecycleHook):
+        ...     def on_solved(self, event: LifecycleEvent) -> None:
+        ...         print(event.captcha_type, event.timestamp - event.created_at, event.poll_count)
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.add_hook(SolveTimer())
+
+    Notes:
+        Any callable which accepts one ``LifecycleEvent`` can be registered as a hook too.
+    """
+
+    def __call__(self, event: LifecycleEvent) -> None:
+        getattr(self, f"on_{event.event.value}")(event)
+
+    def on_task_sent(self, event: LifecycleEvent) -> None:
+        """
+        `createTask` request is about to be sent
+        """
+
+    def on_task_created(self, event: LifecycleEvent) -> None:
+        """
+        `createTask` response is received, ``error_code`` is set if the task was rejected
+        """
+
+    def on_polled(self, event: LifecycleEvent) -> None:
+        """
+        `getTaskResult` response is received
+        """
+
+    def on_hedged(self, event: LifecycleEvent) -> None:
+        """
+        Duplicate task of a slow task is created, ``error_code`` is set if `createTask` of the duplicate failed
+        """
+
+    def on_solved(self, event: LifecycleEvent) -> None:
+        """
+        Solve call finished with the `ready` task
+        """
+
+    def on_failed(self, event: LifecycleEvent) -> None:
+        """
+        Solve call finished with an error, expired deadline or exception
+        """
+
+
+Hook = Union[LifecycleHook, Callable[[LifecycleEvent], None]]
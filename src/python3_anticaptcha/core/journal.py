@@ -0,0 +1,192 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+from msgspec import Struct
+
+__all__ = ("JournalEntry", "TaskJournal")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY,
+    captcha_type TEXT,
+    client_key TEXT NOT NULL,
+    payload_hash TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT,
+    error_code TEXT
+)
+"""
+RECORD_SQL = (
+    "INSERT OR REPLACE INTO tasks (task_id, captcha_type, client_key, payload_hash, created_at) VALUES (?, ?, ?, ?, ?)"
+)
+FINISH_SQL = "UPDATE tasks SET finished_at = ?, status = ?, error_code = ? WHERE task_id = ?"
+
+
+class JournalEntry(Struct, frozen=True, kw_only=True):
+    """
+    Created task which has no terminal result in the journal yet
+    """
+
+    task_id: int
+    captcha_type: Optional[str]
+    client_key: str
+    payload_hash: Optional[str]
+    # wall-clock time, the journal outlives the process
+    created_at: float
+
+
+class TaskJournal:
+    """
+    Durable SQLite journal of created tasks, so a paid `taskId` survives a crash or a redeploy
+
+    Every task is recorded once `createTask` returns its `taskId` and marked finished with
+    the terminal result. Tasks left unfinished - the process died, the solve deadline expired,
+    polling failed - are returned by ``unfinished()`` and polled again by
+    ``resume_tasks`` / ``aio_resume_tasks`` of any solver.
+
+    Writes are buffered and committed in batches - every ``commit_interval`` seconds
+    by a daemon thread or as soon as ``batch_size`` writes are pending, the database runs in WAL mode.
+
+    Args:
+        path: Path of the database file, created on first use
+        commit_interval: Seconds between batched commits, the longest window of writes lost on a crash
+        batch_size: Number of pending writes which are committed at once
+
+    Examples:
+        >>> journal = TaskJournal("anticaptcha-journal.sqlite3")
+        >>> solver.set_journal(journal)
+        >>> solver.resume_tasks()  # on startup, results of the tasks paid before the crash
+        [{"errorId": 0, "status": "ready", "taskId": 4242, ...}]
+        >>> solver.captcha_handler()
+
+    Notes:
+        Use one journal file per worker process - tasks which are being solved right now
+        by another process are unfinished too and would be polled twice.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], commit_interval: float = 0.5, batch_size: int = 100):
+        self.path = os.fspath(path)
+        self.commit_interval = commit_interval
+        self.batch_size = batch_size
+
+        # transactions are opened explicitly, one per batch
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(SCHEMA)
+
+        self._pending: List[Tuple[str, tuple]] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def payload_hash(data: bytes) -> str:
+        """
+        Method return hash of the encoded `createTask` payload
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def record(self, task_id: int, captcha_type: Optional[str], client_key: str, payload_hash: Optional[str]) -> None:
+        """
+        Method record created task
+        """
+        self._write(RECORD_SQL, (task_id, captcha_type, client_key, payload_hash, time.time()))
+
+    def finish(self, task_id: int, status: Optional[str] = None, error_code: Optional[str] = None) -> None:
+        """
+        Method mark task as finished with the terminal result
+        """
+        self._write(FINISH_SQL, (time.time(), status, error_code, task_id))
+
+    def unfinished(self) -> List[JournalEntry]:
+        """
+        Method return tasks without terminal result, oldest first
+        """
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT task_id, captcha_type, client_key, payload_hash, created_at FROM tasks "
+                "WHERE finished_at IS NULL ORDER BY created_at"
+            ).fetchall()
+        return [
+            JournalEntry(
+                task_id=task_id,
+                captcha_type=captcha_type,
+                client_key=client_key,
+                payload_hash=payload_hash,
+                created_at=created_at,
+            )
+            for task_id, captcha_type, client_key, payload_hash, created_at in rows
+        ]
+
+    def prune(self, older_than: float = 86400) -> int:
+        """
+        Method delete finished tasks
+
+        Args:
+            older_than: Seconds since the task was finished
+
+        Returns:
+            Number of deleted tasks
+        """
+        self.flush()
+        with self._lock:
+            return self._connection.execute(
+                "DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?", (time.time() - older_than,)
+            ).rowcount
+
+    def flush(self) -> None:
+        """
+        Method commit pending writes
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            self._connection.execute("BEGIN")
+            try:
+                for sql, params in pending:
+                    self._connection.execute(sql, params)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """
+        Method commit pending writes and close the database
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "TaskJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _write(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            self._pending.append((sql, params))
+            pending = len(self._pending)
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="anticaptcha-journal", daemon=True
+                )
+                self._flusher.start()
+        if pending >= self.batch_size:
+            self.flush()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.commit_interval):
+            self.flush()
@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+from .const import BASE_REQUEST_URL
+from .enum import ControlPostfixEnm
+from .utils import lazy_instruments
+
+_lazy = lazy_instruments(globals())
+__getattr__ = _lazy.module_getattr
+
+__all__ = ("KeyPool",)
+
+# error codes of the key after which it is taken out of rotation,
+# `ERROR_IP_BLOCKED` is not here - it is a temporary block of the client IP, paused by the error policy
+DISABLING_ERRORS = ("ERROR_ZERO_BALANCE", "ERROR_KEY_DOES_NOT_EXIST", "ERROR_ACCOUNT_SUSPENDED")
+
+
+class _KeyState:
+    __slots__ = ("key", "weight", "in_flight", "current", "balance", "disabled")
+
+    def __init__(self, key: str, weight: float):
+        self.key = key
+        self.weight = weight
+        self.in_flight = 0
+        # smooth weighted round-robin counter
+        self.current = 0.0
+        self.balance: Optional[float] = None
+        self.disabled: Optional[str] = None
+
+
+class KeyPool:
+    """
+    Load balancer of tasks between several API keys
+
+    Strategies:
+
+    * ``least_in_flight`` - key with the fewest running tasks relative to its weight;
+    * ``weighted`` - smooth weighted round-robin;
+    * ``balance`` - key with the largest cached balance per running task, so keys are drained evenly.
+
+    A key is taken out of rotation when the service answers `ERROR_ZERO_BALANCE`,
+    `ERROR_KEY_DOES_NOT_EXIST` and similar errors. Keys disabled for `ERROR_ZERO_BALANCE`
+    are still checked by the balance refresh and come back once their balance is positive.
+    `getTaskResult` of a task is always sent with the key which created it.
+
+    Args:
+        keys: API keys, or mapping of API key to its weight
+        strategy: Key selection strategy
+        balance_ttl: Seconds the `getBalance` result of a key is cached
+        request_url: API address of `getBalance` requests
+
+    Examples:
+        >>> pool = KeyPool({"99d7d111a0111dc11184111c8bb111da": 3, "11d7d111a0111dc11184111c8bb111aa": 1})
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.set_key_pool(pool)
+        >>> await solver.aio_solve_many(inputs, concurrency=100)
+
+    Notes:
+        One pool can be shared by many solvers and threads.
+    """
+
+    def __init__(
+        self,
+        keys: Union[Iterable[str], Dict[str, float]],
+        strategy: str = "least_in_flight",
+        balance_ttl: float = 60,
+        request_url: str = BASE_REQUEST_URL,
+    ):
+        if strategy not in ("least_in_flight", "weighted", "balance"):
+            raise ValueError(f"Unknown key selection strategy - {strategy}")
+        weights = keys if isinstance(keys, dict) else dict.fromkeys(keys, 1.0)
+        if not weights:
+            raise ValueError("`keys` must contain at least one API key")
+
+        self.strategy = strategy
+        self.balance_ttl = balance_ttl
+        self.request_url = request_url
+
+        self._states: Dict[str, _KeyState] = {key: _KeyState(key, float(weight)) for key, weight in weights.items()}
+        self._balances_updated = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active_keys(self) -> List[str]:
+        return [state.key for state in self._states.values() if state.disabled is None]
+
+    def in_flight(self, key: str) -> int:
+        return self._states[key].in_flight
+
+    def balance(self, key: str) -> Optional[float]:
+        """
+        Cached balance of the key, ``None`` if it was not loaded yet
+        """
+        return self._states[key].balance
+
+    def acquire(self) -> str:
+        """
+        Method pick the key for a new task and count the task as running
+
+        Raises:
+            ValueError: all keys are out of rotation
+        """
+        with self._lock:
+            active = [state for state in self._states.values() if state.disabled is None]
+            if not active:
+                raise ValueError("All API keys in the pool are disabled")
+
+            if self.strategy == "weighted":
+                total = sum(state.weight for state in active)
+                for state in active:
+                    state.current += state.weight
+                chosen = max(active, key=lambda state: state.current)
+                chosen.current -= total
+            elif self.strategy == "balance":
+                chosen = max(active, key=lambda state: (state.balance or 0.0) * state.weight / (state.in_flight + 1))
+            else:
+                chosen = min(active, key=lambda state: (state.in_flight + 1) / state.weight)
+
+            chosen.in_flight += 1
+            return chosen.key
+
+    def release(self, key: str, error_code: Optional[str] = None, cost: Optional[float] = None) -> None:
+        """
+        Method count the task of the key as finished
+
+        Args:
+            key: Key returned by ``acquire``
+            error_code: `errorCode` of the task result, disabling errors take the key out of rotation
+            cost: Task cost, subtracted from the cached balance
+        """
+        with self._lock:
+            state = self._states[key]
+            state.in_flight = max(state.in_flight - 1, 0)
+            if cost and state.balance is not None:
+                state.balance -= float(cost)
+        if error_code in DISABLING_ERRORS:
+            self.disable(key, reason=error_code)
+
+    def disable(self, key: str, reason: str = "disabled") -> None:
+        with self._lock:
+            if self._states[key].disabled is None:
+                logging.warning("API key %s...%s is taken out of rotation: %s", key[:4], key[-4:], reason)
+            self._states[key].disabled = reason
+
+    def enable(self, key: str) -> None:
+        with self._lock:
+            self._states[key].disabled = None
+
+    def _refreshable_keys(self) -> List[str]:
+        # keys disabled for zero balance come back after a top-up, other disabled keys are not checked
+        return [state.key for state in self._states.values() if state.disabled in (None, "ERROR_ZERO_BALANCE")]
+
+    def balances_stale(self) -> bool:
+        return time.monotonic() - self._balances_updated >= self.balance_ttl
+
+    def refresh_balances(self, force: bool = False) -> None:
+        """
+        Method load balances of all active and zero balance keys, if the cached ones are older than ``balance_ttl``
+        """
+        if not (force or self.balances_stale()):
+            return
+        self._balances_updated = time.monotonic()
+        for key in self._refreshable_keys():
+            try:
+                result = _lazy.SIOCaptchaInstrument.send_post_request(
+                    url_postfix=ControlPostfixEnm.GET_BALANCE, payload={"clientKey": key}, request_url=self.request_url
+                )
+            except Exception as error:
+                logging.warning("Balance of the API key is not loaded: %s", error)
+                continue
+            self._update_balance(key, result)
+
+    async def aio_refresh_balances(self, force: bool = False) -> None:
+        """
+        Async method load balances of all active and zero balance keys, if the cached ones are older than ``balance_ttl``
+        """
+        if not (force or self.balances_stale()):
+            return
+        self._balances_updated = time.monotonic()
+        for key in self._refreshable_keys():
+            try:
+                result = await _lazy.AIOCaptchaInstrument.send_post_request(
+                    url_postfix=ControlPostfixEnm.GET_BALANCE, payload={"clientKey": key}, request_url=self.request_url
+                )
+            except Exception as error:
+                logging.warning("Balance of the API key is not loaded: %s", error)
+                continue
+            self._update_balance(key, result)
+
+    def _update_balance(self, key: str, result: dict) -> None:
+        if result.get("errorId"):
+            if result.get("errorCode") in DISABLING_ERRORS:
+                self.disable(key, reason=result["errorCode"])
+            return
+        balance = float(result.get("balance") or 0.0)
+        with self._lock:
+            state = self._states[key]
+            state.balance = balance
+            if balance > 0 and state.disabled == "ERROR_ZERO_BALANCE":
+                logging.info("API key %s...%s is back in rotation, balance %s", key[:4], key[-4:], balance)
+                state.disabled = None
+        if balance <= 0:
+            self.disable(key, reason="ERROR_ZERO_BALANCE")
@@ -0,0 +1,319 @@
+import math
+import threading
+from enum import Enum
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .hooks import LifecycleEvent, LifecycleHook
+
+__all__ = ("Counter", "Gauge", "Histogram", "MetricsRegistry", "METRICS")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# solve time of captchas is seconds to minutes
+DEFAULT_BUCKETS = (1, 2.5, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_value(value) -> str:
+    # `str` enums, like `CaptchaTypeEnm`, are rendered by their value
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"`{self.name}` expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(_label_value(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(Counter):
+    """
+    Value which goes up and down
+    """
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in cumulative buckets
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: counts of every bucket (not cumulative), sum, count
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        values = self._values.get(self._key(labels))
+        return sum(values[0]) if values else 0
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(
+                    (
+                        f"{self.name}_bucket",
+                        _labels(self.labelnames + ("le",), key + (_format_value(bound),)),
+                        cumulative,
+                    )
+                )
+            labels = _labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class _SolveMetricsHook(LifecycleHook):
+    """
+    Lifecycle hook which feeds the solver metrics of the registry
+    """
+
+    def __init__(self, registry: "MetricsRegistry"):
+        self.registry = registry
+
+    def on_task_sent(self, event: LifecycleEvent) -> None:
+        self.registry.submitted.inc(captcha_type=event.captcha_type or "")
+        self.registry.in_flight.inc(captcha_type=event.captcha_type or "")
+
+    def on_polled(self, event: LifecycleEvent) -> None:
+        self.registry.polls.inc(captcha_type=event.captcha_type or "")
+
+    def on_hedged(self, event: LifecycleEvent) -> None:
+        if event.error_code is None:
+            self.registry.hedges.inc(captcha_type=event.captcha_type or "")
+
+    def on_solved(self, event: LifecycleEvent) -> None:
+        self._finish(event, result="solved")
+        self.registry.solve_duration.observe(event.elapsed, captcha_type=event.captcha_type or "")
+
+    def on_failed(self, event: LifecycleEvent) -> None:
+        self._finish(event, result="failed")
+        self.registry.errors.inc(captcha_type=event.captcha_type or "", error_code=event.error_code or "")
+
+    def _finish(self, event: LifecycleEvent, result: str) -> None:
+        captcha_type = event.captcha_type or ""
+        # tasks which failed before `createTask` was sent were never counted as running
+        if event.sent_at is not None:
+            self.registry.in_flight.dec(captcha_type=captcha_type)
+        self.registry.solves.inc(captcha_type=captcha_type, result=result)
+        if event.cost:
+            self.registry.cost.inc(event.cost, captcha_type=captcha_type)
+
+
+class MetricsRegistry:
+    """
+    Dependency-free registry of metrics in the Prometheus text exposition format
+
+    The registry comes with solver metrics, fed by its lifecycle ``hook``:
+
+    * ``anticaptcha_tasks_submitted_total`` - `createTask` calls;
+    * ``anticaptcha_polls_total`` - `getTaskResult` responses;
+    * ``anticaptcha_hedges_total`` - duplicate tasks created by hedging;
+    * ``anticaptcha_solves_total`` - finished solve calls by ``result`` - solved / failed;
+    * ``anticaptcha_errors_total`` - failed solve calls by `errorCode`;
+    * ``anticaptcha_tasks_in_flight`` - tasks sent and not finished yet;
+    * ``anticaptcha_cost_total`` - cumulative task cost;
+    * ``anticaptcha_solve_duration_seconds`` - histogram of solve call latency.
+
+    All of them are labeled by the task type. Own metrics can be added with
+    ``counter``, ``gauge`` and ``histogram``.
+
+    Args:
+        prefix: Prefix of the solver metric names
+        buckets: Buckets of the solve latency histogram, seconds
+
+    Examples:
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.set_metrics()  # process-wide `METRICS` registry
+        >>> METRICS.serve(port=9100)  # http://127.0.0.1:9100/metrics
+        >>> print(METRICS.render())
+
+    Notes:
+        One registry can be shared by many solvers, threads and event loops.
+    """
+
+    def __init__(self, prefix: str = "anticaptcha", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+        self.submitted = self.counter(f"{prefix}_tasks_submitted_total", "createTask calls", ["captcha_type"])
+        self.polls = self.counter(f"{prefix}_polls_total", "getTaskResult responses", ["captcha_type"])
+        self.hedges = self.counter(f"{prefix}_hedges_total", "Duplicate tasks created by hedging", ["captcha_type"])
+        self.solves = self.counter(f"{prefix}_solves_total", "Finished solve calls", ["captcha_type", "result"])
+        self.errors = self.counter(
+            f"{prefix}_errors_total", "Failed solve calls by errorCode", ["captcha_type", "error_code"]
+        )
+        self.in_flight = self.gauge(f"{prefix}_tasks_in_flight", "Tasks sent and not finished yet", ["captcha_type"])
+        self.cost = self.counter(f"{prefix}_cost_total", "Cumulative task cost", ["captcha_type"])
+        self.solve_duration = self.histogram(
+            f"{prefix}_solve_duration_seconds", "Solve call latency", ["captcha_type"], buckets=buckets
+        )
+        self.hook = _SolveMetricsHook(self)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric `{metric.name}` is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        """
+        Method render all metrics in the Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+    def serve(self, port: int = 9100, addr: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Method start HTTP endpoint with metrics in a daemon thread
+
+        Args:
+            port: Port to listen, ``0`` - any free port
+            addr: Address to listen
+
+        Returns:
+            Started server, ``server.shutdown()`` stops it
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer((addr, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="anticaptcha-metrics", daemon=True).start()
+        return server
+
+
+# process-wide default registry
+METRICS = MetricsRegistry()
@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import weakref
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+import aiohttp
+
+from .aio_session import AIO_SESSION_POOL, AIOSessionPool
+from .const import BASE_REQUEST_URL, CONNECT_TIMEOUT, GET_RESULT_POSTFIX, READ_TIMEOUT
+from .enum import RateLimitScopeEnm, ResponseStatusEnm
+from .rate_limit import RateLimiter
+from .serializer import GET_TASK_RESULT_RESPONSE_DECODER, JSON_ENCODER, JSON_HEADERS, GetTaskResultResponseSer
+
+__all__ = ("AIOPoller",)
+
+
+class _PollEntry:
+    __slots__ = (
+        "task_id",
+        "api_key",
+        "url",
+        "body",
+        "delays",
+        "future",
+        "session_pool",
+        "timeout",
+        "rate_limiter",
+        "on_response",
+        "polls",
+    )
+
+    def __init__(
+        self,
+        payload: dict,
+        delays: Iterator[float],
+        future: asyncio.Future,
+        session_pool: AIOSessionPool,
+        request_url: str = BASE_REQUEST_URL,
+        timeout: Optional[Callable[[], aiohttp.ClientTimeout]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        on_response: Optional[Callable[[GetTaskResultResponseSer], None]] = None,
+    ):
+        self.task_id = payload.get("taskId")
+        self.api_key = payload.get("clientKey")
+        self.url = urljoin(request_url, GET_RESULT_POSTFIX)
+        # payload is the same for every poll - encode it once
+        self.body = JSON_ENCODER.encode(payload)
+        self.delays = delays
+        self.future = future
+        self.session_pool = session_pool
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.on_response = on_response
+        self.polls = 0
+
+    def request_timeout(self) -> aiohttp.ClientTimeout:
+        if self.timeout is None:
+            return aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+        return self.timeout()
+
+
+class _LoopState:
+    """
+    Timer heap and driver task of one event loop
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, _PollEntry]] = []
+        self.wakeup = asyncio.Event()
+        self.driver: Optional[asyncio.Task] = None
+        self.next_slot = 0.0
+        self.in_flight = 0
+        # spawned polls are kept referenced until they finish
+        self.tasks: Set[asyncio.Task] = set()
+
+
+class AIOPoller:
+    """
+    Central `getTaskResult` scheduler for async solving
+
+    All outstanding tasks are kept in one timer heap and polled by a single driver coroutine
+    under a global request rate cap, instead of one sleeping coroutine per task.
+    The awaiting caller is woken up only when its task reaches a terminal state.
+
+    Args:
+        max_rps: Maximum number of `getTaskResult` requests per second
+        jitter: Relative random spread applied to every poll delay, ``0.1`` - +/-10%
+        max_polls: Number of polls after which the last `processing` response is returned
+
+    Examples:
+        >>> poller = AIOPoller(max_rps=50)
+        >>> solver = Turnstile(...)
+        >>> solver.set_poller(poller)
+        >>> await solver.aio_solve_many([{}] * 10000, concurrency=2000)
+
+    Notes:
+        Timer state is kept per event loop, so one poller can be shared by several threads
+        each running its own loop; the rate cap then applies per loop.
+    """
+
+    def __init__(self, max_rps: float = 20, jitter: float = 0.1, max_polls: int = 30):
+        self.max_rps = max_rps
+        self.jitter = jitter
+        self.max_polls = max_polls
+
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def pending(self) -> int:
+        """
+        Number of tasks waiting for a poll in the running loop
+        """
+        state = self._states.get(asyncio.get_running_loop())
+        return len(state.heap) + state.in_flight if state else 0
+
+    async def poll(
+        self,
+        payload: dict,
+        delays: Iterator[float],
+        session_pool: Optional[AIOSessionPool] = None,
+        request_url: str = BASE_REQUEST_URL,
+        timeout: Optional[Callable[[], aiohttp.ClientTimeout]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        on_response: Optional[Callable[[GetTaskResultResponseSer], None]] = None,
+    ) -> dict:
+        """
+        Method hand the created task to the scheduler and wait for its terminal result
+
+        Args:
+            payload: `getTaskResult` request payload with `clientKey` and `taskId`
+            delays: Endless iterator of delays - before the first poll and between the following polls
+            session_pool: Async session pool used for requests
+            request_url: API address
+            timeout: Function which returns the timeout of every request, default - connect and read timeouts
+            rate_limiter: Client-side rate limiter, acquired in the `getTaskResult` scope before every request
+            on_response: Function called with every `getTaskResult` response of the task
+
+        Returns:
+            Dict with full server response
+        """
+        loop = asyncio.get_running_loop()
+        state = self._state(loop)
+        entry = _PollEntry(
+            payload=payload,
+            delays=delays,
+            future=loop.create_future(),
+            session_pool=session_pool or AIO_SESSION_POOL,
+            request_url=request_url,
+            timeout=timeout,
+            rate_limiter=rate_limiter,
+            on_response=on_response,
+        )
+        self._schedule(loop, state, entry)
+        if state.driver is None or state.driver.done():
+            state.driver = loop.create_task(self._drive(loop, state))
+        return await entry.future
+
+    def _state(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _LoopState()
+            return state
+
+    def _schedule(self, loop: asyncio.AbstractEventLoop, state: _LoopState, entry: _PollEntry) -> None:
+        delay = next(entry.delays)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        heapq.heappush(state.heap, (loop.time() + max(delay, 0), next(self._counter), entry))
+        state.wakeup.set()
+
+    async def _drive(self, loop: asyncio.AbstractEventLoop, state: _LoopState) -> None:
+        while state.heap or state.in_flight:
+            if not state.heap:
+                state.wakeup.clear()
+                await state.wakeup.wait()
+                continue
+            due, _, entry = state.heap[0]
+            now = loop.time()
+            if due > now:
+                state.wakeup.clear()
+                try:
+                    await asyncio.wait_for(state.wakeup.wait(), timeout=due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(state.heap)
+            # caller is gone - drop the task
+            if entry.future.done():
+                continue
+            # global rate cap
+            if self.max_rps:
+                slot = max(now, state.next_slot)
+                state.next_slot = slot + 1 / self.max_rps
+                if slot > now:
+                    await asyncio.sleep(slot - now)
+            state.in_flight += 1
+            task = loop.create_task(self._poll_once(loop, state, entry))
+            state.tasks.add(task)
+            task.add_done_callback(state.tasks.discard)
+
+    async def _poll_once(self, loop: asyncio.AbstractEventLoop, state: _LoopState, entry: _PollEntry) -> None:
+        try:
+            session = entry.session_pool.get_session()
+            if entry.rate_limiter is not None:
+                await entry.rate_limiter.aio_acquire(scope=RateLimitScopeEnm.GET_TASK_RESULT, api_key=entry.api_key)
+            async with session.post(
+                url=entry.url, data=entry.body, headers=JSON_HEADERS, timeout=entry.request_timeout()
+            ) as resp:
+                captcha_response = GET_TASK_RESULT_RESPONSE_DECODER.decode(await resp.read())
+            entry.polls += 1
+            if entry.on_response is not None:
+                entry.on_response(captcha_response)
+            if (
+                captcha_response.errorId == 0
+                and captcha_response.status == ResponseStatusEnm.processing
+                and entry.polls < self.max_polls
+            ):
+                self._schedule(loop, state, entry)
+            elif not entry.future.done():
+                captcha_response.taskId = entry.task_id
+                entry.future.set_result(captcha_response.to_dict())
+        except Exception as error:
+            logging.exception(error)
+            if not entry.future.done():
+                entry.future.set_exception(error)
+        finally:
+            state.in_flight -= 1
+            state.wakeup.set()
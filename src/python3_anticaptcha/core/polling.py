@@ -0,0 +1,166 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Union
+
+from .enum import CaptchaTypeEnm
+
+__all__ = ("StaticPollingProfile", "PollingProfiles", "POLLING_PROFILES")
+
+
+class StaticPollingProfile:
+    """
+    Fixed polling schedule - first `getTaskResult` after ``first_delay``, then every ``interval`` seconds
+
+    Args:
+        first_delay: Seconds to wait between task creation and the first poll
+        interval: Seconds to wait between the following polls
+    """
+
+    def __init__(self, first_delay: float, interval: float):
+        self.first_delay = first_delay
+        self.interval = interval
+
+    def delays(self) -> Iterator[float]:
+        yield self.first_delay
+        while True:
+            yield self.interval
+
+
+class PollingProfiles:
+    """
+    Polling profile engine which learns the solve-time distribution of every captcha type
+
+    Solve times are taken from ``endTime - createTime`` of ready `getTaskResult` responses.
+    Once a type has ``min_samples`` observations its schedule becomes:
+
+    * first poll at the ``first_quantile`` of observed solve times;
+    * ``dense_polls`` evenly spaced polls up to the ``last_quantile``;
+    * the static ``sleep_time`` interval for the remaining tail.
+
+    Until then, the static profile built from ``sleep_time`` is used.
+
+    Args:
+        window: Number of latest solve times kept per captcha type
+        min_samples: Observations required before the learned schedule is used
+        first_quantile: Quantile of solve time used for the first poll delay
+        last_quantile: Quantile of solve time after which polling falls back to the static interval
+        dense_polls: Number of polls between the first and the last quantile
+        min_interval: Lower bound for any delay, seconds
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 10,
+        first_quantile: float = 0.25,
+        last_quantile: float = 0.9,
+        dense_polls: int = 4,
+        min_interval: float = 0.5,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.first_quantile = first_quantile
+        self.last_quantile = last_quantile
+        self.dense_polls = dense_polls
+        self.min_interval = min_interval
+
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, captcha_type: Optional[Union[CaptchaTypeEnm, str]], create_time: Optional[int], end_time: Optional[int]
+    ) -> None:
+        """
+        Method store solve time of a ready task
+
+        Args:
+            captcha_type: Task type, like `ImageToTextTask`
+            create_time: `createTime` field of `getTaskResult` response
+            end_time: `endTime` field of `getTaskResult` response
+        """
+        if not captcha_type or create_time is None or end_time is None or end_time < create_time:
+            return
+        with self._lock:
+            samples = self._samples.get(captcha_type)
+            if samples is None:
+                samples = self._samples[captcha_type] = deque(maxlen=self.window)
+            samples.append(float(end_time - create_time))
+
+    def quantile(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]], q: float) -> Optional[float]:
+        """
+        Method return the ``q`` quantile of observed solve time, ``None`` if there is not enough data
+        """
+        samples = self._sorted_samples(captcha_type)
+        if samples is None:
+            return None
+        return self._quantile(samples, q)
+
+    def profile(
+        self, captcha_type: Optional[Union[CaptchaTypeEnm, str]], sleep_time: float
+    ) -> Union[StaticPollingProfile, "LearnedPollingProfile"]:
+        """
+        Method return polling profile for the captcha type
+
+        Args:
+            captcha_type: Task type, like `ImageToTextTask`
+            sleep_time: Static interval, used as fallback and for the slow tail
+        """
+        samples = self._sorted_samples(captcha_type)
+        if samples is None:
+            return StaticPollingProfile(first_delay=sleep_time, interval=sleep_time)
+
+        first_delay = max(self._quantile(samples, self.first_quantile), self.min_interval)
+        last_delay = max(self._quantile(samples, self.last_quantile), first_delay)
+        dense_interval = max((last_delay - first_delay) / self.dense_polls, self.min_interval)
+        return LearnedPollingProfile(
+            first_delay=first_delay,
+            dense_interval=dense_interval,
+            dense_polls=self.dense_polls,
+            interval=max(sleep_time, self.min_interval),
+        )
+
+    def schedule(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]], sleep_time: float) -> Iterator[float]:
+        """
+        Method return endless iterator of delays - before the first poll and between the following polls
+        """
+        return self.profile(captcha_type=captcha_type, sleep_time=sleep_time).delays()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def _sorted_samples(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[List[float]]:
+        with self._lock:
+            samples = self._samples.get(captcha_type) if captcha_type else None
+            if not samples or len(samples) < self.min_samples:
+                return None
+            return sorted(samples)
+
+    @staticmethod
+    def _quantile(samples: List[float], q: float) -> float:
+        position = min(max(q, 0.0), 1.0) * (len(samples) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(samples) - 1)
+        return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+class LearnedPollingProfile(StaticPollingProfile):
+    """
+    Polling schedule built by `PollingProfiles` from observed solve times
+    """
+
+    def __init__(self, first_delay: float, dense_interval: float, dense_polls: int, interval: float):
+        super().__init__(first_delay=first_delay, interval=interval)
+        self.dense_interval = dense_interval
+        self.dense_polls = dense_polls
+
+    def delays(self) -> Iterator[float]:
+        yield self.first_delay
+        for _ in range(self.dense_polls):
+            yield self.dense_interval
+        while True:
+            yield self.interval
+
+
+# default engine shared by all solvers
+POLLING_PROFILES = PollingProfiles()
@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Union
+
+import msgspec
+from msgspec import Struct
+
+from .const import BASE_REQUEST_URL
+from .enum import CaptchaTypeEnm, ControlPostfixEnm
+from .utils import lazy_instruments, running_loop
+
+_lazy = lazy_instruments(globals())
+__getattr__ = _lazy.module_getattr
+
+__all__ = ("QueueStats", "QueueMonitor", "QUEUE_IDS", "QUEUE_MONITOR")
+
+# `getQueueStats` queue of every task type, types without a public queue are not monitored
+QUEUE_IDS: Dict[str, int] = {
+    CaptchaTypeEnm.ImageToTextTask: 1,  # English queue
+    CaptchaTypeEnm.RecaptchaV2Task: 5,
+    CaptchaTypeEnm.RecaptchaV2TaskProxyless: 6,
+    CaptchaTypeEnm.FunCaptchaTask: 7,
+    CaptchaTypeEnm.FunCaptchaTaskProxyless: 10,
+    CaptchaTypeEnm.GeeTestTask: 12,
+    CaptchaTypeEnm.GeeTestTaskProxyless: 13,
+    CaptchaTypeEnm.RecaptchaV3TaskProxyless: 18,  # minScore 0.3 queue, 0.7 and 0.9 are 19 and 20
+    CaptchaTypeEnm.HCaptchaTask: 21,
+    CaptchaTypeEnm.HCaptchaTaskProxyless: 22,
+    CaptchaTypeEnm.RecaptchaV2EnterpriseTask: 23,
+    CaptchaTypeEnm.RecaptchaV2EnterpriseTaskProxyless: 24,
+    CaptchaTypeEnm.AntiGateTask: 25,
+    CaptchaTypeEnm.TurnstileTask: 26,
+    CaptchaTypeEnm.TurnstileTaskProxyless: 27,
+}
+
+
+class QueueStats(Struct, frozen=True):
+    """
+    `getQueueStats` response
+
+    Args:
+        waiting: Number of idle workers online, waiting for a task
+        load: Queue load in percents
+        bid: Average task price in USD
+        speed: Average task solution time in seconds
+        total: Total number of workers
+    """
+
+    waiting: int = 0
+    load: float = 0.0
+    bid: float = 0.0
+    speed: float = 0.0
+    total: int = 0
+
+
+class QueueMonitor:
+    """
+    TTL cache of `getQueueStats` which solvers consult before `createTask`
+
+    Stats of a queue are loaded on first use and refreshed once they are older than ``ttl`` -
+    async solves refresh them in a background task and go on with the cached stats,
+    sync solves refresh them inline, one thread at a time. Failed refreshes keep the old stats.
+
+    The solvers use the stats to:
+
+    * start polling after the average ``speed`` of the queue, until the polling profile
+      engine has learned solve times of the captcha type;
+    * hold back `createTask` of non-urgent solvers while the queue ``load`` is above ``load_threshold``.
+
+    Args:
+        ttl: Seconds the stats of a queue are cached
+        load_threshold: Queue load in percents above which non-urgent tasks are held, ``None`` - never hold,
+            solvers can't opt in to holding then
+        hold_interval: Seconds between load checks of a held task
+        max_hold: Maximum seconds a task is held, then it is created whatever the load
+        min_first_delay: Lower bound of the first poll delay, seconds
+        max_first_delay: Upper bound of the first poll delay, seconds
+        queue_ids: Queue ids which override ``QUEUE_IDS``
+        request_url: API address for `getQueueStats` requests
+
+    Examples:
+        >>> solver = Turnstile(api_key="99d7d111a0111dc11184111c8bb111da", ...)
+        >>> solver.set_queue_monitor()  # process-wide `QUEUE_MONITOR`, first poll after the queue speed
+        >>> solver.set_queue_monitor(QueueMonitor(load_threshold=95), hold=True)  # non-urgent tasks wait for load
+
+    Notes:
+        https://anti-captcha.com/apidoc/methods/getQueueStats
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30,
+        load_threshold: Optional[float] = None,
+        hold_interval: float = 5,
+        max_hold: float = 60,
+        min_first_delay: float = 1,
+        max_first_delay: float = 30,
+        queue_ids: Optional[Dict[str, int]] = None,
+        request_url: str = BASE_REQUEST_URL,
+    ):
+        self.ttl = ttl
+        self.load_threshold = load_threshold
+        self.hold_interval = hold_interval
+        self.max_hold = max_hold
+        self.min_first_delay = min_first_delay
+        self.max_first_delay = max_first_delay
+        self.queue_ids = {**QUEUE_IDS, **(queue_ids or {})}
+        self.request_url = request_url
+
+        self._stats: Dict[int, QueueStats] = {}
+        self._updated: Dict[int, float] = {}
+        # background refreshes are kept referenced until they finish
+        self._refreshing: Set["asyncio.Task"] = set()
+        self._lock = threading.Lock()
+
+    def queue_id(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[int]:
+        return self.queue_ids.get(captcha_type) if captcha_type else None
+
+    def cached(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[QueueStats]:
+        """
+        Method return cached stats of the task type queue, without loading them
+        """
+        queue_id = self.queue_id(captcha_type)
+        return None if queue_id is None else self._stats.get(queue_id)
+
+    def stats(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[QueueStats]:
+        """
+        Method return stats of the task type queue, stale stats are refreshed first
+
+        Returns:
+            Queue stats, ``None`` if the type has no queue or the stats were never loaded
+        """
+        queue_id = self.queue_id(captcha_type)
+        if queue_id is None:
+            return None
+        if self._claim_refresh(queue_id):
+            try:
+                result = _lazy.SIOCaptchaInstrument.send_post_request(
+                    url_postfix=ControlPostfixEnm.GET_QUEUE_STATS,
+                    payload={"queueId": queue_id},
+                    request_url=self.request_url,
+                )
+            except Exception as error:
+                logging.warning("Stats of the queue %s are not loaded: %s", queue_id, error)
+            else:
+                self._update(queue_id, result)
+        return self._stats.get(queue_id)
+
+    async def aio_stats(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[QueueStats]:
+        """
+        Async method return stats of the task type queue, stale stats are refreshed in the background
+
+        Stats which were never loaded are awaited, so the first task of the queue already uses them.
+        """
+        queue_id = self.queue_id(captcha_type)
+        if queue_id is None:
+            return None
+        if self._claim_refresh(queue_id):
+            refresh = running_loop().create_task(self._aio_refresh(queue_id))
+            if queue_id not in self._stats:
+                await refresh
+            else:
+                self._refreshing.add(refresh)
+                refresh.add_done_callback(self._refreshing.discard)
+        return self._stats.get(queue_id)
+
+    def first_poll_delay(self, captcha_type: Optional[Union[CaptchaTypeEnm, str]]) -> Optional[float]:
+        """
+        Method return delay of the first poll from the queue speed, ``None`` if there are no stats
+        """
+        stats = self.cached(captcha_type)
+        if stats is None or stats.speed <= 0:
+            return None
+        return min(max(stats.speed, self.min_first_delay), self.max_first_delay)
+
+    def overloaded(self, stats: Optional[QueueStats]) -> bool:
+        """
+        Method check whether non-urgent tasks of the queue must be held
+        """
+        return self.load_threshold is not None and stats is not None and stats.load > self.load_threshold
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._updated.clear()
+
+    def _claim_refresh(self, queue_id: int) -> bool:
+        # the timestamp is taken before the request, so concurrent solves don't refresh the same queue
+        with self._lock:
+            now = time.monotonic()
+            updated = self._updated.get(queue_id)
+            if updated is not None and now - updated < self.ttl:
+                return False
+            self._updated[queue_id] = now
+            return True
+
+    async def _aio_refresh(self, queue_id: int) -> None:
+        try:
+            result = await _lazy.AIOCaptchaInstrument.send_post_request(
+                url_postfix=ControlPostfixEnm.GET_QUEUE_STATS,
+                payload={"queueId": queue_id},
+                request_url=self.request_url,
+            )
+        except Exception as error:
+            logging.warning("Stats of the queue %s are not loaded: %s", queue_id, error)
+            return
+        self._update(queue_id, result)
+
+    def _update(self, queue_id: int, result: dict) -> None:
+        try:
+            self._stats[queue_id] = msgspec.convert(result, QueueStats)
+        except msgspec.ValidationError as error:
+            logging.warning("Stats of the queue %s are not loaded: %s", queue_id, error)
+
+
+# process-wide monitor, shared by every solver which opted in
+QUEUE_MONITOR = QueueMonitor()
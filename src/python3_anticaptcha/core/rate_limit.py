@@ -0,0 +1,175 @@
+import asyncio
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple, Union
+
+from .enum import RateLimitScopeEnm
+
+__all__ = ("TokenBucket", "RateLimiter")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    A caller reserves a token under a short lock and then waits outside of it,
+    so sync callers sleep in their own thread and async callers never block the event loop.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity - number of calls allowed at once, ``rate`` rounded up by default
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("`rate` must be a positive number")
+        self.rate = rate
+        self.burst = burst if burst is not None else float(max(1, math.ceil(rate)))
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Method take one token, the token may be borrowed from the future
+
+        Returns:
+            Seconds to wait before the call is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Method block the calling thread until the call is allowed
+
+        Args:
+            max_wait: Upper bound of the wait in seconds, ``None`` - no bound
+        """
+        delay = self._clip(self.reserve(), max_wait)
+        if delay:
+            time.sleep(delay)
+
+    async def aio_acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Method wait without blocking the event loop until the call is allowed
+
+        Args:
+            max_wait: Upper bound of the wait in seconds, ``None`` - no bound
+        """
+        delay = self._clip(self.reserve(), max_wait)
+        if delay:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _clip(delay: float, max_wait: Optional[float]) -> float:
+        return delay if max_wait is None else min(delay, max_wait)
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter of API calls, with separate limits for `createTask`, `getTaskResult`
+    and account (`Control`) methods
+
+    Every API key gets its own buckets, so each account is limited independently.
+    ``None`` limit - calls of the scope are not limited.
+
+    Args:
+        create_task: Maximum `createTask` calls per second per key
+        get_task_result: Maximum `getTaskResult` calls per second per key
+        control: Maximum `getBalance`/`getQueueStats`/reports and etc. calls per second per key
+        burst: Number of calls allowed at once, by default equal to the per-second limit
+
+    Examples:
+        >>> limiter = RateLimiter(create_task=10, get_task_result=30, control=1)
+        >>> limiter.set_limits(api_key="99d7d111a0111dc11184111c8bb111da", create_task=50)
+        >>> solver = ImageToText(api_key="99d7d111a0111dc11184111c8bb111da")
+        >>> solver.set_rate_limiter(limiter)
+
+    Notes:
+        One limiter can be shared by many solvers, threads and event loops.
+    """
+
+    def __init__(
+        self,
+        create_task: Optional[float] = None,
+        get_task_result: Optional[float] = None,
+        control: Optional[float] = None,
+        burst: Optional[float] = None,
+    ):
+        self.burst = burst
+        self._limits: Dict[Optional[str], Dict[RateLimitScopeEnm, Optional[float]]] = {
+            None: {
+                RateLimitScopeEnm.CREATE_TASK: create_task,
+                RateLimitScopeEnm.GET_TASK_RESULT: get_task_result,
+                RateLimitScopeEnm.CONTROL: control,
+            }
+        }
+        self._buckets: Dict[Tuple[Optional[str], RateLimitScopeEnm], Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def set_limits(
+        self,
+        api_key: str,
+        create_task: Optional[float] = None,
+        get_task_result: Optional[float] = None,
+        control: Optional[float] = None,
+    ) -> None:
+        """
+        Method override limits of one API key, not passed limits are taken from the defaults
+        """
+        limits = dict(self._limits[None])
+        for scope, rate in (
+            (RateLimitScopeEnm.CREATE_TASK, create_task),
+            (RateLimitScopeEnm.GET_TASK_RESULT, get_task_result),
+            (RateLimitScopeEnm.CONTROL, control),
+        ):
+            if rate is not None:
+                limits[scope] = rate
+        with self._lock:
+            self._limits[api_key] = limits
+            for key in [key for key in self._buckets if key[0] == api_key]:
+                del self._buckets[key]
+
+    def bucket(self, scope: Union[RateLimitScopeEnm, str], api_key: Optional[str] = None) -> Optional[TokenBucket]:
+        """
+        Method return bucket of the API key and scope, ``None`` if the scope is not limited
+        """
+        scope = RateLimitScopeEnm(scope)
+        key = (api_key, scope)
+        bucket = self._buckets.get(key, False)
+        if bucket is not False:
+            return bucket
+        with self._lock:
+            if key not in self._buckets:
+                rate = self._limits.get(api_key, self._limits[None])[scope]
+                self._buckets[key] = TokenBucket(rate=rate, burst=self.burst) if rate else None
+            return self._buckets[key]
+
+    def acquire(
+        self, scope: Union[RateLimitScopeEnm, str], api_key: Optional[str] = None, max_wait: Optional[float] = None
+    ) -> None:
+        """
+        Method block the calling thread until the call of the scope is allowed, at most ``max_wait`` seconds
+        """
+        bucket = self.bucket(scope=scope, api_key=api_key)
+        if bucket is not None:
+            bucket.acquire(max_wait=max_wait)
+
+    async def aio_acquire(
+        self, scope: Union[RateLimitScopeEnm, str], api_key: Optional[str] = None, max_wait: Optional[float] = None
+    ) -> None:
+        """
+        Method wait without blocking the event loop until the call of the scope is allowed, at most ``max_wait`` seconds
+        """
+        bucket = self.bucket(scope=scope, api_key=api_key)
+        if bucket is not None:
+            await bucket.aio_acquire(max_wait=max_wait)
@@ -1,6 +1,6 @@
 from typing import Dict, Literal, Optional
 
-from msgspec import Struct
+from msgspec import Struct, json
 
 from .const import APP_KEY
 from .enum import ResponseStatusEnm
@@ -28,12 +28,12 @@ class CreateTaskBaseSer(BaseAPIRequestSer):
 
 class BaseAPIResponseSer(MyBaseModel):
     errorId: int = 0
-    errorCode: str = None
-    errorDescription: str = None
+    errorCode: Optional[str] = None
+    errorDescription: Optional[str] = None
 
 
 class CreateTaskResponseSer(BaseAPIResponseSer):
-    taskId: int = None
+    taskId: Optional[int] = None
 
 
 class GetTaskResultRequestSer(BaseAPIResponseSer):
@@ -54,11 +54,34 @@ HTTP API Response
 
 
 class GetTaskResultResponseSer(BaseAPIResponseSer):
-    status: ResponseStatusEnm = ResponseStatusEnm.error.value
-    solution: dict = {}
+    # error responses may send `null` in both fields
+    status: Optional[ResponseStatusEnm] = ResponseStatusEnm.error.value
+    solution: Optional[dict] = {}
     cost: float = 0.0
-    ip: str = None
-    endTime: int = None
-    createTime: int = None
+    ip: Optional[str] = None
+    endTime: Optional[int] = None
+    createTime: Optional[int] = None
     solveCount: int = 0
-    taskId: int = None
+    taskId: Optional[int] = None
+
+    def to_dict(self):
+        result = super().to_dict()
+        # results are plain JSON values, like the service response - `"ready"`, not `ResponseStatusEnm.ready`,
+        # `null` fields get the defaults of a response without them
+        status = ResponseStatusEnm.error if self.status is None else self.status
+        result["status"] = getattr(status, "value", status)
+        result["solution"] = {} if self.solution is None else self.solution
+        return result
+
+
+"""
+Cached JSON codecs - structs are encoded straight to bytes and responses decoded straight into structs.
+`strict=False` accepts numbers sent as strings, like `"cost": "0.00070"`
+"""
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+JSON_ENCODER = json.Encoder()
+JSON_DECODER = json.Decoder()
+CREATE_TASK_RESPONSE_DECODER = json.Decoder(CreateTaskResponseSer, strict=False)
+GET_TASK_RESULT_RESPONSE_DECODER = json.Decoder(GetTaskResultResponseSer, strict=False)
@@ -1,17 +1,26 @@
-import base64
 import logging
 import time
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 from urllib import parse
 from urllib.parse import urljoin
 
 import requests
-from requests.adapters import HTTPAdapter
 
-from .captcha_instrument import CaptchaInstrument
-from .const import BASE_REQUEST_URL, CREATE_TASK_POSTFIX, GET_RESULT_POSTFIX, RETRIES
-from .enum import ResponseStatusEnm, SaveFormatsEnm
-from .serializer import CreateTaskResponseSer, GetTaskResultResponseSer
+from .captcha_instrument import CaptchaFile, CaptchaInstrument, ImageBody
+from .const import BASE_REQUEST_URL, CONNECT_TIMEOUT, CREATE_TASK_POSTFIX, GET_RESULT_POSTFIX, READ_TIMEOUT
+from .enum import LifecycleEventEnm, RateLimitScopeEnm, ResponseStatusEnm, SaveFormatsEnm
+from .serializer import (
+    CREATE_TASK_RESPONSE_DECODER,
+    GET_TASK_RESULT_RESPONSE_DECODER,
+    JSON_DECODER,
+    JSON_ENCODER,
+    JSON_HEADERS,
+    CreateTaskResponseSer,
+    GetTaskResultResponseSer,
+)
+from .sio_session import SIO_SESSION_POOL
+from .task_context import TaskContext
+from .timeouts import DeadlineExceeded
 from .utils import attempts_generator
 
 __all__ = ("SIOCaptchaInstrument",)
@@ -22,37 +31,114 @@ class SIOCaptchaInstrument(CaptchaInstrument):
     Instrument for working with sync captcha
     """
 
-    def __init__(self, captcha_params: "CaptchaParams"):
+    def __init__(self, captcha_params: "CaptchaParams", task_params: Optional[dict] = None):
         super().__init__()
         self.captcha_params = captcha_params
-        # prepare session
-        self.session = requests.Session()
-        self.session.mount("http://", HTTPAdapter(max_retries=RETRIES))
-        self.session.mount("https://", HTTPAdapter(max_retries=RETRIES))
-        self.session.verify = False
+        # per-call copies of the payloads, the solver itself is never changed
+        self.context = TaskContext(captcha_params=captcha_params, task_params=task_params)
+        # shared keep-alive session, connections are reused between solves
+        self.session = captcha_params.sio_session_pool.session
+        # countdown of the whole solve call
+        self.deadline = captcha_params.timeout.deadline()
 
     def processing_captcha(self) -> dict:
-        # added task params to payload
-        self.captcha_params.create_task_payload.task.update(self.captcha_params.task_params)
+        key = self._checkout_key()
+        result = None
+        try:
+            result = self._processing(self._solve_task)
+        finally:
+            self._checkin_key(key, result)
+        return result
+
+    def processing_resume(self, entry: "JournalEntry") -> dict:
+        """
+        Method poll the journaled task until the terminal result, without creating a new task
+        """
+        self._attach(entry)
+        return self._processing(self._get_result)
+
+    def _processing(self, solve: Callable[[], dict]) -> dict:
+        result = None
+        try:
+            result = solve()
+        except DeadlineExceeded:
+            result = self._deadline_result()
+        except requests.Timeout:
+            if not self.deadline.expired():
+                raise
+            result = self._deadline_result()
+        finally:
+            self._journal_result(result)
+            self._emit_result(result)
+        return result
+
+    def _solve_task(self) -> dict:
+        self.context.get_result_params.taskId = None
 
-        created_task = self._create_task()
+        self._wait_queue()
+        created_task = self._create_task_with_policy()
+        self.created_at = time.monotonic()
 
         if created_task.errorId == 0:
-            self.captcha_params.get_result_params.taskId = created_task.taskId
+            self.context.get_result_params.taskId = created_task.taskId
+            self._journal_created()
+            self._emit(LifecycleEventEnm.TASK_CREATED)
         else:
+            self._emit(LifecycleEventEnm.TASK_CREATED, error_code=created_task.errorCode)
             return created_task.to_dict()
 
-        time.sleep(self.captcha_params.sleep_time)
+        self._schedule_hedge()
+        self._polling_schedule()
+        time.sleep(self.deadline.clip(self._next_poll_delay()))
 
         return self._get_result()
 
+    def _wait_queue(self) -> None:
+        """
+        Method load the queue stats and hold a non-urgent task while the queue is overloaded
+        """
+        monitor = self.captcha_params.queue_monitor
+        if monitor is None:
+            return
+        held = 0.0
+        while True:
+            delay = self._queue_hold_delay(monitor.stats(self.captcha_type), held)
+            if delay is None:
+                return
+            time.sleep(self.deadline.clip(delay))
+            self.deadline.check()
+            held += delay
+
+    def _create_task_with_policy(self) -> CreateTaskResponseSer:
+        """
+        Method create the task, transient errors are retried as the error policy decides
+        """
+        attempt = 0
+        try:
+            while True:
+                pause = self._create_task_pause()
+                if pause:
+                    time.sleep(self.deadline.clip(pause))
+                    self.deadline.check()
+                created_task = self._create_task()
+                delay = self._create_task_retry_delay(created_task, attempt)
+                if delay is None:
+                    return created_task
+                time.sleep(self.deadline.clip(delay))
+                self.deadline.check()
+                attempt += 1
+        finally:
+            # a hedged task keeps the payload until `_schedule_hedge` decides
+            if self.captcha_params.hedge_policy is None:
+                self._create_task_data = None
+
     def processing_image_captcha(
         self,
         save_format: Union[str, SaveFormatsEnm],
         img_clearing: bool,
         captcha_link: str,
-        captcha_file: str,
-        captcha_base64: bytes,
+        captcha_file: CaptchaFile,
+        captcha_base64: ImageBody,
         img_path: str,
     ) -> dict:
         self.__body_file_processing(
@@ -63,9 +149,24 @@ class SIOCaptchaInstrument(CaptchaInstrument):
             captcha_file=captcha_file,
             captcha_base64=captcha_base64,
         )
-        if not self.result.errorId:
-            return self.processing_captcha()
-        return self.result.to_dict()
+        if self.result.errorId:
+            return self.result.to_dict()
+
+        cache_key = self._result_cache_key()
+        if cache_key is not None:
+            cached_result = self.captcha_params.result_cache.get(cache_key)
+            if cached_result is not None:
+                self._release_body()
+                return cached_result
+
+        try:
+            result = self.processing_captcha()
+        finally:
+            # the body is normally released once encoded, a solve failing before that must not keep the mapping
+            self._release_body()
+        if cache_key is not None:
+            self.captcha_params.result_cache.put(cache_key, result)
+        return result
 
     def __body_file_processing(
         self,
@@ -74,20 +175,16 @@ class SIOCaptchaInstrument(CaptchaInstrument):
         file_path: str,
         file_extension: str = "png",
         captcha_link: Optional[str] = None,
-        captcha_file: Optional[str] = None,
-        captcha_base64: Optional[bytes] = None,
+        captcha_file: Optional[CaptchaFile] = None,
+        captcha_base64: Optional[ImageBody] = None,
         **kwargs,
     ):
         # if a local file link is passed
         if captcha_file:
-            self.captcha_params.create_task_payload.task.update(
-                {"body": base64.b64encode(self._local_file_captcha(captcha_file=captcha_file)).decode("utf-8")}
-            )
-        # if the file is transferred in base64 encoding
+            self._set_file_body(captcha_file=captcha_file)
+        # if the file is transferred in memory - raw bytes or already base64 encoded `str`
         elif captcha_base64:
-            self.captcha_params.create_task_payload.task.update(
-                {"body": base64.b64encode(captcha_base64).decode("utf-8")}
-            )
+            self._set_body(captcha_base64)
         # if a URL is passed
         elif captcha_link:
             try:
@@ -97,7 +194,7 @@ class SIOCaptchaInstrument(CaptchaInstrument):
                     full_file_path = self._file_const_saver(content, file_path, file_extension=file_extension)
                     if img_clearing:
                         self._file_clean(full_file_path=full_file_path)
-                self.captcha_params.create_task_payload.task.update({"body": base64.b64encode(content).decode("utf-8")})
+                self._set_body(content)
             except Exception as error:
                 self.result.errorId = 12
                 self.result.errorCode = self.NO_CAPTCHA_ERR
@@ -111,14 +208,25 @@ class SIOCaptchaInstrument(CaptchaInstrument):
         """
         Function send SYNC request to service and wait for result
         """
+        self._acquire_rate_limit(RateLimitScopeEnm.CREATE_TASK)
+        timeout = self.deadline.sio_timeout()
+        # a retried `createTask` belongs to the same solve call, so the task is sent once
+        if self.sent_at is None:
+            self.sent_at = time.monotonic()
+            self._emit(LifecycleEventEnm.TASK_SENT)
         try:
             resp = self.session.post(
-                parse.urljoin(BASE_REQUEST_URL, url_postfix), json=self.captcha_params.create_task_payload.to_dict()
+                parse.urljoin(self.captcha_params.request_url, url_postfix),
+                data=self._encode_create_task(),
+                headers=JSON_HEADERS,
+                timeout=timeout,
             )
             if resp.status_code == 200:
-                return CreateTaskResponseSer(**resp.json())
-            else:
-                raise ValueError(resp.raise_for_status())
+                return CREATE_TASK_RESPONSE_DECODER.decode(resp.content)
+            http_error = self._create_task_http_error(resp.status_code)
+            if http_error is not None:
+                return http_error
+            raise ValueError(resp.raise_for_status())
         except Exception as error:
             logging.exception(error)
             raise
@@ -127,46 +235,84 @@ class SIOCaptchaInstrument(CaptchaInstrument):
         """
         Method open links
         """
+        kwargs.setdefault("timeout", self.deadline.sio_timeout())
         return self.session.get(url=url, **kwargs)
 
     def _get_result(self, url_response: str = GET_RESULT_POSTFIX) -> dict:
         attempts = attempts_generator()
-        captcha_response = GetTaskResultResponseSer(taskId=self.captcha_params.get_result_params.taskId)
+        task_id = self.context.get_result_params.taskId
+        # payloads are the same for every poll - encode them once, a hedged task adds its duplicate
+        polled = {task_id: JSON_ENCODER.encode(self.context.get_result_params)}
+        captcha_response = GetTaskResultResponseSer(taskId=task_id)
         for _ in attempts:
-            captcha_response = GetTaskResultResponseSer(
-                **self.session.post(
-                    url=urljoin(BASE_REQUEST_URL, url_response), json=self.captcha_params.get_result_params.to_dict()
-                ).json(),
-                taskId=self.captcha_params.get_result_params.taskId,
-            )
+            for task_id, payload in list(polled.items()):
+                self._acquire_rate_limit(RateLimitScopeEnm.GET_TASK_RESULT)
+                captcha_response = GET_TASK_RESULT_RESPONSE_DECODER.decode(
+                    self.session.post(
+                        url=urljoin(self.captcha_params.request_url, url_response),
+                        data=payload,
+                        headers=JSON_HEADERS,
+                        timeout=self.deadline.sio_timeout(),
+                    ).content
+                )
+                captcha_response.taskId = task_id
+                self.poll_count += 1
+                self._emit(
+                    LifecycleEventEnm.POLLED, status=captcha_response.status, error_code=captcha_response.errorCode
+                )
 
-            # An error response is terminal — return immediately.
-            if captcha_response.errorId != 0:
-                self.session.close()
+                # An error response is terminal — return immediately, unless the other hedged task goes on.
+                if captcha_response.errorId != 0:
+                    if len(polled) > 1:
+                        self._drop_hedged_task(task_id, polled, captcha_response.to_dict())
+                        continue
+                    return captcha_response.to_dict()
+                # Still processing — poll the other hedged task, if any.
+                if captcha_response.status == ResponseStatusEnm.processing:
+                    continue
+                # Any other status (e.g. ``ready``) is terminal.
+                self._settle_hedge(task_id, polled)
+                self._observe_result(captcha_response.status, captcha_response.createTime, captcha_response.endTime)
                 return captcha_response.to_dict()
-            # Still processing — wait and poll again.
-            if captcha_response.status == ResponseStatusEnm.processing:
-                time.sleep(self.captcha_params.sleep_time)
-                continue
-            # Any other status (e.g. ``ready``) is terminal.
-            self.session.close()
-            return captcha_response.to_dict()
+            # Not ready yet — create the duplicate of a slow task, wait and poll again.
+            if self._hedge_due():
+                self._hedge_created(self._create_hedge(), polled)
+            time.sleep(self.deadline.clip(self._next_poll_delay()))
         # Attempts exhausted while still processing; return the last response.
         return captcha_response.to_dict()
 
+    def _create_hedge(self) -> CreateTaskResponseSer:
+        """
+        Method create the duplicate task, its failure never fails the solve call
+        """
+        try:
+            return self._create_task()
+        except Exception as error:
+            return self._hedge_error(error)
+
     @staticmethod
     def send_post_request(
         payload: Optional[dict] = None,
-        session: requests.Session = requests.Session(),
+        session: Optional[requests.Session] = None,
         url_postfix: str = CREATE_TASK_POSTFIX,
+        rate_limiter: Optional["RateLimiter"] = None,
+        request_url: str = BASE_REQUEST_URL,
     ) -> dict:
         """
         Function send SYNC request to service and wait for result
         """
+        session = session or SIO_SESSION_POOL.session
         try:
-            resp = session.post(parse.urljoin(BASE_REQUEST_URL, url_postfix), json=payload)
+            if rate_limiter is not None:
+                rate_limiter.acquire(scope=RateLimitScopeEnm.CONTROL, api_key=(payload or {}).get("clientKey"))
+            resp = session.post(
+                parse.urljoin(request_url, url_postfix),
+                data=JSON_ENCODER.encode(payload),
+                headers=JSON_HEADERS,
+                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+            )
             if resp.status_code == 200:
-                return resp.json()
+                return JSON_DECODER.decode(resp.content)
             else:
                 raise ValueError(resp.raise_for_status())
         except Exception as error:
@@ -0,0 +1,109 @@
+import threading
+from typing import Optional
+
+__all__ = ("SIOSessionPool", "SIO_SESSION_POOL")
+
+
+class SIOSessionPool:
+    """
+    Process-wide keep-alive pool of ``requests`` connections shared by every sync instrument
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of keep-alive connections kept per host
+
+    Notes:
+        The session is created lazily on first use and re-created after ``close()``,
+        so closing the pool only drops the warm sockets - it never breaks later calls.
+        Context managers of the solvers never close the pool - other threads may still be
+        polling with it. It is closed only by ``close()``.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+
+        self._session: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+
+    def configure(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None) -> None:
+        """
+        Method change pool size, adapters of the new size are mounted on the live session
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of keep-alive connections kept per host
+
+        Notes:
+            The session is not closed - other threads may be in the middle of a request.
+            Their requests finish on the replaced adapters, whose idle connections are then released.
+        """
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if self._session is not None:
+                self._mount_adapters(self._session)
+
+    def ensure_maxsize(self, pool_maxsize: int) -> None:
+        """
+        Method grow the per-host pool to ``pool_maxsize`` connections, a larger pool is kept as is
+
+        Args:
+            pool_maxsize: Minimal number of keep-alive connections kept per host,
+                            usually the number of threads sending requests
+        """
+        if self.pool_maxsize < pool_maxsize:
+            self.configure(pool_maxsize=pool_maxsize)
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        Shared ``requests.Session``, created on first access
+        """
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def close(self) -> None:
+        """
+        Method close all pooled connections
+        """
+        with self._lock:
+            self._close_session()
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        import urllib3
+
+        # sessions skip TLS verification, so its warning is silenced together with the first session
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        session = requests.Session()
+        self._mount_adapters(session)
+        session.verify = False
+        return session
+
+    def _mount_adapters(self, session: "requests.Session") -> None:
+        from requests.adapters import HTTPAdapter
+
+        from .const import RETRIES
+
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=RETRIES
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def _close_session(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+# default pool used by all sync solvers and `Control` methods
+SIO_SESSION_POOL = SIOSessionPool()
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from msgspec import structs
+
+from .serializer import CreateTaskBaseSer, GetTaskResultRequestSer
+
+__all__ = ("TaskContext",)
+
+
+class TaskContext:
+    """
+    Per-call state of one solve call
+
+    The solver object is a read-only template - API key, task type and task options.
+    Every handler call gets its own context with copies of the request payloads, so the task body,
+    the `taskId`, the API key picked by a key pool and the per-call task options never touch
+    the template and never leak into concurrent or later calls.
+
+    Args:
+        captcha_params: Solver used as the template
+        task_params: Per-call task options, override the options of the template
+    """
+
+    __slots__ = ("create_task_payload", "get_result_params")
+
+    def __init__(self, captcha_params: "CaptchaParams", task_params: Optional[dict] = None):
+        template = captcha_params.create_task_payload
+        self.create_task_payload: CreateTaskBaseSer = structs.replace(
+            template, task={**template.task, **captcha_params.task_params, **(task_params or {})}
+        )
+        self.get_result_params = GetTaskResultRequestSer(clientKey=captcha_params.get_result_params.clientKey)
@@ -0,0 +1,104 @@
+import time
+from typing import Optional, Tuple
+
+from .const import CONNECT_TIMEOUT, READ_TIMEOUT
+
+__all__ = ("SolveTimeout", "Deadline", "DeadlineExceeded")
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised inside the instruments when the solve deadline expires,
+    turned into a partial `processing` result with the `taskId`
+    """
+
+
+class SolveTimeout:
+    """
+    Timeouts of one solve call
+
+    Args:
+        total: Seconds for the whole solve - task creation, all polls and sleeps, ``None`` - no limit
+        connect: Seconds to establish a connection of every HTTP call
+        read: Seconds to wait for the response data of every HTTP call
+    """
+
+    def __init__(
+        self,
+        total: Optional[float] = None,
+        connect: Optional[float] = CONNECT_TIMEOUT,
+        read: Optional[float] = READ_TIMEOUT,
+    ):
+        self.total = total
+        self.connect = connect
+        self.read = read
+
+    def deadline(self) -> "Deadline":
+        """
+        Method start the countdown of a new solve call
+        """
+        return Deadline(total=self.total, connect=self.connect, read=self.read)
+
+
+class Deadline:
+    """
+    Countdown of one solve call, clips every HTTP timeout and sleep to the remaining time
+    """
+
+    def __init__(
+        self,
+        total: Optional[float] = None,
+        connect: Optional[float] = CONNECT_TIMEOUT,
+        read: Optional[float] = READ_TIMEOUT,
+    ):
+        self.expires_at = time.monotonic() + total if total is not None else None
+        self.connect = connect
+        self.read = read
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left till the deadline, ``None`` - no deadline
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded()
+
+    def clip(self, delay: float) -> float:
+        """
+        Method shorten the sleep, so it ends not later than the deadline
+        """
+        remaining = self.remaining()
+        return delay if remaining is None else min(delay, remaining)
+
+    def _clip_optional(self, timeout: Optional[float]) -> Optional[float]:
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def sio_timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        `timeout` argument of `requests` calls - ``(connect, read)``
+        """
+        self.check()
+        return self._clip_optional(self.connect), self._clip_optional(self.read)
+
+    def aio_timeout(self) -> "aiohttp.ClientTimeout":
+        """
+        `timeout` argument of `aiohttp` calls
+        """
+        import aiohttp
+
+        self.check()
+        return aiohttp.ClientTimeout(
+            total=self.remaining(),
+            sock_connect=self._clip_optional(self.connect),
+            sock_read=self._clip_optional(self.read),
+        )
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from .enum import ResponseStatusEnm
+
+__all__ = ("TokenPool",)
+
+# (type, websiteURL, websiteKey, action)
+PoolKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+class _WarmPool:
+    """
+    Solved tokens, demand and refill state of one pool key
+    """
+
+    def __init__(self, solver: "CaptchaParams", size: int):
+        self.solver = solver
+        self.size = size
+        # (expires at, result), oldest first
+        self.tokens: Deque[Tuple[float, dict]] = deque()
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.requests: Deque[float] = deque()
+        self.in_flight: Set[asyncio.Task] = set()
+        self.solve_time: Optional[float] = None
+        # created with the refill task, `add` may be called outside of the loop
+        self.wakeup: Optional[asyncio.Event] = None
+        self.refill: Optional[asyncio.Task] = None
+        self.backoff_until = 0.0
+
+
+class TokenPool:
+    """
+    Warm pool of pre-solved tokens for token captchas - `Turnstile`, `ReCaptchaV2`, `ReCaptchaV3` and etc.
+
+    Every registered solver gets its own pool keyed by ``(type, websiteURL, websiteKey, action)``.
+    The pool keeps at least ``size`` tokens solved or in progress and grows the target
+    with the measured demand rate, so tokens consumed during one solve time are replaced in time.
+    Token expiry is tracked from the `endTime` of the result, stale tokens are evicted.
+
+    Args:
+        size: Minimum number of tokens kept ready or in progress for every key
+        max_size: Upper bound of the demand driven target
+        token_ttl: Seconds a token stays valid after it is solved
+        safety_margin: Seconds before expiry after which a token is not handed out anymore
+        demand_window: Seconds of consumer requests used to measure the demand rate
+        error_backoff: Seconds to wait before the next refill after a failed solve
+
+    Examples:
+        >>> pool = TokenPool(size=3)
+        >>> solver = Turnstile(
+        ...     api_key="99d7d111a0111dc11184111c8bb111da",
+        ...     captcha_type="TurnstileTaskProxyless",
+        ...     websiteURL="https://demo.turnstile.workers.dev/",
+        ...     websiteKey="1x00000000000000000000AA",
+        ... )
+        >>> async with pool:
+        ...     pool.add(solver)
+        ...     result = await pool.get(solver)
+        ...     result["solution"]["token"]
+        "0.Qz0.....f1"
+
+    Notes:
+        The pool runs in the event loop where it was started, every refill is a paid task.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_size: int = 20,
+        token_ttl: float = 120,
+        safety_margin: float = 10,
+        demand_window: float = 60,
+        error_backoff: float = 5,
+    ):
+        self.size = size
+        self.max_size = max_size
+        self.token_ttl = token_ttl
+        self.safety_margin = safety_margin
+        self.demand_window = demand_window
+        self.error_backoff = error_backoff
+
+        self._pools: Dict[PoolKey, _WarmPool] = {}
+        self._running = False
+
+    @staticmethod
+    def key(solver: "CaptchaParams") -> PoolKey:
+        params = solver.task_params
+        return (
+            params.get("type"),
+            params.get("websiteURL"),
+            params.get("websiteKey"),
+            params.get("action") or params.get("pageAction"),
+        )
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+        if exc_type:
+            return False
+        return True
+
+    async def start(self) -> None:
+        """
+        Method start background refill of all registered keys
+        """
+        self._running = True
+        for pool in self._pools.values():
+            self._start_refill(pool)
+
+    async def stop(self) -> None:
+        """
+        Method stop refilling, cancel solves in progress and pending consumers
+        """
+        self._running = False
+        tasks = []
+        for pool in self._pools.values():
+            tasks.extend(pool.in_flight)
+            if pool.refill is not None:
+                tasks.append(pool.refill)
+                pool.refill = None
+            while pool.waiters:
+                pool.waiters.popleft().cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def add(self, solver: "CaptchaParams", size: Optional[int] = None) -> PoolKey:
+        """
+        Method register solver, its key is refilled in the background
+
+        Args:
+            solver: Configured token captcha solver, used as a template for every refill task
+            size: Minimum pool size of this key, ``TokenPool.size`` by default
+
+        Returns:
+            Pool key of the solver
+        """
+        key = self.key(solver)
+        if key not in self._pools:
+            pool = self._pools[key] = _WarmPool(solver=solver, size=self.size if size is None else size)
+            if self._running:
+                self._start_refill(pool)
+        return key
+
+    def ready(self, solver: "CaptchaParams") -> int:
+        """
+        Number of valid tokens ready for the solver key
+        """
+        pool = self._pools.get(self.key(solver))
+        if pool is None:
+            return 0
+        self._evict(pool)
+        return len(pool.tokens)
+
+    def get_nowait(self, solver: "CaptchaParams") -> Optional[dict]:
+        """
+        Method return ready solving result, ``None`` if the pool of the key is empty
+        """
+        pool = self._pools[self.key(solver)]
+        self._demand(pool)
+        self._evict(pool)
+        if not pool.tokens:
+            return None
+        _, result = pool.tokens.popleft()
+        return result
+
+    async def get(self, solver: "CaptchaParams", timeout: Optional[float] = None) -> dict:
+        """
+        Method return ready solving result, waits for the next solved token if the pool is empty
+
+        Args:
+            solver: Solver registered with ``add``
+            timeout: Seconds to wait for a token, ``None`` - no limit
+
+        Returns:
+            Dict with full server response
+        """
+        pool = self._pools[self.key(solver)]
+        self._demand(pool)
+        self._evict(pool)
+        if pool.tokens:
+            return pool.tokens.popleft()[1]
+
+        future = asyncio.get_running_loop().create_future()
+        pool.waiters.append(future)
+        self._wake(pool)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            if future in pool.waiters:
+                pool.waiters.remove(future)
+
+    def _start_refill(self, pool: _WarmPool) -> None:
+        if pool.refill is None or pool.refill.done():
+            # the event is bound to the running loop on Python < 3.10, so it's created under it
+            pool.wakeup = asyncio.Event()
+            pool.refill = asyncio.create_task(self._refill(pool))
+
+    @staticmethod
+    def _wake(pool: _WarmPool) -> None:
+        if pool.wakeup is not None:
+            pool.wakeup.set()
+
+    def _demand(self, pool: _WarmPool) -> None:
+        now = time.monotonic()
+        pool.requests.append(now)
+        while pool.requests and pool.requests[0] < now - self.demand_window:
+            pool.requests.popleft()
+        self._wake(pool)
+
+    def _evict(self, pool: _WarmPool) -> None:
+        deadline = time.time() + self.safety_margin
+        while pool.tokens and pool.tokens[0][0] <= deadline:
+            pool.tokens.popleft()
+
+    def _target(self, pool: _WarmPool) -> int:
+        """
+        Number of tokens which should be ready or in progress - demand during one solve time, at least ``size``
+        """
+        rate = len(pool.requests) / self.demand_window
+        expected = math.ceil(rate * (pool.solve_time or 0))
+        return min(max(pool.size, expected + len(pool.waiters)), self.max_size)
+
+    async def _refill(self, pool: _WarmPool) -> None:
+        # the flag also ends the loop if `wait_for` swallows the cancellation on stop
+        while self._running:
+            pool.wakeup.clear()
+            self._evict(pool)
+            wait = 1.0
+            if time.monotonic() >= pool.backoff_until:
+                missing = self._target(pool) - len(pool.tokens) - len(pool.in_flight)
+                for _ in range(max(missing, 0)):
+                    task = asyncio.create_task(self._solve(pool))
+                    pool.in_flight.add(task)
+                    task.add_done_callback(pool.in_flight.discard)
+            else:
+                wait = pool.backoff_until - time.monotonic()
+            try:
+                await asyncio.wait_for(pool.wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _solve(self, pool: _WarmPool) -> None:
+        try:
+            result = await pool.solver.aio_captcha_handler()
+        except Exception as error:
+            logging.exception(error)
+            result = None
+
+        if not result or result.get("errorId") or result.get("status") != ResponseStatusEnm.ready:
+            logging.warning("Token pool refill failed: %s", result and result.get("errorCode"))
+            pool.backoff_until = time.monotonic() + self.error_backoff
+        else:
+            end_time = result.get("endTime") or time.time()
+            create_time = result.get("createTime")
+            if create_time is not None:
+                solve_time = float(end_time - create_time)
+                pool.solve_time = solve_time if pool.solve_time is None else 0.8 * pool.solve_time + 0.2 * solve_time
+            self._put(pool, expires=end_time + self.token_ttl, result=result)
+        self._wake(pool)
+
+    def _put(self, pool: _WarmPool, expires: float, result: dict) -> None:
+        while pool.waiters:
+            future = pool.waiters.popleft()
+            if not future.done():
+                future.set_result(result)
+                return
+        pool.tokens.append((expires, result))
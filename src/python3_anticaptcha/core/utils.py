@@ -1,4 +1,10 @@
-from typing import Generator
+import importlib
+from typing import Any, Dict, Generator
+
+INSTRUMENT_MODULES = {
+    "SIOCaptchaInstrument": "python3_anticaptcha.core.sio_captcha_instrument",
+    "AIOCaptchaInstrument": "python3_anticaptcha.core.aio_captcha_instrument",
+}
 
 
 # Connection retry generator
@@ -23,3 +29,66 @@ def attempts_generator(amount: int = 30) -> Generator:
         Attempt number
     """
     yield from range(1, amount)
+
+
+class LazyImports:
+    """
+    Module attributes which are imported on first access
+
+    Keeps the import of the package cheap - transports (`requests`, `aiohttp`) are loaded
+    only by the processes which send requests with them.
+
+    Args:
+        module_globals: ``globals()`` of the module, imported values are cached there
+        attributes: Mapping of attribute name to the module it is imported from
+
+    Examples:
+        >>> _lazy = LazyImports(globals(), SIOCaptchaInstrument="python3_anticaptcha.core.sio_captcha_instrument")
+        >>> __getattr__ = _lazy.module_getattr  # `from module import SIOCaptchaInstrument`
+        >>> _lazy.SIOCaptchaInstrument  # access inside the module
+    """
+
+    def __init__(self, module_globals: Dict[str, Any], **attributes: str):
+        self._globals = module_globals
+        self._attributes = attributes
+
+    def module_getattr(self, name: str) -> Any:
+        if name not in self._attributes:
+            raise AttributeError(f"module {self._globals['__name__']!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(self._attributes[name]), name)
+        self._globals[name] = value
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        # a value already in the module namespace wins, so it can be patched as usual
+        if name in self._globals:
+            return self._globals[name]
+        return self.module_getattr(name)
+
+
+def lazy_instruments(module_globals: Dict[str, Any], **attributes: str) -> LazyImports:
+    """
+    Function create lazy imports of the sync and async instruments for the module
+
+    Instruments are imported on the first solve, so sync-only or async-only processes load only their own backend.
+
+    Args:
+        module_globals: ``globals()`` of the module
+        attributes: Other lazily imported attributes of the module
+
+    Examples:
+        >>> _lazy = lazy_instruments(globals())
+        >>> __getattr__ = _lazy.module_getattr
+    """
+    return LazyImports(module_globals, **INSTRUMENT_MODULES, **attributes)
+
+
+def running_loop() -> "asyncio.AbstractEventLoop":
+    """
+    Function return the running event loop
+
+    asyncio is already loaded by the async caller, sync-only processes never import it.
+    """
+    import asyncio
+
+    return asyncio.get_running_loop()
@@ -20,7 +20,7 @@ class CustomTask(CaptchaParams):
         domainsOfInterest: list = [],
         proxyType: ProxyTypeEnm = ProxyTypeEnm.https,
         captcha_type: CaptchaTypeEnm = CaptchaTypeEnm.AntiGateTask,
-        sleep_time: Optional[int] = 10,
+        sleep_time: Optional[float] = 10,
     ):
         """
         The class is used to work with CustomTask - AntiGateTask.
@@ -19,7 +19,7 @@ class FriendlyCaptcha(CaptchaParams):
         proxyLogin: Optional[str] = None,
         proxyPassword: Optional[str] = None,
         userAgent: Optional[str] = None,
-        sleep_time: Optional[int] = 10,
+        sleep_time: Optional[float] = 10,
     ):
         """
         The class is used to work with FriendlyCaptcha.
@@ -23,7 +23,7 @@ class GeeTest(CaptchaParams):
         proxyLogin: Optional[str] = None,
         proxyPassword: Optional[str] = None,
         userAgent: Optional[str] = None,
-        sleep_time: int = 10,
+        sleep_time: float = 10,
     ):
         """
         The class is used to work with GeeTest.
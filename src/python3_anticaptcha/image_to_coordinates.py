@@ -1,9 +1,12 @@
 from typing import Optional, Union
 
-from .core.aio_captcha_instrument import AIOCaptchaInstrument
 from .core.base import CaptchaParams
+from .core.captcha_instrument import CaptchaFile, ImageBody
 from .core.enum import CaptchaTypeEnm, SaveFormatsEnm
-from .core.sio_captcha_instrument import SIOCaptchaInstrument
+from .core.utils import lazy_instruments
+
+_lazy = lazy_instruments(globals())
+__getattr__ = _lazy.module_getattr
 
 __all__ = ("ImageToCoordinates",)
 
@@ -16,7 +19,7 @@ class ImageToCoordinates(CaptchaParams):
         mode: str = "points",
         websiteURL: Optional[str] = None,
         captcha_type: Union[CaptchaTypeEnm, str] = CaptchaTypeEnm.ImageToCoordinatesTask,
-        sleep_time: int = 5,
+        sleep_time: float = 5,
         save_format: Union[str, SaveFormatsEnm] = SaveFormatsEnm.TEMP,
         img_clearing: bool = True,
         img_path: str = "PythonAntiCaptchaImages",
@@ -136,8 +139,8 @@ class ImageToCoordinates(CaptchaParams):
     def captcha_handler(
         self,
         captcha_link: Optional[str] = None,
-        captcha_file: Optional[str] = None,
-        captcha_base64: Optional[bytes] = None,
+        captcha_file: Optional[CaptchaFile] = None,
+        captcha_base64: Optional[ImageBody] = None,
         **additional_params,
     ) -> dict:
         """
@@ -145,8 +148,9 @@ class ImageToCoordinates(CaptchaParams):
 
         Args:
             captcha_link: link to captcha image file
-            captcha_file: path to local captcha image file
-            captcha_base64: captcha image encoded in base64 format
+            captcha_file: path to local captcha image file or binary file object, the file is memory-mapped
+            captcha_base64: captcha image in memory - raw ``bytes``/``memoryview``
+                                or ``str`` which is already encoded in base64 format
             additional_params: Some additional parameters that will be used in creating the task
                                 and will be passed to the payload under ``task`` key.
                                 Like ``proxyLogin``, ``proxyPassword`` and etc. - more info in service docs
@@ -157,10 +161,16 @@ class ImageToCoordinates(CaptchaParams):
         Notes:
             Check class docstirng for more info
         """
-        self.task_params.update({**additional_params})
-
-        self._captcha_handling_instrument = SIOCaptchaInstrument(captcha_params=self)
-        return self._captcha_handling_instrument.processing_image_captcha(
+        if self.engine is not None:
+            return self.engine.run(
+                self.aio_captcha_handler(
+                    captcha_link=captcha_link,
+                    captcha_file=captcha_file,
+                    captcha_base64=captcha_base64,
+                    **additional_params,
+                )
+            )
+        return _lazy.SIOCaptchaInstrument(captcha_params=self, task_params=additional_params).processing_image_captcha(
             save_format=self.save_format,
             img_clearing=self.img_clearing,
             img_path=self.img_path,
@@ -172,8 +182,8 @@ class ImageToCoordinates(CaptchaParams):
     async def aio_captcha_handler(
         self,
         captcha_link: Optional[str] = None,
-        captcha_file: Optional[str] = None,
-        captcha_base64: Optional[bytes] = None,
+        captcha_file: Optional[CaptchaFile] = None,
+        captcha_base64: Optional[ImageBody] = None,
         **additional_params,
     ) -> dict:
         """
@@ -181,8 +191,9 @@ class ImageToCoordinates(CaptchaParams):
 
         Args:
             captcha_link: link to captcha image file
-            captcha_file: path to local captcha image file
-            captcha_base64: captcha image encoded in base64 format
+            captcha_file: path to local captcha image file or binary file object, the file is memory-mapped
+            captcha_base64: captcha image in memory - raw ``bytes``/``memoryview``
+                                or ``str`` which is already encoded in base64 format
             additional_params: Some additional parameters that will be used in creating the task
                                 and will be passed to the payload under ``task`` key.
                                 Like ``proxyLogin``, ``proxyPassword`` and etc. - more info in service docs
@@ -193,10 +204,9 @@ class ImageToCoordinates(CaptchaParams):
         Notes:
             Check class docstirng for more info
         """
-        self.task_params.update({**additional_params})
-
-        self._captcha_handling_instrument = AIOCaptchaInstrument(captcha_params=self)
-        return await self._captcha_handling_instrument.processing_image_captcha(
+        return await _lazy.AIOCaptchaInstrument(
+            captcha_params=self, task_params=additional_params
+        ).processing_image_captcha(
             save_format=self.save_format,
             img_clearing=self.img_clearing,
             img_path=self.img_path,
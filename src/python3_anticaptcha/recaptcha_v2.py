@@ -24,7 +24,7 @@ class ReCaptchaV2(CaptchaParams):
         proxyPassword: Optional[str] = None,
         userAgent: Optional[str] = None,
         cookies: Optional[str] = None,
-        sleep_time: int = 10,
+        sleep_time: float = 10,
     ):
         """
         The class is used to work with ReCaptchaV2 and RecaptchaV2Enterprise.
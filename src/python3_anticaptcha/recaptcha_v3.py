@@ -17,7 +17,7 @@ class ReCaptchaV3(CaptchaParams):
         isEnterprise: bool = False,
         apiDomain: Optional[str] = None,
         captcha_type: CaptchaTypeEnm = CaptchaTypeEnm.RecaptchaV3TaskProxyless,
-        sleep_time: int = 10,
+        sleep_time: float = 10,
     ):
         """
         The class is used to work with ReCaptchaV3 and RecaptchaV3Enterprise.
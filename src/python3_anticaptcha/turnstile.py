@@ -20,7 +20,7 @@ class Turnstile(CaptchaParams):
         proxyPort: Optional[int] = None,
         proxyLogin: Optional[str] = None,
         proxyPassword: Optional[str] = None,
-        sleep_time: Optional[int] = 10,
+        sleep_time: Optional[float] = 10,
     ):
         """
         The class is used to work with Turnstile.
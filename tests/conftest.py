@@ -14,6 +14,7 @@ import string
 import pytest
 
 from python3_anticaptcha.core.enum import ProxyTypeEnm
+from python3_anticaptcha.core.polling import POLLING_PROFILES
 
 # Re-export the transport fixtures for module-level tests. The implementation
 # lives in tests/core/conftest.py beside the instrument tests, but pytest only
@@ -25,6 +26,13 @@ from tests.core.conftest import aio_http, sio_http  # noqa: F401
 API_KEY = "0" * 32
 
 
+@pytest.fixture(autouse=True)
+def reset_polling_profiles():
+    """Solve times learned in one test must not reshape polling in the next."""
+    yield
+    POLLING_PROFILES.reset()
+
+
 @pytest.fixture(scope="function")
 def api_key() -> str:
     """A deterministic, obviously-fake API key for request-payload assertions."""
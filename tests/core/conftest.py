@@ -14,9 +14,21 @@ loops in ``_get_result`` do not slow the suite down.
 from copy import deepcopy
 from unittest.mock import MagicMock
 
+import msgspec
 import pytest
 
 
+def request_json(kwargs: dict):
+    """Decode the JSON body of a recorded ``post`` call.
+
+    Instruments send msgspec-encoded bytes as ``data=`` rather than ``json=``;
+    tests assert on the decoded payload, i.e. on exactly what goes over the wire.
+    """
+    if "data" in kwargs:
+        return msgspec.json.decode(kwargs["data"])
+    return kwargs.get("json")
+
+
 # --------------------------------------------------------------------------- #
 # Sync (requests) helpers
 # --------------------------------------------------------------------------- #
@@ -25,7 +37,8 @@ def resp(payload: dict, status_code: int = 200, content: bytes = b"") -> MagicMo
     mock = MagicMock(name="response")
     mock.status_code = status_code
     mock.json.return_value = payload
-    mock.content = content
+    # instruments decode raw response bytes; GET (image download) tests pass their own content
+    mock.content = content or msgspec.json.encode(payload)
     mock.raise_for_status.return_value = None
     return mock
 
@@ -79,6 +92,9 @@ class FakeAioResp:
     async def json(self) -> dict:
         return self._payload
 
+    async def read(self) -> bytes:
+        return msgspec.json.encode(self._payload)
+
 
 class _FakeAioCM:
     """Async context manager wrapping a :class:`FakeAioResp`."""
@@ -106,6 +122,7 @@ class FakeAioSession:
         self._get_queue = get_queue
         self.post_calls: list = []
         self.get_calls: list = []
+        self.closed = False
 
     async def __aenter__(self):
         return self
@@ -113,6 +130,9 @@ class FakeAioSession:
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
+    async def close(self):
+        self.closed = True
+
     def post(self, *args, **kwargs):
         self.post_calls.append({"args": args, "kwargs": kwargs})
         item = self._post_queue.pop(0)
@@ -163,7 +183,9 @@ def aio_http(mocker):
 
     Every ``aiohttp.ClientSession()`` instantiation yields a
     :class:`FakeAioSession` backed by shared FIFO queues, so the full async
-    create-task/get-result flow runs without network or real waiting.
+    create-task/get-result flow runs without network or real waiting. The
+    per-loop session pool caches whatever the factory returns, and every test
+    runs on a fresh loop, so a fake never leaks into the next test.
     """
     mocker.patch("asyncio.sleep")
     post_queue: list = []
@@ -13,7 +13,8 @@ from python3_anticaptcha.core.aio_captcha_instrument import AIOCaptchaInstrument
 from python3_anticaptcha.core.base import CaptchaParams
 from python3_anticaptcha.core.const import APP_KEY, BASE_REQUEST_URL, CREATE_TASK_POSTFIX, GET_RESULT_POSTFIX
 from python3_anticaptcha.core.enum import SaveFormatsEnm
-from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY
+from python3_anticaptcha.core.key_pool import KeyPool
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY, request_json
 
 CREATE_URL = BASE_REQUEST_URL.rstrip("/") + CREATE_TASK_POSTFIX
 RESULT_URL = BASE_REQUEST_URL.rstrip("/") + GET_RESULT_POSTFIX
@@ -28,7 +29,7 @@ def make_params(**task_params) -> CaptchaParams:
 def call_url_and_json(call):
     kwargs = call["kwargs"]
     url = kwargs.get("url", call["args"][0] if call["args"] else None)
-    return url, kwargs.get("json")
+    return url, request_json(kwargs)
 
 
 class TestAsyncProcessingStateMachine:
@@ -38,9 +39,8 @@ class TestAsyncProcessingStateMachine:
 
         result = await AIOCaptchaInstrument(make_params(type="ImageToTextTask")).processing_captcha()
 
-        assert result["status"] == "ready"
-        assert result["taskId"] == 4242
-        assert result["solution"]["gRecaptchaResponse"] == "FAKE_SOLUTION_TOKEN"
+        assert result == {**RESULT_READY, "errorCode": None, "errorDescription": None, "taskId": 4242}
+        assert type(result["status"]) is str
         assert len(aio_http.post_calls) == 2
 
     async def test_polls_while_processing_then_returns_ready(self, aio_http):
@@ -71,6 +71,15 @@ class TestAsyncProcessingStateMachine:
         assert result["taskId"] == 4242
         assert len(aio_http.post_calls) == 2
 
+    async def test_result_error_with_null_fields_is_returned(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post({**RESULT_ERROR, "status": None, "solution": None})
+
+        result = await AIOCaptchaInstrument(make_params(type="ImageToTextTask")).processing_captcha()
+
+        assert result["errorCode"] == RESULT_ERROR["errorCode"]
+        assert result["taskId"] == 4242
+
 
 class TestAsyncRequestPayloadContract:
     async def test_create_task_endpoint_and_payload(self, aio_http):
@@ -126,6 +135,29 @@ class TestAsyncProcessingImageCaptcha:
         _, body = call_url_and_json(aio_http.post_calls[0])
         assert body["task"]["body"] == base64.b64encode(b"PNGDATA").decode("utf-8")
 
+    async def test_mapped_file_is_released_when_solve_fails(self, aio_http, tmp_path):
+        img = tmp_path / "cap.png"
+        img.write_bytes(b"PNGDATA")
+        pool = KeyPool(["A"])
+        pool.release(pool.acquire(), error_code="ERROR_KEY_DOES_NOT_EXIST")
+        params = make_params(type="ImageToTextTask")
+        params.set_key_pool(pool)
+        instrument = AIOCaptchaInstrument(params)
+
+        with pytest.raises(ValueError):
+            await instrument.processing_image_captcha(
+                save_format=SaveFormatsEnm.TEMP.value,
+                img_clearing=False,
+                captcha_link=None,
+                captcha_file=str(img),
+                captcha_base64=None,
+                img_path=str(tmp_path),
+            )
+
+        assert "body" not in params.create_task_payload.task
+        assert instrument._body_release is None
+        assert aio_http.post_calls == []
+
     async def test_base64_is_encoded_into_body(self, aio_http, tmp_path):
         aio_http.enqueue_post(CREATE_TASK_OK)
         aio_http.enqueue_post(RESULT_READY)
@@ -0,0 +1,146 @@
+"""Tests for ``core.aio_session`` — the per-event-loop aiohttp session pool shared
+by every async solver.
+
+``aio_http`` patches ``aiohttp.ClientSession`` so sessions are fakes; what is
+asserted here is ownership: how many sessions get created, which loop they
+belong to, and when they are closed.
+"""
+
+import asyncio
+import threading
+
+from python3_anticaptcha.core.aio_captcha_instrument import AIOCaptchaInstrument
+from python3_anticaptcha.core.aio_session import AIOSessionPool
+from python3_anticaptcha.core.base import CaptchaParams
+from tests.core.conftest import CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY
+
+
+def make_params(pool: AIOSessionPool) -> CaptchaParams:
+    params = CaptchaParams(api_key="KEY", sleep_time=0)
+    params.task_params.update(type="ImageToTextTask")
+    params.aio_session_pool = pool
+    return params
+
+
+class TestPerLoopSession:
+    async def test_same_session_within_a_loop(self, aio_http):
+        pool = AIOSessionPool()
+        assert pool.get_session() is pool.get_session()
+        assert len(aio_http._sessions) == 1
+
+    async def test_connector_settings_are_applied(self, mocker):
+        connector = mocker.patch("aiohttp.TCPConnector")
+        session = mocker.patch("aiohttp.ClientSession")
+        pool = AIOSessionPool(limit=7, limit_per_host=3, ttl_dns_cache=60)
+
+        pool.get_session()
+
+        connector.assert_called_once_with(limit=7, limit_per_host=3, ttl_dns_cache=60)
+        session.assert_called_once_with(connector=connector.return_value)
+
+    async def test_closed_session_is_replaced(self, aio_http):
+        pool = AIOSessionPool()
+        first = pool.get_session()
+        await pool.close()
+
+        assert first.closed is True
+        assert pool.get_session() is not first
+
+    def test_one_session_per_thread_loop(self, mocker):
+        mocker.patch("aiohttp.ClientSession", side_effect=lambda **kwargs: mocker.Mock(closed=False))
+        mocker.patch("aiohttp.TCPConnector")
+        pool = AIOSessionPool()
+        sessions = []
+
+        def worker():
+            async def grab():
+                return pool.get_session(), pool.get_session()
+
+            sessions.append(asyncio.run(grab()))
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (a1, a2), (b1, b2) = sessions
+        assert a1 is a2
+        assert b1 is b2
+        assert a1 is not b1
+
+    def test_sessions_of_closed_loops_are_dropped(self, mocker):
+        mocker.patch("aiohttp.ClientSession", side_effect=lambda **kwargs: mocker.Mock(closed=False))
+        mocker.patch("aiohttp.TCPConnector")
+        pool = AIOSessionPool()
+
+        async def grab():
+            return pool.get_session()
+
+        asyncio.run(grab())
+        assert len(pool._sessions) == 1
+        asyncio.run(grab())
+        assert len(pool._sessions) == 1
+
+    def test_closed_session_is_evicted(self, aio_http):
+        pool = AIOSessionPool()
+
+        async def solve():
+            pool.get_session()
+            await pool.close()
+
+        asyncio.run(solve())
+        assert pool._sessions == {}
+
+
+class TestContextOwnership:
+    async def test_aexit_keeps_session_open(self, aio_http):
+        params = make_params(AIOSessionPool())
+        async with params:
+            session = params.aio_session_pool.get_session()
+        assert session.closed is False
+
+    async def test_context_exit_keeps_session_of_bare_solves(self, aio_http):
+        # bare handler calls on the loop are never counted, another solver's exit must not close their session
+        pool = AIOSessionPool()
+        in_context, bare = make_params(pool), make_params(pool)
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+
+        session = pool.get_session()
+        async with in_context:
+            pass
+
+        assert (await bare.aio_captcha_handler())["status"] == "ready"
+        assert session.closed is False
+        assert len(aio_http._sessions) == 1
+
+    async def test_aio_close(self, aio_http):
+        params = make_params(AIOSessionPool())
+        session = params.aio_session_pool.get_session()
+        await params.aio_close()
+        assert session.closed is True
+
+
+class TestSingleSessionPerSolve:
+    async def test_whole_solve_uses_one_session(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_PROCESSING)
+        aio_http.enqueue_post(RESULT_READY)
+
+        result = await AIOCaptchaInstrument(make_params(AIOSessionPool())).processing_captcha()
+
+        assert result["status"] == "ready"
+        assert len(aio_http._sessions) == 1
+        assert len(aio_http.post_calls) == 3
+
+    async def test_sequential_solves_in_context_share_session(self, aio_http):
+        for _ in range(2):
+            aio_http.enqueue_post(CREATE_TASK_OK)
+            aio_http.enqueue_post(RESULT_READY)
+
+        async with make_params(AIOSessionPool()) as params:
+            await params.aio_captcha_handler()
+            await params.aio_captcha_handler()
+
+        assert len(aio_http._sessions) == 1
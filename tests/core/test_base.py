@@ -7,8 +7,12 @@ here, so spying on the instrument is legitimate (unlike in the instrument tests,
 where the instrument itself is the unit under test).
 """
 
+from python3_anticaptcha.control import Control
 from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.const import BASE_REQUEST_URL
 from python3_anticaptcha.core.serializer import CreateTaskBaseSer, GetTaskResultRequestSer
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY
 
 
 class TestConstruction:
@@ -51,16 +55,40 @@ class TestSetCallbackUrl:
         assert inst.create_task_payload.callbackUrl == "b"
 
 
+class TestSetRequestUrl:
+    def test_default_is_service_url(self):
+        assert CaptchaParams(api_key="k").request_url == BASE_REQUEST_URL
+
+    def test_sync_requests_go_to_custom_url(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        solver = ImageToText(api_key="k", sleep_time=0)
+        solver.set_request_url("http://127.0.0.1:8080/")
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        urls = [call.args[0] if call.args else call.kwargs["url"] for call in sio_http.post.call_args_list]
+        assert urls == ["http://127.0.0.1:8080/createTask", "http://127.0.0.1:8080/getTaskResult"]
+
+    async def test_control_requests_go_to_custom_url(self, aio_http):
+        aio_http.enqueue_post({"errorId": 0, "balance": 1.0})
+        control = Control(api_key="k")
+        control.set_request_url("http://127.0.0.1:8080/")
+
+        await control.aio_get_balance()
+
+        assert aio_http.post_calls[0]["args"][0] == "http://127.0.0.1:8080/getBalance"
+
+
 class TestSyncHandlerDelegation:
-    def test_merges_additional_params_into_task_params(self, mocker):
+    def test_passes_additional_params_per_call(self, mocker):
         spy = mocker.patch("python3_anticaptcha.core.base.SIOCaptchaInstrument")
         spy.return_value.processing_captcha.return_value = {"errorId": 0}
         inst = CaptchaParams(api_key="k")
 
         inst.captcha_handler(proxyLogin="user", proxyPassword="pw")
 
-        assert inst.task_params["proxyLogin"] == "user"
-        assert inst.task_params["proxyPassword"] == "pw"
+        spy.assert_called_once_with(captcha_params=inst, task_params={"proxyLogin": "user", "proxyPassword": "pw"})
+        assert "proxyLogin" not in inst.task_params
 
     def test_constructs_sio_instrument_with_self(self, mocker):
         spy = mocker.patch("python3_anticaptcha.core.base.SIOCaptchaInstrument")
@@ -69,7 +97,7 @@ class TestSyncHandlerDelegation:
 
         result = inst.captcha_handler()
 
-        spy.assert_called_once_with(captcha_params=inst)
+        spy.assert_called_once_with(captcha_params=inst, task_params={})
         assert result == {"ok": True}
 
     def test_returns_processing_captcha_result(self, mocker):
@@ -81,15 +109,15 @@ class TestSyncHandlerDelegation:
 
 
 class TestAsyncHandlerDelegation:
-    async def test_merges_additional_params_and_delegates(self, mocker):
+    async def test_passes_additional_params_per_call_and_delegates(self, mocker):
         spy = mocker.patch("python3_anticaptcha.core.base.AIOCaptchaInstrument")
         spy.return_value.processing_captcha = mocker.AsyncMock(return_value={"errorId": 0})
         inst = CaptchaParams(api_key="k")
 
         await inst.aio_captcha_handler(websiteURL="https://x")
 
-        assert inst.task_params["websiteURL"] == "https://x"
-        spy.assert_called_once_with(captcha_params=inst)
+        spy.assert_called_once_with(captcha_params=inst, task_params={"websiteURL": "https://x"})
+        assert "websiteURL" not in inst.task_params
 
     async def test_returns_processing_captcha_result(self, mocker):
         spy = mocker.patch("python3_anticaptcha.core.base.AIOCaptchaInstrument")
@@ -0,0 +1,131 @@
+"""Tests for ``core.batch`` and the ``solve_many`` family on ``CaptchaParams``.
+
+Scheduling behaviour (ordering, bounded concurrency, error handling) is checked
+against a fake ``aio_captcha_handler`` with controllable latency; one end-to-end
+test runs the real instrument through the ``aio_http`` boundary.
+"""
+
+import asyncio
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
+
+
+class FakeHandler:
+    """Replaces ``aio_captcha_handler``: echoes kwargs and tracks concurrency."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.params_seen = []
+
+    async def __call__(self, solver, delay: float = 0, fail: bool = False, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.params_seen.append(solver)
+        try:
+            await asyncio.sleep(delay)
+            if fail:
+                raise ValueError("boom")
+            return {"errorId": 0, "delay": delay, **kwargs}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_handler(monkeypatch):
+    handler = FakeHandler()
+
+    async def aio_captcha_handler(self, **kwargs):
+        return await handler(self, **kwargs)
+
+    monkeypatch.setattr(CaptchaParams, "aio_captcha_handler", aio_captcha_handler)
+    return handler
+
+
+class TestAioSolveMany:
+    async def test_results_are_in_input_order(self, fake_handler):
+        inputs = [{"n": 0, "delay": 0.03}, {"n": 1, "delay": 0.0}, {"n": 2, "delay": 0.01}]
+        results = await CaptchaParams(api_key="k").aio_solve_many(inputs, concurrency=3)
+        assert [r["n"] for r in results] == [0, 1, 2]
+
+    async def test_concurrency_is_bounded(self, fake_handler):
+        inputs = ({"delay": 0.01} for _ in range(20))
+        await CaptchaParams(api_key="k").aio_solve_many(inputs, concurrency=4)
+        assert fake_handler.max_in_flight == 4
+
+    async def test_every_task_runs_on_the_same_solver(self, fake_handler):
+        solver = CaptchaParams(api_key="k")
+        task_params = dict(solver.task_params)
+        await solver.aio_solve_many([{"websiteURL": "https://a"}, {"websiteURL": "https://b"}], concurrency=2)
+
+        assert fake_handler.params_seen == [solver, solver]
+        assert solver.task_params == task_params
+
+    async def test_none_input_means_no_overrides(self, fake_handler):
+        assert await CaptchaParams(api_key="k").aio_solve_many([None]) == [{"errorId": 0, "delay": 0}]
+
+    async def test_exception_is_raised_by_default(self, fake_handler):
+        with pytest.raises(ValueError, match="boom"):
+            await CaptchaParams(api_key="k").aio_solve_many([{}, {"fail": True}], concurrency=1)
+
+    async def test_return_exceptions(self, fake_handler):
+        results = await CaptchaParams(api_key="k").aio_solve_many([{}, {"fail": True}], return_exceptions=True)
+        assert results[0]["errorId"] == 0
+        assert isinstance(results[1], ValueError)
+
+    async def test_invalid_concurrency(self, fake_handler):
+        with pytest.raises(ValueError):
+            await CaptchaParams(api_key="k").aio_solve_many([{}], concurrency=0)
+
+
+class TestAioSolveAsCompleted:
+    async def test_yields_in_completion_order(self, fake_handler):
+        inputs = [{"delay": 0.05}, {"delay": 0.0}]
+        order = [index async for index, _ in CaptchaParams(api_key="k").aio_solve_as_completed(inputs, concurrency=2)]
+        assert order == [1, 0]
+
+    async def test_early_exit_cancels_workers(self, fake_handler):
+        iterator = CaptchaParams(api_key="k").aio_solve_as_completed([{"delay": 0}, {"delay": 10}], concurrency=2)
+        async for _ in iterator:
+            break
+        await iterator.aclose()
+        assert fake_handler.in_flight == 0
+
+
+class TestSyncSolveMany:
+    def test_runs_batch_in_own_loop(self, fake_handler):
+        assert CaptchaParams(api_key="k").solve_many([{"n": 1}, {"n": 2}]) == [
+            {"errorId": 0, "delay": 0, "n": 1},
+            {"errorId": 0, "delay": 0, "n": 2},
+        ]
+
+    def test_session_of_the_loop_is_closed(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+
+        solver.solve_many([{"captcha_base64": b"RAW"}])
+
+        assert [session.closed for session in aio_http._sessions] == [True]
+        assert solver.aio_session_pool._sessions == {}
+
+
+class TestEndToEnd:
+    async def test_image_batch_through_transport(self, aio_http):
+        for _ in range(2):
+            aio_http.enqueue_post(CREATE_TASK_OK)
+            aio_http.enqueue_post(RESULT_READY)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+
+        results = await solver.aio_solve_many([{"captcha_base64": b"A"}, {"captcha_base64": b"B"}], concurrency=1)
+
+        assert [r["status"] for r in results] == ["ready", "ready"]
+        bodies = [request_json(call["kwargs"])["task"]["body"] for call in aio_http.post_calls[::2]]
+        assert bodies == ["QQ==", "Qg=="]
+        # template is untouched by the batch
+        assert "body" not in solver.create_task_payload.task
+        assert len(aio_http._sessions) == 1
@@ -0,0 +1,119 @@
+"""Tests for ``core.cache`` — the content-hash result cache in front of image
+captcha solving.
+
+Cache behaviour (keys, LRU, TTL, what gets stored) is tested directly; the
+instrument integration runs through the HTTP boundary fixtures and counts
+paid ``createTask`` calls.
+"""
+
+import base64
+
+from python3_anticaptcha.core.cache import ResultCache
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY
+
+READY = {"errorId": 0, "status": "ready", "solution": {"text": "abc"}, "taskId": 1}
+
+
+class TestKey:
+    def test_same_image_in_any_form_has_same_key(self):
+        raw = {"type": "ImageToTextTask", "body": b"IMG"}
+        view = {"type": "ImageToTextTask", "body": memoryview(b"IMG")}
+        encoded = {"type": "ImageToTextTask", "body": base64.b64encode(b"IMG").decode("utf-8")}
+        assert ResultCache.key(raw) == ResultCache.key(view) == ResultCache.key(encoded)
+
+    def test_options_are_part_of_key(self):
+        base = {"type": "ImageToTextTask", "body": b"IMG"}
+        assert ResultCache.key(base) != ResultCache.key({**base, "numeric": 1})
+        assert ResultCache.key({**base, "numeric": 1, "math": True}) == ResultCache.key(
+            {"math": True, **base, "numeric": 1}
+        )
+
+    def test_other_image_has_other_key(self):
+        assert ResultCache.key({"body": b"A"}) != ResultCache.key({"body": b"B"})
+
+    def test_task_without_body_has_no_key(self):
+        assert ResultCache.key({"type": "ImageToTextTask"}) is None
+
+
+class TestStorage:
+    def test_only_ready_results_are_stored(self):
+        cache = ResultCache()
+        cache.put("processing", {"errorId": 0, "status": "processing"})
+        cache.put("error", {"errorId": 1, "errorCode": "ERROR_CAPTCHA_UNSOLVABLE"})
+        cache.put("ready", READY)
+        assert cache.get("processing") is None
+        assert cache.get("error") is None
+        assert cache.get("ready") == READY
+
+    def test_returned_result_is_a_copy(self):
+        cache = ResultCache()
+        cache.put("k", READY)
+        cache.get("k")["solution"]["text"] = "changed"
+        assert cache.get("k")["solution"] == {"text": "abc"}
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", READY)
+        cache.put("b", READY)
+        cache.get("a")
+        cache.put("c", READY)
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_expired_result_is_dropped(self, mocker):
+        clock = mocker.patch("python3_anticaptcha.core.cache.time.monotonic", return_value=100.0)
+        cache = ResultCache(ttl=10)
+        cache.put("k", READY)
+        clock.return_value = 109.0
+        assert cache.get("k") is not None
+        clock.return_value = 111.0
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_clear(self):
+        cache = ResultCache()
+        cache.put("k", READY)
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestInstrumentsUseCache:
+    def test_sync_repeat_image_is_not_resubmitted(self, sio_http, tmp_path):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+        img = tmp_path / "cap.png"
+        img.write_bytes(b"PNGDATA")
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_result_cache(ResultCache())
+
+        first = solver.captcha_handler(captcha_file=str(img))
+        second = solver.captcha_handler(captcha_base64=b"PNGDATA")
+
+        assert first == second
+        assert second["status"] == "ready"
+        assert sio_http.post.call_count == 3
+
+    def test_sync_other_options_are_solved_again(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY, CREATE_TASK_OK, RESULT_READY)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_result_cache(ResultCache())
+
+        solver.captcha_handler(captcha_base64=b"PNGDATA")
+        solver.captcha_handler(captcha_base64=b"PNGDATA", numeric=1)
+
+        assert sio_http.post.call_count == 4
+
+    async def test_async_error_is_not_cached(self, aio_http):
+        for payload in (CREATE_TASK_OK, RESULT_ERROR, CREATE_TASK_OK, RESULT_READY):
+            aio_http.enqueue_post(payload)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_result_cache(ResultCache())
+
+        first = await solver.aio_captcha_handler(captcha_base64=b"PNGDATA")
+        second = await solver.aio_captcha_handler(captcha_base64=b"PNGDATA")
+        third = await solver.aio_captcha_handler(captcha_base64=b"PNGDATA")
+
+        assert first["errorId"] == RESULT_ERROR["errorId"]
+        assert second["status"] == third["status"] == "ready"
+        assert len(aio_http.post_calls) == 4
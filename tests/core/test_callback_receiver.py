@@ -0,0 +1,174 @@
+"""Tests for ``core.callback_receiver`` — the embedded ``callbackUrl`` receiver.
+
+The server tests bind a real aiohttp site on ``127.0.0.1`` with an ephemeral
+port and post to it with a real client, so no traffic leaves the machine. The
+instrument tests drive ``handle`` directly with a stub request because
+``aio_http`` replaces ``aiohttp.ClientSession`` with a fake.
+"""
+
+import asyncio
+import threading
+
+import aiohttp
+import msgspec
+
+from python3_anticaptcha.core.aio_captcha_instrument import AIOCaptchaInstrument
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.callback_receiver import CallbackReceiver
+from python3_anticaptcha.core.metrics import MetricsRegistry
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
+
+
+class StubRequest:
+    def __init__(self, payload: dict, query: dict = None, secret: str = "SECRET"):
+        self._payload = payload
+        self.query = query or {}
+        self.match_info = {"secret": secret}
+
+    async def read(self) -> bytes:
+        return msgspec.json.encode(self._payload)
+
+
+def make_params(receiver: CallbackReceiver) -> CaptchaParams:
+    params = CaptchaParams(api_key="KEY", sleep_time=0)
+    params.task_params.update(type="TurnstileTaskProxyless")
+    params.set_callback_receiver(receiver)
+    return params
+
+
+class TestReceiverServer:
+    async def test_post_resolves_registered_future(self):
+        async with CallbackReceiver(host="127.0.0.1", port=0) as receiver:
+            future = receiver.register(4242)
+            async with aiohttp.ClientSession() as session:
+                async with session.post(receiver.callback_url, json={**RESULT_READY, "taskId": 4242}) as resp:
+                    assert resp.status == 200
+
+            result = await asyncio.wait_for(future, timeout=1)
+
+        assert result["status"] == "ready"
+        assert result["taskId"] == 4242
+
+    async def test_invalid_body_is_rejected(self):
+        async with CallbackReceiver(host="127.0.0.1", port=0) as receiver:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(receiver.callback_url, data=b"not json") as resp:
+                    assert resp.status == 400
+
+    async def test_request_without_secret_is_rejected(self):
+        async with CallbackReceiver(port=0) as receiver:
+            future = receiver.register(4242)
+            forged = {**RESULT_READY, "taskId": 4242}
+            async with aiohttp.ClientSession() as session:
+                async with session.post(f"http://127.0.0.1:{receiver.port}{receiver.path}", json=forged) as resp:
+                    assert resp.status in (404, 405)
+                async with session.post(f"{receiver.callback_url[:-1]}x", json=forged) as resp:
+                    assert resp.status == 403
+
+            assert not future.done()
+
+    async def test_future_of_other_loop_is_resolved_in_its_loop(self):
+        receiver = CallbackReceiver(secret="SECRET")
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+
+        async def wait():
+            return await receiver.register(5)
+
+        try:
+            waiter = asyncio.run_coroutine_threadsafe(wait(), other_loop)
+            while 5 not in receiver._waiters:
+                await asyncio.sleep(0.001)
+            await receiver.handle(StubRequest({**RESULT_READY, "taskId": 5}))
+            assert (await asyncio.wrap_future(waiter))["taskId"] == 5
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+
+    async def test_stop_cancels_pending_waiters(self):
+        receiver = CallbackReceiver(host="127.0.0.1", port=0)
+        await receiver.start()
+        future = receiver.register(1)
+        await receiver.stop()
+        assert future.cancelled()
+
+
+class TestRegistration:
+    def test_callback_url_defaults_and_public_override(self):
+        receiver = CallbackReceiver(port=81, path="/cb", secret="S")
+        assert receiver.callback_url == "http://127.0.0.1:81/cb/S"
+        assert CallbackReceiver(public_url="https://x/cb/", secret="S").callback_url == "https://x/cb/S"
+
+    def test_secret_is_random(self):
+        first, second = CallbackReceiver(), CallbackReceiver()
+        assert len(first.secret) >= 16
+        assert first.secret != second.secret
+
+    async def test_callback_before_registration_is_kept(self):
+        receiver = CallbackReceiver(secret="SECRET")
+        await receiver.handle(StubRequest({**RESULT_READY, "taskId": 7}))
+
+        future = receiver.register(7)
+        assert future.done()
+        assert future.result()["taskId"] == 7
+
+    async def test_task_id_from_query_string(self):
+        receiver = CallbackReceiver(secret="SECRET")
+        future = receiver.register(9)
+        await receiver.handle(StubRequest(dict(RESULT_READY), query={"taskId": "9"}))
+        assert future.result()["taskId"] == 9
+
+    async def test_unclaimed_results_are_bounded(self):
+        receiver = CallbackReceiver(max_unclaimed=2, secret="SECRET")
+        for task_id in (1, 2, 3):
+            await receiver.handle(StubRequest({"taskId": task_id}))
+        assert list(receiver._unclaimed) == [2, 3]
+
+    def test_set_callback_receiver_sets_callback_url(self):
+        receiver = CallbackReceiver(public_url="https://x/cb", secret="SECRET")
+        params = make_params(receiver)
+        assert params.callback_receiver is receiver
+        assert params.create_task_payload.callbackUrl == "https://x/cb/SECRET"
+
+
+class TestInstrumentUsesCallback:
+    async def test_result_from_callback_skips_polling(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        receiver = CallbackReceiver(public_url="https://x/cb", secret="SECRET")
+        await receiver.handle(StubRequest({**RESULT_READY, "taskId": CREATE_TASK_OK["taskId"]}))
+
+        result = await AIOCaptchaInstrument(make_params(receiver)).processing_captcha()
+
+        assert result["status"] == "ready"
+        assert result["taskId"] == 4242
+        # only createTask went over the wire
+        assert len(aio_http.post_calls) == 1
+        assert request_json(aio_http.post_calls[0]["kwargs"])["callbackUrl"] == "https://x/cb/SECRET"
+
+    async def test_callback_result_is_reported_to_hooks(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        receiver = CallbackReceiver(public_url="https://x/cb", secret="SECRET")
+        await receiver.handle(StubRequest({**RESULT_READY, "taskId": CREATE_TASK_OK["taskId"]}))
+        params = make_params(receiver)
+        registry = MetricsRegistry()
+        params.set_metrics(registry)
+        events = []
+        params.add_hook(events.append)
+
+        await params.aio_captcha_handler()
+
+        assert [(event.event, event.poll_count) for event in events[2:]] == [("polled", 1), ("solved", 1)]
+        assert registry.polls.value(captcha_type="TurnstileTaskProxyless") == 1
+
+    async def test_overdue_callback_falls_back_to_polling(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        receiver = CallbackReceiver(public_url="https://x/cb", secret="SECRET", overdue_after=0.01)
+
+        result = await AIOCaptchaInstrument(make_params(receiver)).processing_captcha()
+
+        assert result["status"] == "ready"
+        assert len(aio_http.post_calls) == 2
+        assert receiver._waiters == {}
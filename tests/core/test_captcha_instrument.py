@@ -6,6 +6,7 @@ These run against the real filesystem using ``tmp_path`` so the file lifecycle
 """
 
 import base64
+import io
 
 import pytest
 
@@ -35,6 +36,62 @@ class TestLocalFileCaptcha:
             FileInstrument._local_file_captcha(captcha_file="/no/such/file.png")
 
 
+class TestMapFileCaptcha:
+    def test_path_is_memory_mapped(self, tmp_path):
+        f = tmp_path / "img.png"
+        f.write_bytes(b"PNGDATA")
+
+        body, release = FileInstrument._map_file_captcha(captcha_file=str(f))
+
+        assert isinstance(body, memoryview)
+        assert body == b"PNGDATA"
+        release()
+        with pytest.raises(ValueError):
+            body.tobytes()
+
+    def test_pathlike_and_file_object(self, tmp_path):
+        f = tmp_path / "img.png"
+        f.write_bytes(b"PNGDATA")
+
+        body, release = FileInstrument._map_file_captcha(captcha_file=f)
+        assert body == b"PNGDATA"
+        release()
+
+        with open(f, "rb") as file:
+            body, release = FileInstrument._map_file_captcha(captcha_file=file)
+            assert body == b"PNGDATA"
+            release()
+            # caller-owned file object is left open
+            assert not file.closed
+
+    def test_partially_read_file_object_is_read_from_position(self, tmp_path):
+        f = tmp_path / "img.png"
+        f.write_bytes(b"HEADERPNG")
+        with open(f, "rb") as file:
+            file.read(6)
+            body, _ = FileInstrument._map_file_captcha(captcha_file=file)
+        assert body == b"PNG"
+
+    def test_empty_file_falls_back_to_read(self, tmp_path):
+        f = tmp_path / "img.png"
+        f.write_bytes(b"")
+        body, _ = FileInstrument._map_file_captcha(captcha_file=str(f))
+        assert body == b""
+
+    def test_bytes_io_buffer_is_shared(self):
+        buffer = io.BytesIO(b"PNGDATA")
+        body, release = FileInstrument._map_file_captcha(captcha_file=buffer)
+        assert isinstance(body, memoryview)
+        assert body == b"PNGDATA"
+        release()
+        # released view no longer locks the buffer
+        buffer.write(b"more")
+
+    def test_missing_file_raises(self):
+        with pytest.raises(FileNotFoundError):
+            FileInstrument._map_file_captcha(captcha_file="/no/such/file.png")
+
+
 class TestFileConstSaver:
     def test_creates_dir_and_file_and_returns_path(self, tmp_path):
         target_dir = tmp_path / "out"
@@ -0,0 +1,134 @@
+"""Tests for ``core.engine`` — the background event loop behind sync handlers.
+
+Every test starts its own ``AIOEngine`` and stops it afterwards, so the
+process-wide ``ENGINE`` is never touched. Solves run through the ``aio_http``
+boundary; ``requests`` is patched to fail, proving the sync transport is unused.
+"""
+
+import asyncio
+import threading
+from concurrent import futures
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.engine import ENGINE, AIOEngine
+from python3_anticaptcha.core.hooks import LifecycleHook
+from python3_anticaptcha.image_to_text import ImageToText
+from python3_anticaptcha.turnstile import Turnstile
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
+
+ANY_METHOD_OK = {**RESULT_READY, **CREATE_TASK_OK}
+
+
+@pytest.fixture
+def engine():
+    engine = AIOEngine(name="test-engine")
+    yield engine
+    engine.stop(timeout=5)
+
+
+@pytest.fixture
+def no_sync_transport(mocker):
+    return mocker.patch("requests.Session.post", side_effect=AssertionError("sync transport used"))
+
+
+class ThreadRecorder(LifecycleHook):
+    def __init__(self):
+        self.threads = set()
+
+    def on_solved(self, event) -> None:
+        self.threads.add(threading.current_thread().name)
+
+
+def make_solver(engine: AIOEngine) -> Turnstile:
+    solver = Turnstile(
+        api_key="a" * 32,
+        captcha_type="TurnstileTaskProxyless",
+        websiteURL="https://example.com/",
+        websiteKey="1x00000000000000000000AA",
+    )
+    solver.set_engine(engine)
+    return solver
+
+
+class TestSyncFacade:
+    def test_sync_handler_runs_on_engine_loop(self, engine, aio_http, no_sync_transport):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = make_solver(engine)
+        recorder = ThreadRecorder()
+        solver.add_hook(recorder)
+
+        result = solver.captcha_handler(action="login")
+
+        assert result["status"] == "ready"
+        assert recorder.threads == {"test-engine"}
+        assert request_json(aio_http.post_calls[0]["kwargs"])["task"]["action"] == "login"
+
+    def test_image_handler_passes_image_args(self, engine, aio_http, no_sync_transport):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = ImageToText(api_key="a" * 32)
+        solver.set_engine(engine)
+
+        assert solver.captcha_handler(captcha_base64="QUJD")["status"] == "ready"
+        assert request_json(aio_http.post_calls[0]["kwargs"])["task"]["body"] == "QUJD"
+
+    def test_many_callers_share_one_engine_thread(self, engine, aio_http, no_sync_transport):
+        for _ in range(100):
+            aio_http.enqueue_post(ANY_METHOD_OK)
+        solver = make_solver(engine)
+        recorder = ThreadRecorder()
+        solver.add_hook(recorder)
+
+        results = solver.solve_many_sync([{}] * 50, max_workers=50)
+
+        assert [result["status"] for result in results] == ["ready"] * 50
+        assert recorder.threads == {"test-engine"}
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith("anticaptcha-solve")]
+
+    def test_default_engine_is_process_wide(self):
+        solver = CaptchaParams(api_key="k")
+        solver.set_engine()
+        assert solver.engine is ENGINE
+        assert not ENGINE.running
+
+
+class TestAIOEngine:
+    def test_thread_is_started_lazily(self, engine):
+        assert not engine.running
+        assert engine.run(asyncio.sleep(0, result=5)) == 5
+        assert engine.running
+
+    def test_caller_timeout_cancels_coroutine(self, engine):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(futures.TimeoutError):
+            engine.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_call_from_engine_loop_is_rejected(self, engine):
+        async def nested():
+            return engine.run(asyncio.sleep(0))
+
+        with pytest.raises(ValueError):
+            engine.run(nested())
+
+    def test_stop_cancels_pending_and_restarts(self, engine):
+        future = engine.submit(asyncio.sleep(10))
+        first_loop = engine.loop
+
+        engine.stop(timeout=5)
+
+        assert future.cancelled()
+        assert not engine.running
+        assert engine.run(asyncio.sleep(0, result=1)) == 1
+        assert engine.loop is not first_loop
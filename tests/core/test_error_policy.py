@@ -0,0 +1,184 @@
+"""Tests for ``core.error_policy`` — error-code-aware `createTask` backoff.
+
+Policy tests drive ``ErrorPolicy`` directly; solve tests run through the HTTP
+boundary fixtures, which patch the sleeps, so the waits are checked by their arguments.
+"""
+
+import asyncio
+import random
+import time
+
+import pytest
+import requests
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.enum import ErrorActionEnm
+from python3_anticaptcha.core.error_policy import ERROR_POLICY, ErrorPolicy, ErrorRule
+from python3_anticaptcha.core.metrics import MetricsRegistry
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json, resp
+
+NO_SLOT = {"errorId": 2, "errorCode": "ERROR_NO_SLOT_AVAILABLE"}
+ZERO_BALANCE = {"errorId": 10, "errorCode": "ERROR_ZERO_BALANCE"}
+TOO_MUCH = {"errorId": 21, "errorCode": "ERROR_TOO_MUCH_REQUESTS"}
+
+
+def fast_policy(**kwargs) -> ErrorPolicy:
+    return ErrorPolicy(**{"base_delay": 0.001, "max_delay": 0.001, **kwargs})
+
+
+class TestErrorPolicy:
+    def test_classification(self):
+        policy = ErrorPolicy(rules={"ERROR_ZERO_BALANCE": ErrorRule(ErrorActionEnm.PAUSE, pause=300)})
+
+        assert policy.classify("ERROR_NO_SLOT_AVAILABLE").action == ErrorActionEnm.RETRY
+        assert policy.classify("HTTP_503").action == ErrorActionEnm.RETRY
+        assert policy.classify("ERROR_IP_BLOCKED").action == ErrorActionEnm.PAUSE
+        assert policy.classify("ERROR_KEY_DOES_NOT_EXIST").action == ErrorActionEnm.FAIL
+        assert policy.classify("ERROR_SOMETHING_NEW").action == ErrorActionEnm.FAIL
+        assert policy.classify(None).action == ErrorActionEnm.FAIL
+        assert policy.classify("ERROR_ZERO_BALANCE") == ErrorRule(ErrorActionEnm.PAUSE, pause=300)
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = ErrorPolicy(base_delay=1, max_delay=8)
+        random.seed(1)
+        delays = [policy.backoff(level) for level in (1, 2, 3, 10) for _ in range(50)]
+
+        assert all(0 <= delay <= 8 for delay in delays)
+        assert len(set(delays)) == len(delays)
+        assert max(policy.backoff(1) for _ in range(50)) <= 1
+
+    def test_fail_and_exhausted_retries_return_none(self):
+        policy = ErrorPolicy(max_retries=2)
+
+        assert policy.on_error("ERROR_ZERO_BALANCE", attempt=0) is None
+        assert policy.on_error("ERROR_NO_SLOT_AVAILABLE", attempt=1) is not None
+        assert policy.on_error("ERROR_NO_SLOT_AVAILABLE", attempt=2) is None
+
+    def test_overload_level_is_shared_and_decays(self):
+        policy = ErrorPolicy()
+        for _ in range(3):
+            policy.on_error("ERROR_NO_SLOT_AVAILABLE", attempt=0)
+        assert policy._level == 3
+
+        policy.on_success()
+        assert policy._level == 2
+        policy.reset()
+        assert policy._level == 0
+
+    def test_pause_error_pauses_every_task(self):
+        policy = ErrorPolicy(rules={"ERROR_TOO_MUCH_REQUESTS": ErrorRule(ErrorActionEnm.PAUSE, pause=30)})
+
+        delay = policy.on_error("ERROR_TOO_MUCH_REQUESTS", attempt=0)
+
+        assert 29 < policy.pause_remaining() <= 30
+        assert delay >= policy.pause_remaining()
+
+
+class TestSolverSetup:
+    def test_policy_is_opt_in(self):
+        solver = CaptchaParams(api_key="k")
+        assert solver.error_policy is None
+
+        solver.set_error_policy()
+        assert solver.error_policy is ERROR_POLICY
+
+        policy = ErrorPolicy()
+        solver.set_error_policy(policy)
+        assert solver.error_policy is policy
+
+
+class TestSyncRetry:
+    def test_retries_transient_error_with_same_payload(self, sio_http):
+        sio_http.post_sequence(NO_SLOT, NO_SLOT, CREATE_TASK_OK, RESULT_READY)
+        solver = ImageToText(api_key="a" * 32)
+        solver.set_error_policy(fast_policy())
+
+        result = solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert result["status"] == "ready"
+        bodies = [call.kwargs["data"] for call in sio_http.post.call_args_list[:3]]
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert request_json(sio_http.post.call_args_list[0].kwargs)["task"]["body"]
+
+    def test_retried_task_is_sent_once_in_metrics(self, sio_http):
+        sio_http.post_sequence(NO_SLOT, CREATE_TASK_OK, RESULT_READY)
+        registry = MetricsRegistry()
+        solver = CaptchaParams(api_key="k")
+        solver.set_metrics(registry)
+        solver.set_error_policy(fast_policy())
+
+        solver.captcha_handler()
+
+        assert registry.submitted.value(captcha_type="") == 1
+        assert registry.in_flight.value(captcha_type="") == 0
+
+    def test_fatal_error_is_returned_at_once(self, sio_http):
+        sio_http.post_sequence(ZERO_BALANCE)
+        solver = CaptchaParams(api_key="k")
+        solver.set_error_policy(fast_policy())
+
+        assert solver.captcha_handler()["errorCode"] == "ERROR_ZERO_BALANCE"
+        assert sio_http.post.call_count == 1
+
+    def test_retries_are_bounded(self, sio_http):
+        sio_http.post_sequence(NO_SLOT, NO_SLOT, NO_SLOT)
+        solver = CaptchaParams(api_key="k")
+        solver.set_error_policy(fast_policy(max_retries=2))
+
+        assert solver.captcha_handler()["errorCode"] == "ERROR_NO_SLOT_AVAILABLE"
+        assert sio_http.post.call_count == 3
+
+    def test_server_error_is_retried(self, sio_http):
+        sio_http.post.side_effect = [resp({}, status_code=503), resp(CREATE_TASK_OK), resp(RESULT_READY)]
+        solver = CaptchaParams(api_key="k")
+        solver.set_error_policy(fast_policy())
+
+        assert solver.captcha_handler()["status"] == "ready"
+
+    def test_server_error_without_policy_raises(self, sio_http):
+        failed = resp({}, status_code=503)
+        failed.raise_for_status.side_effect = requests.HTTPError("503")
+        sio_http.post.side_effect = [failed]
+
+        with pytest.raises(requests.HTTPError):
+            CaptchaParams(api_key="k").captcha_handler()
+
+    def test_pause_is_bounded_by_deadline(self, sio_http):
+        sio_http.post_sequence(TOO_MUCH, CREATE_TASK_OK, RESULT_READY)
+        solver = CaptchaParams(api_key="k")
+        solver.set_timeout(total=5)
+        solver.set_error_policy(ErrorPolicy())
+
+        assert solver.captcha_handler()["status"] == "ready"
+        # `time.sleep` is patched by the fixture, the pause of `ERROR_TOO_MUCH_REQUESTS` is 10s
+        first_sleep = time.sleep.call_args_list[0].args[0]
+        assert 0 < first_sleep <= 5
+
+
+class TestAsyncRetry:
+    async def test_retries_transient_error(self, aio_http):
+        aio_http.enqueue_post(NO_SLOT)
+        aio_http.enqueue_post({}, status=502, reason="Bad Gateway")
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = CaptchaParams(api_key="k")
+        solver.set_error_policy(fast_policy())
+
+        result = await solver.aio_captcha_handler()
+
+        assert result["status"] == "ready"
+        assert len(aio_http.post_calls) == 4
+
+    async def test_shared_pause_delays_other_solvers(self, aio_http):
+        policy = fast_policy(rules={"ERROR_TOO_MUCH_REQUESTS": ErrorRule(ErrorActionEnm.PAUSE, pause=30)})
+        policy.on_error("ERROR_TOO_MUCH_REQUESTS", attempt=0)
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = CaptchaParams(api_key="k")
+        solver.set_error_policy(policy)
+
+        assert (await solver.aio_captcha_handler())["status"] == "ready"
+        # `asyncio.sleep` is patched by the fixture, the task waited for the pause before `createTask`
+        first_sleep = asyncio.sleep.call_args_list[0].args[0]
+        assert 29 < first_sleep <= 30
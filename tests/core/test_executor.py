@@ -0,0 +1,138 @@
+"""Tests for ``core.executor`` — the thread-pool batch executor of sync handlers.
+
+Scheduling (ordering, bounded concurrency, timeouts, cancellation) runs against a
+fake ``captcha_handler`` with controllable latency on real worker threads; one
+end-to-end test runs the real sync instrument through the ``sio_http`` boundary.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError, Future, TimeoutError
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.executor import SolveExecutor
+from python3_anticaptcha.core.sio_session import SIOSessionPool
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json, resp
+
+
+class FakeHandler:
+    """Replaces ``captcha_handler``: echoes kwargs and tracks concurrency."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = 0
+
+    def __call__(self, delay: float = 0, fail: bool = False, **kwargs):
+        with self.lock:
+            self.started += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(delay)
+            if fail:
+                raise ValueError("boom")
+            return {"errorId": 0, "delay": delay, **kwargs}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fake_handler(monkeypatch):
+    handler = FakeHandler()
+    monkeypatch.setattr(CaptchaParams, "captcha_handler", lambda self, **kwargs: handler(**kwargs))
+    return handler
+
+
+class TestSolveExecutor:
+    def test_submit_returns_future(self, fake_handler):
+        with CaptchaParams(api_key="k").executor(max_workers=2) as executor:
+            future = executor.submit(n=1)
+            assert isinstance(future, Future)
+            assert future.result() == {"errorId": 0, "delay": 0, "n": 1}
+
+    def test_as_completed_yields_in_completion_order(self, fake_handler):
+        with CaptchaParams(api_key="k").executor(max_workers=2) as executor:
+            order = [index for index, _ in executor.as_completed([{"delay": 0.1}, {"delay": 0.0}])]
+        assert order == [1, 0]
+
+    def test_concurrency_is_bounded_and_inputs_are_lazy(self, fake_handler):
+        pulled = []
+
+        def inputs():
+            for n in range(20):
+                pulled.append(n)
+                yield {"delay": 0.01}
+
+        with CaptchaParams(api_key="k").executor(max_workers=4) as executor:
+            for _ in executor.as_completed(inputs()):
+                assert len(pulled) - fake_handler.started <= 4
+        assert fake_handler.max_in_flight == 4
+
+    def test_exception_is_raised_by_default(self, fake_handler):
+        with pytest.raises(ValueError, match="boom"):
+            CaptchaParams(api_key="k").solve_many_sync([{}, {"fail": True}], max_workers=1)
+
+    def test_return_exceptions(self, fake_handler):
+        results = CaptchaParams(api_key="k").solve_many_sync([{}, {"fail": True}], return_exceptions=True)
+        assert results[0]["errorId"] == 0
+        assert isinstance(results[1], ValueError)
+
+    def test_timeout_skips_tasks_not_started(self, fake_handler):
+        with pytest.raises(TimeoutError):
+            CaptchaParams(api_key="k").solve_many_sync([{"delay": 0.2}] * 10, max_workers=2, timeout=0.05)
+        assert fake_handler.started == 2
+
+    def test_cancel_stops_submitting(self, fake_handler):
+        seen = []
+        with CaptchaParams(api_key="k").executor(max_workers=1) as executor:
+            for index, _ in executor.as_completed([{}] * 10):
+                seen.append(index)
+                executor.cancel()
+        assert seen == [0]
+        assert fake_handler.started == 1
+
+    def test_solve_many_after_cancel_raises(self, fake_handler):
+        executor = CaptchaParams(api_key="k").executor(max_workers=1)
+        timer = threading.Timer(0.05, executor.cancel)
+        timer.start()
+        with pytest.raises(CancelledError):
+            executor.solve_many({"delay": 0.02} for _ in range(100))
+        executor.shutdown()
+        assert fake_handler.started < 100
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            SolveExecutor(CaptchaParams(api_key="k"), max_workers=0)
+
+    def test_session_pool_is_sized_to_workers(self):
+        solver = CaptchaParams(api_key="k")
+        solver.sio_session_pool = SIOSessionPool(pool_maxsize=10)
+
+        solver.executor(max_workers=64).shutdown()
+        assert solver.sio_session_pool.pool_maxsize == 64
+
+        solver.executor(max_workers=8).shutdown()
+        assert solver.sio_session_pool.pool_maxsize == 64
+
+
+class TestEndToEnd:
+    def test_real_instrument_shares_one_solver(self, sio_http):
+        # concurrent calls interleave, one response is valid for both API methods
+        sio_http.post.side_effect = lambda *args, **kwargs: resp({**RESULT_READY, **CREATE_TASK_OK})
+        solver = ImageToText(api_key="a" * 32)
+
+        results = solver.solve_many_sync([{"captcha_base64": f"IMG{n}".encode()} for n in range(6)], max_workers=3)
+
+        assert [result["status"] for result in results] == ["ready"] * 6
+        bodies = sorted(
+            payload["task"]["body"]
+            for payload in (request_json(call.kwargs) for call in sio_http.post.call_args_list)
+            if "task" in payload
+        )
+        assert len(bodies) == 6 and len(set(bodies)) == 6
@@ -0,0 +1,152 @@
+"""Tests for ``core.hedging`` — hedged duplicate submission of slow tasks.
+
+Solve tests run through the HTTP boundary fixtures with a polling profile engine
+which already learned a zero solve time, so the duplicate is due right after the first poll.
+"""
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.callback_receiver import CallbackReceiver
+from python3_anticaptcha.core.hedging import HEDGE_POLICY, HedgePolicy
+from python3_anticaptcha.core.journal import TaskJournal
+from python3_anticaptcha.core.metrics import MetricsRegistry
+from python3_anticaptcha.core.poller import AIOPoller
+from python3_anticaptcha.core.polling import PollingProfiles
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY, request_json
+
+DUPLICATE_OK = {"errorId": 0, "taskId": 4343}
+ZERO_BALANCE = {"errorId": 10, "errorCode": "ERROR_ZERO_BALANCE"}
+TASK_TYPE = "RecaptchaV2TaskProxyless"
+
+
+def learned_profiles(solve_time: int = 0) -> PollingProfiles:
+    profiles = PollingProfiles(min_samples=1)
+    profiles.observe(TASK_TYPE, create_time=100, end_time=100 + solve_time)
+    return profiles
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def solver(registry):
+    solver = CaptchaParams(api_key="k")
+    solver.task_params = {"type": TASK_TYPE}
+    solver.polling_profiles = learned_profiles()
+    solver.set_hedge_policy(HedgePolicy(budget=1, min_delay=0))
+    solver.set_metrics(registry)
+    return solver
+
+
+class TestHedgePolicy:
+    def test_hedge_after_learned_quantile(self):
+        policy = HedgePolicy(quantile=0.5, min_delay=2)
+
+        assert policy.hedge_after(TASK_TYPE, PollingProfiles()) is None
+        assert policy.hedge_after(TASK_TYPE, learned_profiles(solve_time=30)) == 30
+        assert policy.hedge_after(TASK_TYPE, learned_profiles(solve_time=1)) == 2
+
+    def test_only_selected_types_are_hedged(self):
+        policy = HedgePolicy(captcha_types=["TurnstileTaskProxyless"])
+
+        assert policy.hedge_after(TASK_TYPE, learned_profiles(solve_time=30)) is None
+        assert policy.tasks == 0
+
+    def test_budget_limits_duplicates(self):
+        policy = HedgePolicy(budget=0.5)
+        assert not policy.acquire()
+
+        for _ in range(4):
+            policy.hedge_after(TASK_TYPE, PollingProfiles())
+        assert [policy.acquire() for _ in range(3)] == [True, True, False]
+        assert (policy.tasks, policy.hedges) == (4, 2)
+
+    def test_policy_is_opt_in(self):
+        solver = CaptchaParams(api_key="k")
+        assert solver.hedge_policy is None
+
+        solver.set_hedge_policy()
+        assert solver.hedge_policy is HEDGE_POLICY
+
+
+class TestSyncHedging:
+    def test_duplicate_wins(self, sio_http, solver, registry):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, DUPLICATE_OK, RESULT_PROCESSING, RESULT_READY)
+
+        result = solver.captcha_handler()
+
+        assert (result["status"], result["taskId"]) == ("ready", 4343)
+        calls = sio_http.post.call_args_list
+        assert calls[0].kwargs["data"] == calls[2].kwargs["data"]
+        assert [request_json(call.kwargs)["taskId"] for call in (calls[1], calls[3], calls[4])] == [4242, 4242, 4343]
+        assert registry.hedges.value(captcha_type=TASK_TYPE) == 1
+        assert registry.submitted.value(captcha_type=TASK_TYPE) == 1
+        assert registry.in_flight.value(captcha_type=TASK_TYPE) == 0
+
+    def test_primary_wins_and_duplicate_is_abandoned(self, sio_http, solver, tmp_path):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, DUPLICATE_OK, RESULT_READY)
+        journal = TaskJournal(tmp_path / "journal.sqlite3")
+        solver.set_journal(journal)
+
+        result = solver.captcha_handler()
+
+        assert result["taskId"] == 4242
+        assert sio_http.post.call_count == 4
+        assert journal.unfinished() == []
+        journal.close()
+
+    def test_failed_primary_falls_back_to_duplicate(self, sio_http, solver):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, DUPLICATE_OK, RESULT_ERROR, RESULT_READY)
+
+        result = solver.captcha_handler()
+
+        assert (result["status"], result["taskId"]) == ("ready", 4343)
+
+    def test_failed_duplicate_never_fails_the_call(self, sio_http, solver, registry):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, ZERO_BALANCE, RESULT_PROCESSING, RESULT_READY)
+
+        result = solver.captcha_handler()
+
+        assert (result["status"], result["taskId"]) == ("ready", 4242)
+        assert registry.hedges.value(captcha_type=TASK_TYPE) == 0
+
+    def test_exhausted_budget_is_not_hedged(self, sio_http, solver, registry):
+        solver.set_hedge_policy(HedgePolicy(budget=0, min_delay=0))
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+
+        assert solver.captcha_handler()["taskId"] == 4242
+        assert registry.hedges.value(captcha_type=TASK_TYPE) == 0
+
+
+class TestAsyncHedging:
+    async def test_duplicate_wins(self, aio_http, solver, registry):
+        for payload in (CREATE_TASK_OK, RESULT_PROCESSING, DUPLICATE_OK, RESULT_PROCESSING, RESULT_READY):
+            aio_http.enqueue_post(payload)
+
+        result = await solver.aio_captcha_handler()
+
+        assert (result["status"], result["taskId"]) == ("ready", 4343)
+        assert registry.hedges.value(captcha_type=TASK_TYPE) == 1
+
+    async def test_central_poller_tasks_are_not_hedged(self, aio_http, solver):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_PROCESSING)
+        aio_http.enqueue_post(RESULT_READY)
+        solver.set_poller(AIOPoller(max_rps=0, jitter=0))
+
+        assert (await solver.aio_captcha_handler())["taskId"] == 4242
+        assert solver.hedge_policy.tasks == 0
+        assert len(aio_http.post_calls) == 3
+
+    async def test_overdue_callback_fallback_is_not_hedged(self, aio_http, solver):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_PROCESSING)
+        aio_http.enqueue_post(RESULT_READY)
+        solver.set_callback_receiver(CallbackReceiver(public_url="https://x/cb", overdue_after=0.01))
+
+        assert (await solver.aio_captcha_handler())["taskId"] == 4242
+        assert solver.hedge_policy.tasks == 0
+        assert len(aio_http.post_calls) == 3
@@ -0,0 +1,137 @@
+"""Tests for ``core.hooks`` — lifecycle events of a solve call.
+
+Hooks are registered on real handlers and the solve runs through the HTTP
+boundary fixtures; the tests assert the exact event sequence and the fields
+each event carries, identically for the sync and async instruments.
+"""
+
+import pytest
+import requests
+
+from python3_anticaptcha.core.enum import LifecycleEventEnm
+from python3_anticaptcha.core.hooks import LifecycleEvent, LifecycleHook
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY
+
+SOLVE_SEQUENCE = [
+    LifecycleEventEnm.TASK_SENT,
+    LifecycleEventEnm.TASK_CREATED,
+    LifecycleEventEnm.POLLED,
+    LifecycleEventEnm.POLLED,
+    LifecycleEventEnm.SOLVED,
+]
+
+
+class Recorder(LifecycleHook):
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event: LifecycleEvent) -> None:
+        self.events.append(event)
+        super().__call__(event)
+
+    @property
+    def names(self) -> list:
+        return [event.event for event in self.events]
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+def solver_with(*hooks) -> ImageToText:
+    solver = ImageToText(api_key="KEY", sleep_time=0)
+    for hook in hooks:
+        solver.add_hook(hook)
+    return solver
+
+
+class TestSyncEvents:
+    def test_solved_sequence(self, sio_http, recorder):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+
+        solver_with(recorder).captcha_handler(captcha_base64=b"RAW")
+
+        assert recorder.names == SOLVE_SEQUENCE
+        sent, created, first_poll, second_poll, solved = recorder.events
+        assert sent.task_id is None
+        assert sent.sent_at is not None and sent.created_at is None
+        assert created.task_id == 4242
+        assert (first_poll.poll_count, first_poll.status) == (1, "processing")
+        assert (second_poll.poll_count, second_poll.status) == (2, "ready")
+        assert solved.captcha_type == "ImageToTextTask"
+        assert solved.poll_count == 2
+        assert solved.started_at <= solved.sent_at <= solved.created_at <= solved.timestamp
+        assert solved.elapsed >= 0
+
+    def test_rejected_task(self, sio_http, recorder):
+        sio_http.post_sequence({"errorId": 10, "errorCode": "ERROR_ZERO_BALANCE"})
+
+        solver_with(recorder).captcha_handler(captcha_base64=b"RAW")
+
+        assert recorder.names == [LifecycleEventEnm.TASK_SENT, LifecycleEventEnm.TASK_CREATED, LifecycleEventEnm.FAILED]
+        assert {event.error_code for event in recorder.events[1:]} == {"ERROR_ZERO_BALANCE"}
+
+    def test_exception_is_reported_as_failed(self, sio_http, recorder):
+        sio_http.post.side_effect = requests.ConnectionError()
+
+        with pytest.raises(requests.ConnectionError):
+            solver_with(recorder).captcha_handler(captcha_base64=b"RAW")
+
+        assert recorder.names == [LifecycleEventEnm.TASK_SENT, LifecycleEventEnm.FAILED]
+        assert recorder.events[-1].error_code == "ConnectionError"
+
+    def test_broken_hook_does_not_break_solve(self, sio_http, recorder):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+
+        def broken(event):
+            raise RuntimeError("hook bug")
+
+        result = solver_with(broken, recorder).captcha_handler(captcha_base64=b"RAW")
+
+        assert result["status"] == "ready"
+        assert recorder.names[-1] == LifecycleEventEnm.SOLVED
+
+
+class TestAsyncEvents:
+    async def test_solved_sequence(self, aio_http, recorder):
+        for payload in (CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY):
+            aio_http.enqueue_post(payload)
+
+        await solver_with(recorder).aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert recorder.names == SOLVE_SEQUENCE
+        assert recorder.events[-1].task_id == 4242
+        assert recorder.events[-1].poll_count == 2
+
+    async def test_task_error(self, aio_http, recorder):
+        for payload in (CREATE_TASK_OK, RESULT_ERROR):
+            aio_http.enqueue_post(payload)
+
+        await solver_with(recorder).aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert recorder.names[-2:] == [LifecycleEventEnm.POLLED, LifecycleEventEnm.FAILED]
+        assert recorder.events[-1].error_code == RESULT_ERROR["errorCode"]
+
+
+class TestLifecycleHook:
+    def test_dispatches_to_event_methods(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        solved = []
+
+        class OnSolved(LifecycleHook):
+            def on_solved(self, event):
+                solved.append(event.task_id)
+
+        solver_with(OnSolved()).captcha_handler(captcha_base64=b"RAW")
+
+        assert solved == [4242]
+
+    def test_no_hooks_no_events(self, sio_http, mocker):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        event = mocker.patch("python3_anticaptcha.core.captcha_instrument.LifecycleEvent")
+
+        ImageToText(api_key="KEY", sleep_time=0).captcha_handler(captcha_base64=b"RAW")
+
+        event.assert_not_called()
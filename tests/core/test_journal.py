@@ -0,0 +1,179 @@
+"""Tests for ``core.journal`` — the durable task journal and crash-resume polling.
+
+Journal tests run against a real SQLite file in ``tmp_path``; a second
+connection checks what is actually committed to disk. Instrument integration
+runs through the HTTP boundary fixtures, a crash is simulated by a transport
+error between task creation and the terminal result.
+"""
+
+import hashlib
+import sqlite3
+
+import pytest
+import requests
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.journal import JournalEntry, TaskJournal
+from python3_anticaptcha.core.rate_limit import RateLimiter
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_READY, request_json, resp
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = TaskJournal(tmp_path / "journal.sqlite3", commit_interval=60)
+    yield journal
+    journal.close()
+
+
+def committed(journal: TaskJournal) -> list:
+    with sqlite3.connect(journal.path) as connection:
+        return connection.execute("SELECT task_id, finished_at IS NULL FROM tasks ORDER BY task_id").fetchall()
+
+
+class TestTaskJournal:
+    def test_database_runs_in_wal_mode(self, journal):
+        with sqlite3.connect(journal.path) as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_writes_are_committed_in_batches(self, tmp_path):
+        journal = TaskJournal(tmp_path / "journal.sqlite3", commit_interval=60, batch_size=3)
+        journal.record(task_id=1, captcha_type="ImageToTextTask", client_key="k", payload_hash="h")
+        journal.record(task_id=2, captcha_type="ImageToTextTask", client_key="k", payload_hash="h")
+        assert committed(journal) == []
+
+        journal.finish(task_id=1, status="ready")
+        assert committed(journal) == [(1, 0), (2, 1)]
+        journal.close()
+
+    def test_pending_writes_are_committed_periodically(self, tmp_path):
+        journal = TaskJournal(tmp_path / "journal.sqlite3", commit_interval=0.01)
+        journal.record(task_id=1, captcha_type=None, client_key="k", payload_hash=None)
+        journal._closed.wait(0.2)
+        assert committed(journal) == [(1, 1)]
+        journal.close()
+
+    def test_unfinished_survive_reopen(self, tmp_path):
+        with TaskJournal(tmp_path / "journal.sqlite3") as journal:
+            journal.record(task_id=7, captcha_type="TurnstileTaskProxyless", client_key="key", payload_hash="h")
+            journal.record(task_id=8, captcha_type="TurnstileTaskProxyless", client_key="key", payload_hash="h")
+            journal.finish(task_id=8, status="ready")
+
+        with TaskJournal(tmp_path / "journal.sqlite3") as journal:
+            (entry,) = journal.unfinished()
+        assert isinstance(entry, JournalEntry)
+        assert (entry.task_id, entry.captcha_type, entry.client_key) == (7, "TurnstileTaskProxyless", "key")
+
+    def test_prune_deletes_finished_only(self, journal):
+        journal.record(task_id=1, captcha_type=None, client_key="k", payload_hash=None)
+        journal.record(task_id=2, captcha_type=None, client_key="k", payload_hash=None)
+        journal.finish(task_id=1, status="ready")
+
+        assert journal.prune(older_than=0) == 1
+        assert committed(journal) == [(2, 1)]
+
+
+class TestSolveJournaling:
+    def test_finished_task_is_not_resumed(self, sio_http, journal):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        solver = ImageToText(api_key="a" * 32)
+        solver.set_journal(journal)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert journal.unfinished() == []
+        assert committed(journal) == [(4242, 0)]
+
+    def test_records_key_type_and_payload_hash(self, sio_http, journal):
+        sio_http.post.side_effect = [resp(CREATE_TASK_OK), requests.ConnectionError("worker died")]
+        solver = ImageToText(api_key="a" * 32)
+        solver.set_journal(journal)
+
+        with pytest.raises(requests.ConnectionError):
+            solver.captcha_handler(captcha_base64=b"RAW")
+
+        (entry,) = journal.unfinished()
+        sent = sio_http.post.call_args_list[0].kwargs["data"]
+        assert entry.task_id == 4242
+        assert entry.client_key == "a" * 32
+        assert entry.captcha_type == "ImageToTextTask"
+        assert entry.payload_hash == hashlib.sha256(sent).hexdigest()
+
+    def test_failed_create_task_is_not_recorded(self, sio_http, journal):
+        sio_http.post_sequence(RESULT_ERROR)
+        solver = CaptchaParams(api_key="k")
+        solver.set_journal(journal)
+
+        solver.captcha_handler()
+        assert committed(journal) == []
+
+
+class TestResume:
+    def test_resume_polls_without_creating_task(self, sio_http, journal):
+        journal.record(task_id=4242, captcha_type="ImageToTextTask", client_key="old-key", payload_hash=None)
+        sio_http.post_sequence(RESULT_READY)
+        solver = CaptchaParams(api_key="k")
+        solver.set_journal(journal)
+
+        (result,) = solver.resume_tasks()
+
+        assert result["status"] == "ready"
+        assert result["taskId"] == 4242
+        call = sio_http.post.call_args
+        assert call.kwargs["url"].endswith("getTaskResult")
+        payload = request_json(call.kwargs)
+        assert (payload["clientKey"], payload["taskId"]) == ("old-key", 4242)
+        assert journal.unfinished() == []
+
+    def test_resume_uses_journaled_key(self, sio_http, journal, mocker):
+        journal.record(task_id=4242, captcha_type="ImageToTextTask", client_key="old-key", payload_hash=None)
+        sio_http.post_sequence(RESULT_READY)
+        limiter = RateLimiter()
+        acquire = mocker.spy(limiter, "acquire")
+        solver = CaptchaParams(api_key="new-key")
+        solver.set_journal(journal)
+        solver.set_rate_limiter(limiter)
+
+        solver.resume_tasks()
+
+        assert [call.kwargs["api_key"] for call in acquire.call_args_list] == ["old-key"]
+        assert solver.create_task_payload.clientKey == "new-key"
+
+    async def test_async_resume_uses_journaled_key(self, aio_http, journal, mocker):
+        journal.record(task_id=4242, captcha_type="ImageToTextTask", client_key="old-key", payload_hash=None)
+        aio_http.enqueue_post(RESULT_READY)
+        limiter = RateLimiter()
+        aio_acquire = mocker.spy(limiter, "aio_acquire")
+        solver = CaptchaParams(api_key="new-key")
+        solver.set_journal(journal)
+        solver.set_rate_limiter(limiter)
+
+        await solver.aio_resume_tasks()
+
+        assert [call.kwargs["api_key"] for call in aio_acquire.call_args_list] == ["old-key"]
+
+    def test_service_error_finishes_task(self, sio_http, journal):
+        journal.record(task_id=1, captcha_type=None, client_key="k", payload_hash=None)
+        sio_http.post_sequence(RESULT_ERROR)
+        solver = CaptchaParams(api_key="k")
+        solver.set_journal(journal)
+
+        assert solver.resume_tasks()[0]["errorCode"] == "ERROR_NO_SUCH_CAPTCHA_ID"
+        assert journal.unfinished() == []
+
+    async def test_async_resume_polls_concurrently(self, aio_http, journal):
+        journal.record(task_id=1, captcha_type=None, client_key="k", payload_hash=None)
+        journal.record(task_id=2, captcha_type=None, client_key="k", payload_hash=None)
+        aio_http.enqueue_post(RESULT_READY)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = CaptchaParams(api_key="k")
+        solver.set_journal(journal)
+
+        results = await solver.aio_resume_tasks()
+
+        assert [result["taskId"] for result in results] == [1, 2]
+        assert journal.unfinished() == []
+
+    def test_resume_without_journal(self):
+        with pytest.raises(ValueError):
+            CaptchaParams(api_key="k").resume_tasks()
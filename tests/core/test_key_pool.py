@@ -0,0 +1,147 @@
+"""Tests for ``core.key_pool`` — spreading tasks across several API keys.
+
+Selection strategies are tested on the pool directly; the instrument
+integration runs through the HTTP boundary fixtures and asserts which
+``clientKey`` goes over the wire for ``createTask`` and ``getTaskResult``.
+"""
+
+import pytest
+
+from python3_anticaptcha.core.key_pool import KeyPool
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY, request_json, resp
+
+
+class TestSelection:
+    def test_least_in_flight(self):
+        pool = KeyPool(["A", "B"])
+        assert [pool.acquire() for _ in range(4)] == ["A", "B", "A", "B"]
+        pool.release("A")
+        pool.release("A")
+        assert pool.acquire() == "A"
+
+    def test_least_in_flight_respects_weights(self):
+        pool = KeyPool({"A": 2, "B": 1})
+        keys = [pool.acquire() for _ in range(6)]
+        assert keys.count("A") == 4
+        assert keys.count("B") == 2
+
+    def test_weighted_round_robin(self):
+        pool = KeyPool({"A": 3, "B": 1}, strategy="weighted")
+        keys = [pool.acquire() for _ in range(8)]
+        assert keys.count("A") == 6
+        assert keys.count("B") == 2
+        # smooth - the light key is not starved until the end
+        assert "B" in keys[:4]
+
+    def test_balance_strategy_drains_richest_key(self):
+        pool = KeyPool(["A", "B"], strategy="balance")
+        pool._update_balance("A", {"errorId": 0, "balance": 10.0})
+        pool._update_balance("B", {"errorId": 0, "balance": 6.0})
+        assert pool.acquire() == "A"
+        # A: 10 / 2 running tasks < B: 6 / 1
+        pool.acquire()
+        assert pool.in_flight("A") == 1
+        assert pool.in_flight("B") == 1
+
+    def test_cost_is_subtracted_from_cached_balance(self):
+        pool = KeyPool(["A"], strategy="balance")
+        pool._update_balance("A", {"errorId": 0, "balance": 1.0})
+        pool.release(pool.acquire(), cost=0.25)
+        assert pool.balance("A") == pytest.approx(0.75)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            KeyPool([])
+        with pytest.raises(ValueError):
+            KeyPool(["A"], strategy="random")
+
+
+class TestRotation:
+    @pytest.mark.parametrize("error_code", ["ERROR_ZERO_BALANCE", "ERROR_KEY_DOES_NOT_EXIST"])
+    def test_fatal_errors_disable_key(self, error_code):
+        pool = KeyPool(["A", "B"])
+        pool.release(pool.acquire(), error_code=error_code)
+        assert pool.active_keys == ["B"]
+        assert [pool.acquire() for _ in range(3)] == ["B"] * 3
+
+    def test_ip_block_keeps_key(self):
+        pool = KeyPool(["A", "B"])
+        pool.release(pool.acquire(), error_code="ERROR_IP_BLOCKED")
+        assert pool.active_keys == ["A", "B"]
+
+    def test_task_errors_keep_key(self):
+        pool = KeyPool(["A"])
+        pool.release(pool.acquire(), error_code="ERROR_CAPTCHA_UNSOLVABLE")
+        assert pool.active_keys == ["A"]
+
+    def test_all_disabled_raises(self):
+        pool = KeyPool(["A"])
+        pool.disable("A")
+        with pytest.raises(ValueError):
+            pool.acquire()
+        pool.enable("A")
+        assert pool.acquire() == "A"
+
+    def test_zero_balance_disables_key(self, sio_http):
+        sio_http.post.side_effect = [
+            resp({"errorId": 0, "balance": 0}),
+            resp({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"}),
+            resp({"errorId": 0, "balance": 3.5}),
+        ]
+        pool = KeyPool(["A", "B", "C"], strategy="balance")
+        pool.refresh_balances()
+        assert pool.active_keys == ["C"]
+        assert pool.balance("C") == 3.5
+
+    def test_topped_up_key_comes_back(self, sio_http):
+        pool = KeyPool(["A", "B", "C"])
+        pool.release(pool.acquire(), error_code="ERROR_ZERO_BALANCE")
+        pool.disable("B", reason="ERROR_KEY_DOES_NOT_EXIST")
+        sio_http.post.side_effect = [resp({"errorId": 0, "balance": 5.0}), resp({"errorId": 0, "balance": 1.0})]
+
+        pool.refresh_balances(force=True)
+
+        assert [request_json(call.kwargs)["clientKey"] for call in sio_http.post.call_args_list] == ["A", "C"]
+        assert pool.active_keys == ["A", "C"]
+        assert pool.balance("A") == 5.0
+
+    async def test_balances_are_cached(self, aio_http):
+        aio_http.enqueue_post({"errorId": 0, "balance": 2.0})
+        pool = KeyPool(["A"], strategy="balance", balance_ttl=60)
+        await pool.aio_refresh_balances()
+        await pool.aio_refresh_balances()
+        assert len(aio_http.post_calls) == 1
+        assert pool.balance("A") == 2.0
+
+
+class TestInstrumentsUseKeyPool:
+    def test_sync_poll_uses_creating_key(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+        pool = KeyPool(["A", "B"])
+        pool.acquire()  # "A" is busy
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_key_pool(pool)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        keys = [request_json(call.kwargs)["clientKey"] for call in sio_http.post.call_args_list]
+        assert keys == ["B", "B", "B"]
+        assert pool.in_flight("B") == 0
+
+    async def test_async_fatal_error_takes_key_out(self, aio_http):
+        aio_http.enqueue_post({"errorId": 10, "errorCode": "ERROR_ZERO_BALANCE"})
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        pool = KeyPool(["A", "B"])
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_key_pool(pool)
+
+        first = await solver.aio_captcha_handler(captcha_base64=b"RAW")
+        second = await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert first["errorCode"] == "ERROR_ZERO_BALANCE"
+        assert second["status"] == "ready"
+        assert pool.active_keys == ["B"]
+        keys = [request_json(call["kwargs"])["clientKey"] for call in aio_http.post_calls]
+        assert keys == ["A", "B", "B"]
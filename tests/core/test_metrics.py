@@ -0,0 +1,106 @@
+"""Tests for ``core.metrics`` — the Prometheus-format metrics registry.
+
+Metric types and the text exposition format are tested directly; the solver
+metrics run through the HTTP boundary fixtures with a private registry, and
+the HTTP endpoint is scraped over a real loopback socket.
+"""
+
+import urllib.request
+
+import pytest
+
+from python3_anticaptcha.core.metrics import MetricsRegistry
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_ERROR, RESULT_PROCESSING, RESULT_READY
+
+IMAGE = {"captcha_type": "ImageToTextTask"}
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestMetricTypes:
+    def test_counter_render(self, registry):
+        counter = registry.counter("jobs_total", "Jobs", ["queue"])
+        counter.inc(queue="a")
+        counter.inc(2.5, queue='q"1')
+        assert counter.render() == (
+            '# HELP jobs_total Jobs\n# TYPE jobs_total counter\njobs_total{queue="a"} 1\njobs_total{queue="q\\"1"} 2.5'
+        )
+        with pytest.raises(ValueError):
+            counter.inc(-1, queue="a")
+        with pytest.raises(ValueError):
+            counter.inc(other="a")
+
+    def test_gauge(self, registry):
+        gauge = registry.gauge("running", "Running")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.value() == 1
+        gauge.set(7)
+        assert "running 7" in gauge.render()
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=[1, 5])
+        for value in (0.5, 3, 3, 10):
+            histogram.observe(value)
+        lines = histogram.render().splitlines()[2:]
+        assert lines == [
+            'latency_seconds_bucket{le="1"} 1',
+            'latency_seconds_bucket{le="5"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 16.5",
+            "latency_seconds_count 4",
+        ]
+
+    def test_duplicate_name(self, registry):
+        with pytest.raises(ValueError):
+            registry.counter("anticaptcha_polls_total", "Again")
+
+
+class TestSolverMetrics:
+    def test_sync_solve(self, sio_http, registry):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_metrics(registry)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert registry.submitted.value(**IMAGE) == 1
+        assert registry.polls.value(**IMAGE) == 2
+        assert registry.solves.value(result="solved", **IMAGE) == 1
+        assert registry.in_flight.value(**IMAGE) == 0
+        assert registry.cost.value(**IMAGE) == pytest.approx(RESULT_READY["cost"])
+        assert registry.solve_duration.count(**IMAGE) == 1
+
+    async def test_async_error(self, aio_http, registry):
+        for payload in (CREATE_TASK_OK, RESULT_ERROR):
+            aio_http.enqueue_post(payload)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_metrics(registry)
+
+        await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert registry.errors.value(error_code=RESULT_ERROR["errorCode"], **IMAGE) == 1
+        assert registry.solves.value(result="failed", **IMAGE) == 1
+        assert registry.in_flight.value(**IMAGE) == 0
+        assert registry.solve_duration.count(**IMAGE) == 0
+
+
+class TestEndpoint:
+    def test_scrape(self, registry):
+        registry.submitted.inc(**IMAGE)
+        server = registry.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'anticaptcha_tasks_submitted_total{captcha_type="ImageToTextTask"} 1' in body
+        assert "# TYPE anticaptcha_solve_duration_seconds histogram" in body
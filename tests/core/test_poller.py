@@ -0,0 +1,214 @@
+"""Tests for ``core.poller`` — the central ``getTaskResult`` scheduler.
+
+Responses are routed by ``taskId`` through a small fake session pool, so many
+tasks can be in flight at once without depending on FIFO ordering.
+"""
+
+import asyncio
+from itertools import repeat
+
+import aiohttp
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.poller import AIOPoller
+from tests.core.conftest import (
+    CREATE_TASK_OK,
+    RESULT_ERROR,
+    RESULT_PROCESSING,
+    RESULT_READY,
+    FakeAioResp,
+    _FakeAioCM,
+    request_json,
+)
+
+
+class RoutedSession:
+    def __init__(self, script: dict):
+        self.script = {task_id: list(responses) for task_id, responses in script.items()}
+        self.calls = []
+        self.kwargs = []
+
+    def post(self, url, **kwargs):
+        task_id = request_json(kwargs)["taskId"]
+        self.calls.append(task_id)
+        self.kwargs.append(kwargs)
+        return _FakeAioCM(FakeAioResp(dict(self.script[task_id].pop(0))))
+
+
+class RoutedPool:
+    def __init__(self, script: dict):
+        self.session = RoutedSession(script)
+
+    def get_session(self):
+        return self.session
+
+
+def payload(task_id: int) -> dict:
+    return {"clientKey": "KEY", "taskId": task_id}
+
+
+class TestPoll:
+    async def test_many_tasks_resolve_independently(self):
+        script = {1: [RESULT_PROCESSING, RESULT_READY], 2: [RESULT_READY], 3: [RESULT_ERROR]}
+        pool = RoutedPool(script)
+        poller = AIOPoller(max_rps=0, jitter=0)
+
+        results = await asyncio.gather(
+            *(poller.poll(payload(task_id), repeat(0), session_pool=pool) for task_id in script)
+        )
+
+        assert [r["taskId"] for r in results] == [1, 2, 3]
+        assert [r["errorId"] for r in results] == [0, 0, RESULT_ERROR["errorId"]]
+        assert pool.session.calls.count(1) == 2
+        assert poller.pending() == 0
+
+    async def test_max_polls_returns_last_processing(self):
+        pool = RoutedPool({1: [RESULT_PROCESSING] * 3})
+        result = await AIOPoller(max_rps=0, jitter=0, max_polls=3).poll(payload(1), repeat(0), session_pool=pool)
+        assert result["status"] == "processing"
+        assert len(pool.session.calls) == 3
+
+    async def test_rate_cap_spaces_requests(self, mocker):
+        sleep = mocker.patch("asyncio.sleep")
+        pool = RoutedPool({task_id: [RESULT_READY] for task_id in range(4)})
+        poller = AIOPoller(max_rps=10, jitter=0)
+
+        await asyncio.gather(*(poller.poll(payload(task_id), repeat(0), session_pool=pool) for task_id in range(4)))
+
+        # sleep is mocked, so the clock barely moves: slots are 0.1s, 0.2s, 0.3s away
+        waits = [c.args[0] for c in sleep.call_args_list]
+        assert waits == [pytest.approx(0.1 * n, abs=0.02) for n in (1, 2, 3)]
+
+    async def test_jitter_bounds_delay(self, mocker):
+        uniform = mocker.patch("random.uniform", return_value=0.5)
+        poller = AIOPoller(jitter=0.5)
+        loop = asyncio.get_running_loop()
+        state = poller._state(loop)
+        entry = mocker.Mock(delays=iter([2.0]))
+
+        before = loop.time()
+        poller._schedule(loop, state, entry)
+
+        uniform.assert_called_once_with(-0.5, 0.5)
+        assert state.heap[0][0] - before == pytest.approx(3.0, abs=0.05)
+
+    async def test_request_error_is_raised_to_caller(self):
+        class Broken:
+            def get_session(self):
+                raise ValueError("no session")
+
+        with pytest.raises(ValueError, match="no session"):
+            await AIOPoller(max_rps=0, jitter=0).poll(payload(1), repeat(0), session_pool=Broken())
+
+    async def test_request_uses_timeout_limiter_and_callback(self, mocker):
+        pool = RoutedPool({1: [RESULT_PROCESSING, RESULT_READY]})
+        limiter = mocker.Mock(aio_acquire=mocker.AsyncMock())
+        timeout = aiohttp.ClientTimeout(total=5)
+        responses = []
+
+        await AIOPoller(max_rps=0, jitter=0).poll(
+            payload(1),
+            repeat(0),
+            session_pool=pool,
+            timeout=lambda: timeout,
+            rate_limiter=limiter,
+            on_response=responses.append,
+        )
+
+        assert [kwargs["timeout"] for kwargs in pool.session.kwargs] == [timeout, timeout]
+        limiter.aio_acquire.assert_awaited_with(scope="getTaskResult", api_key="KEY")
+        assert limiter.aio_acquire.await_count == 2
+        assert [response.status for response in responses] == ["processing", "ready"]
+
+    async def test_default_timeout_is_set(self):
+        pool = RoutedPool({1: [RESULT_READY]})
+        await AIOPoller(max_rps=0, jitter=0).poll(payload(1), repeat(0), session_pool=pool)
+        assert pool.session.kwargs[0]["timeout"].sock_read is not None
+
+    async def test_polls_in_flight_are_referenced(self):
+        release = asyncio.Event()
+
+        class Slow(RoutedSession):
+            def post(self, url, **kwargs):
+                cm = super().post(url, **kwargs)
+
+                class Wait:
+                    async def __aenter__(self):
+                        await release.wait()
+                        return await cm.__aenter__()
+
+                    async def __aexit__(self, *exc):
+                        return False
+
+                return Wait()
+
+        pool = RoutedPool({})
+        pool.session = Slow({1: [RESULT_READY]})
+        poller = AIOPoller(max_rps=0, jitter=0)
+
+        waiter = asyncio.ensure_future(poller.poll(payload(1), repeat(0), session_pool=pool))
+        state = poller._state(asyncio.get_running_loop())
+        while not state.tasks:
+            await asyncio.sleep(0)
+        assert len(state.tasks) == 1
+
+        release.set()
+        assert (await waiter)["status"] == "ready"
+        await asyncio.sleep(0)
+        assert state.tasks == set()
+
+    async def test_cancelled_caller_is_dropped(self):
+        pool = RoutedPool({1: [RESULT_READY]})
+        poller = AIOPoller(max_rps=0, jitter=0)
+
+        waiter = asyncio.ensure_future(poller.poll(payload(1), repeat(30), session_pool=pool))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        state = poller._state(asyncio.get_running_loop())
+        state.heap = [(0, 0, state.heap[0][2])]
+        state.wakeup.set()
+        await asyncio.wait_for(state.driver, timeout=1)
+        assert pool.session.calls == []
+
+
+class TestInstrumentIntegration:
+    async def test_solver_hands_task_to_poller(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_PROCESSING)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = CaptchaParams(api_key="KEY", sleep_time=0)
+        solver.task_params.update(type="ImageToTextTask")
+        poller = AIOPoller(max_rps=0, jitter=0)
+        solver.set_poller(poller)
+
+        result = await solver.aio_captcha_handler()
+
+        assert result["status"] == "ready"
+        assert result["taskId"] == CREATE_TASK_OK["taskId"]
+        assert [request_json(call["kwargs"])["taskId"] for call in aio_http.post_calls[1:]] == [4242, 4242]
+        assert poller.pending() == 0
+
+    async def test_solver_polls_through_poller_with_its_limiter_and_hooks(self, aio_http, mocker):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_PROCESSING)
+        aio_http.enqueue_post(RESULT_READY)
+        solver = CaptchaParams(api_key="KEY", sleep_time=0)
+        solver.set_poller(AIOPoller(max_rps=0, jitter=0))
+        limiter = mocker.Mock(aio_acquire=mocker.AsyncMock())
+        solver.set_rate_limiter(limiter)
+        events = []
+        solver.add_hook(events.append)
+
+        await solver.aio_captcha_handler()
+
+        polled = [event for event in events if event.event == "polled"]
+        assert [(event.poll_count, event.status) for event in polled] == [(1, "processing"), (2, "ready")]
+        assert [call.kwargs["scope"] for call in limiter.aio_acquire.await_args_list] == [
+            "createTask",
+            "getTaskResult",
+            "getTaskResult",
+        ]
+        assert all(call["kwargs"]["timeout"] is not None for call in aio_http.post_calls)
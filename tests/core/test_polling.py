@@ -0,0 +1,110 @@
+"""Tests for ``core.polling`` — the adaptive per-captcha-type polling schedule.
+
+The engine is pure arithmetic over observed ``endTime - createTime`` samples, so
+oracles are computed by hand from small, known distributions.
+"""
+
+from itertools import islice
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.polling import PollingProfiles, StaticPollingProfile
+from python3_anticaptcha.core.sio_captcha_instrument import SIOCaptchaInstrument
+from tests.core.conftest import CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY
+
+
+def take(iterator, n):
+    return list(islice(iterator, n))
+
+
+def learned(samples, **kwargs) -> PollingProfiles:
+    profiles = PollingProfiles(min_samples=len(samples), **kwargs)
+    for value in samples:
+        profiles.observe("ImageToTextTask", create_time=100, end_time=100 + value)
+    return profiles
+
+
+class TestStaticProfile:
+    def test_first_delay_then_fixed_interval(self):
+        assert take(StaticPollingProfile(first_delay=2, interval=0.25).delays(), 4) == [2, 0.25, 0.25, 0.25]
+
+    def test_fallback_until_enough_samples(self):
+        profiles = PollingProfiles(min_samples=3)
+        profiles.observe("ImageToTextTask", create_time=0, end_time=4)
+
+        assert take(profiles.schedule("ImageToTextTask", sleep_time=5), 3) == [5, 5, 5]
+
+    def test_sub_second_sleep_time_is_kept(self):
+        assert take(PollingProfiles().schedule("ImageToTextTask", sleep_time=0.2), 2) == [0.2, 0.2]
+
+    def test_unknown_type_uses_fallback(self):
+        assert take(learned([4, 4, 4]).schedule(None, sleep_time=3), 2) == [3, 3]
+
+
+class TestLearnedProfile:
+    def test_quantiles_drive_first_delay_and_dense_phase(self):
+        # samples 2..10 -> q25 = 4, q90 = 9.2
+        profiles = learned([2, 3, 4, 5, 6, 7, 8, 9, 10], dense_polls=2)
+        delays = take(profiles.schedule("ImageToTextTask", sleep_time=15), 5)
+
+        assert delays[0] == pytest.approx(4)
+        assert delays[1:3] == [pytest.approx(2.6), pytest.approx(2.6)]
+        assert delays[3:] == [15, 15]
+
+    def test_min_interval_bounds_every_delay(self):
+        profiles = learned([0, 0, 0], min_interval=0.5)
+        assert take(profiles.schedule("ImageToTextTask", sleep_time=0.1), 6) == [0.5] * 6
+
+    def test_window_keeps_latest_samples(self):
+        profiles = PollingProfiles(window=2, min_samples=2)
+        for value in (100, 1, 1):
+            profiles.observe("ImageToTextTask", create_time=0, end_time=value)
+        assert profiles.quantile("ImageToTextTask", 1.0) == 1
+
+    @pytest.mark.parametrize("create_time, end_time", [(None, 5), (5, None), (10, 5)])
+    def test_incomplete_samples_are_ignored(self, create_time, end_time):
+        profiles = PollingProfiles(min_samples=1)
+        profiles.observe("ImageToTextTask", create_time=create_time, end_time=end_time)
+        assert profiles.quantile("ImageToTextTask", 0.5) is None
+
+    def test_types_are_learned_independently(self):
+        profiles = learned([30, 30, 30])
+        profiles.observe("TurnstileTaskProxyless", create_time=0, end_time=1)
+        assert profiles.quantile("ImageToTextTask", 0.5) == 30
+        assert profiles.quantile("TurnstileTaskProxyless", 0.5) is None
+
+
+class TestInstrumentIntegration:
+    def make_params(self, profiles: PollingProfiles) -> CaptchaParams:
+        params = CaptchaParams(api_key="KEY", sleep_time=15)
+        params.task_params.update(type="ImageToTextTask")
+        params.polling_profiles = profiles
+        return params
+
+    def test_ready_result_is_observed(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        profiles = PollingProfiles(min_samples=1)
+
+        SIOCaptchaInstrument(self.make_params(profiles)).processing_captcha()
+
+        # RESULT_READY: endTime - createTime == 10
+        assert profiles.quantile("ImageToTextTask", 0.5) == 10
+
+    def test_sleeps_follow_learned_schedule(self, sio_http, mocker):
+        sleep = mocker.patch("time.sleep")
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+        profiles = learned([1, 1, 1], min_interval=0.5, dense_polls=1)
+
+        SIOCaptchaInstrument(self.make_params(profiles)).processing_captcha()
+
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 0.5]
+
+    async def test_async_ready_result_is_observed(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        profiles = PollingProfiles(min_samples=1)
+
+        await self.make_params(profiles).aio_captcha_handler()
+
+        assert profiles.quantile("ImageToTextTask", 0.5) == 10
@@ -0,0 +1,158 @@
+"""Tests for ``core.queue_monitor`` — cached `getQueueStats` consulted by the solvers.
+
+Stats are loaded through the HTTP boundary fixtures; the fixtures patch the sleeps,
+so poll delays and holds are checked by the sleep arguments.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.queue_monitor import QUEUE_MONITOR, QueueMonitor, QueueStats
+from python3_anticaptcha.turnstile import Turnstile
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
+
+CALM = {"waiting": 90, "load": 38.36, "bid": 0.002, "speed": 7.38, "total": 146}
+PEAK = {**CALM, "waiting": 0, "load": 99.5, "speed": 21.0}
+
+
+def turnstile() -> Turnstile:
+    return Turnstile(
+        api_key="a" * 32,
+        captcha_type="TurnstileTaskProxyless",
+        websiteURL="https://example.test",
+        websiteKey="SITEKEY",
+    )
+
+
+class TestQueueMonitor:
+    def test_types_without_queue_are_not_loaded(self, sio_http):
+        monitor = QueueMonitor()
+
+        assert monitor.queue_id("AltchaTaskProxyless") is None
+        assert monitor.stats("AltchaTaskProxyless") is None
+        assert sio_http.post.call_count == 0
+
+    def test_stats_are_cached_for_ttl(self, sio_http):
+        sio_http.post_sequence(CALM, PEAK)
+        monitor = QueueMonitor(ttl=60)
+
+        assert monitor.stats("TurnstileTaskProxyless") == QueueStats(**CALM)
+        assert monitor.stats("TurnstileTaskProxyless").load == CALM["load"]
+        assert sio_http.post.call_count == 1
+        assert request_json(sio_http.post.call_args.kwargs) == {"queueId": 27}
+
+        monitor._updated[27] -= 60
+        assert monitor.stats("TurnstileTaskProxyless").load == PEAK["load"]
+
+    def test_failed_refresh_keeps_old_stats(self, sio_http):
+        sio_http.post_sequence(CALM)
+        monitor = QueueMonitor(ttl=0)
+        monitor.stats("TurnstileTaskProxyless")
+
+        sio_http.post.side_effect = ConnectionError("down")
+        assert monitor.stats("TurnstileTaskProxyless") == QueueStats(**CALM)
+
+    def test_first_poll_delay_is_bounded(self):
+        monitor = QueueMonitor(min_first_delay=2, max_first_delay=10)
+        assert monitor.first_poll_delay("TurnstileTaskProxyless") is None
+
+        monitor._stats[27] = QueueStats(speed=0.5)
+        assert monitor.first_poll_delay("TurnstileTaskProxyless") == 2
+        monitor._stats[27] = QueueStats(speed=42)
+        assert monitor.first_poll_delay("TurnstileTaskProxyless") == 10
+
+    def test_overloaded_needs_threshold(self):
+        assert not QueueMonitor().overloaded(QueueStats(load=100))
+        assert QueueMonitor(load_threshold=90).overloaded(QueueStats(load=95))
+        assert not QueueMonitor(load_threshold=90).overloaded(None)
+
+    def test_concurrent_threads_refresh_once(self):
+        monitor = QueueMonitor(ttl=60)
+        barrier = threading.Barrier(8)
+
+        def claim():
+            barrier.wait()
+            return monitor._claim_refresh(27)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            claims = list(pool.map(lambda _: claim(), range(8)))
+        assert claims.count(True) == 1
+
+    async def test_stale_stats_are_refreshed_in_background(self, aio_http):
+        aio_http.enqueue_post(CALM)
+        aio_http.enqueue_post(PEAK)
+        monitor = QueueMonitor(ttl=0)
+
+        # the first load is awaited, later ones don't block the solve
+        assert (await monitor.aio_stats("TurnstileTaskProxyless")).load == CALM["load"]
+        assert (await monitor.aio_stats("TurnstileTaskProxyless")).load == CALM["load"]
+        await asyncio.gather(*monitor._refreshing)
+        assert monitor.cached("TurnstileTaskProxyless").load == PEAK["load"]
+
+
+class TestSolverIntegration:
+    def test_monitor_is_opt_in(self):
+        solver = CaptchaParams(api_key="k")
+        assert solver.queue_monitor is None
+
+        solver.set_queue_monitor()
+        assert solver.queue_monitor is QUEUE_MONITOR
+        assert not solver.queue_hold
+
+    def test_hold_needs_load_threshold(self):
+        solver = CaptchaParams(api_key="k")
+        with pytest.raises(ValueError):
+            solver.set_queue_monitor(hold=True)
+
+        solver.set_queue_monitor(QueueMonitor(load_threshold=90), hold=True)
+        assert solver.queue_hold
+
+    def test_first_poll_waits_for_queue_speed(self, sio_http):
+        sio_http.post_sequence(CALM, CREATE_TASK_OK, RESULT_READY)
+        solver = turnstile()
+        solver.set_queue_monitor(QueueMonitor())
+
+        assert solver.captcha_handler()["status"] == "ready"
+        assert time.sleep.call_args_list[0].args[0] == CALM["speed"]
+
+    def test_urgent_tasks_are_not_held(self, sio_http):
+        sio_http.post_sequence(PEAK, CREATE_TASK_OK, RESULT_READY)
+        solver = turnstile()
+        solver.set_queue_monitor(QueueMonitor(load_threshold=90))
+
+        assert solver.captcha_handler()["status"] == "ready"
+        assert [call.args[0] for call in time.sleep.call_args_list] == [PEAK["speed"]]
+
+    def test_non_urgent_task_is_held_at_most_max_hold(self, sio_http):
+        sio_http.post_sequence(PEAK, CREATE_TASK_OK, RESULT_READY)
+        solver = turnstile()
+        solver.set_queue_monitor(QueueMonitor(load_threshold=90, hold_interval=4, max_hold=10), hold=True)
+
+        assert solver.captcha_handler()["status"] == "ready"
+        assert [call.args[0] for call in time.sleep.call_args_list] == [4, 4, 2, PEAK["speed"]]
+
+    async def test_async_hold_releases_when_load_drops(self, aio_http):
+        aio_http.enqueue_post(PEAK)
+        aio_http.enqueue_post(CALM)
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        aio_http.enqueue_post(RESULT_READY)
+        monitor = QueueMonitor(load_threshold=90, hold_interval=3)
+        solver = turnstile()
+        solver.set_queue_monitor(monitor, hold=True)
+        expired = []
+
+        async def sleep(delay):
+            # stats expire during the first hold, the background refresh finishes during the second one
+            await asyncio.gather(*monitor._refreshing)
+            if not expired:
+                monitor._updated[27] -= monitor.ttl
+                expired.append(delay)
+
+        asyncio.sleep.side_effect = sleep
+        assert (await solver.aio_captcha_handler())["status"] == "ready"
+        assert [call.args[0] for call in asyncio.sleep.call_args_list] == [3, 3, CALM["speed"]]
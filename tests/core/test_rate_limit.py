@@ -0,0 +1,175 @@
+"""Tests for ``core.rate_limit`` — the client-side token-bucket limiter of API
+calls.
+
+Bucket arithmetic runs against a patched monotonic clock. The instrument
+integration runs through the HTTP boundary fixtures and checks which scopes
+are acquired, and for which key.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from python3_anticaptcha.control import Control
+from python3_anticaptcha.core.enum import RateLimitScopeEnm
+from python3_anticaptcha.core.rate_limit import RateLimiter, TokenBucket
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY
+
+
+@pytest.fixture
+def clock(mocker):
+    return mocker.patch("python3_anticaptcha.core.rate_limit.time.monotonic", return_value=100.0)
+
+
+class TestTokenBucket:
+    def test_burst_then_waits(self, clock):
+        bucket = TokenBucket(rate=2)
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    def test_refills_with_time(self, clock):
+        bucket = TokenBucket(rate=1, burst=1)
+        assert bucket.reserve() == 0.0
+        clock.return_value = 101.0
+        assert bucket.reserve() == 0.0
+        # the bucket never holds more than `burst`
+        clock.return_value = 200.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_acquire_sleeps_the_wait(self, clock, mocker):
+        sleep = mocker.patch("python3_anticaptcha.core.rate_limit.time.sleep")
+        bucket = TokenBucket(rate=1)
+        bucket.acquire()
+        bucket.acquire()
+        sleep.assert_called_once_with(1.0)
+
+    async def test_aio_acquire_does_not_block_the_loop(self, clock, mocker):
+        sleep = mocker.patch("python3_anticaptcha.core.rate_limit.asyncio.sleep")
+        bucket = TokenBucket(rate=1)
+        await asyncio.gather(bucket.aio_acquire(), bucket.aio_acquire(), bucket.aio_acquire())
+        assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0]
+
+    def test_max_wait_clips_the_sleep(self, clock, mocker):
+        sleep = mocker.patch("python3_anticaptcha.core.rate_limit.time.sleep")
+        bucket = TokenBucket(rate=0.1, burst=1)
+        bucket.acquire(max_wait=2)
+        bucket.acquire(max_wait=2)
+        sleep.assert_called_once_with(2)
+
+    def test_threads_share_the_budget(self, clock):
+        bucket = TokenBucket(rate=10)
+        delays = []
+        threads = [threading.Thread(target=lambda: delays.append(bucket.reserve())) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(delays) == pytest.approx([0.0] * 10 + [n / 10 for n in range(1, 11)])
+
+
+class TestRateLimiter:
+    def test_unlimited_scope_has_no_bucket(self):
+        limiter = RateLimiter(create_task=5)
+        assert limiter.bucket(RateLimitScopeEnm.GET_TASK_RESULT, api_key="K") is None
+        assert limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="K").rate == 5
+
+    def test_every_key_has_own_buckets(self):
+        limiter = RateLimiter(create_task=5)
+        first = limiter.bucket("createTask", api_key="A")
+        assert first is limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="A")
+        assert first is not limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="B")
+
+    def test_per_key_limits(self):
+        limiter = RateLimiter(create_task=5, control=1)
+        limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="A")
+        limiter.set_limits(api_key="A", create_task=50)
+        assert limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="A").rate == 50
+        assert limiter.bucket(RateLimitScopeEnm.CONTROL, api_key="A").rate == 1
+        assert limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="B").rate == 5
+
+
+class TestInstrumentsUseLimiter:
+    def test_sync_scopes(self, sio_http, mocker):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY)
+        limiter = RateLimiter()
+        acquire = mocker.spy(limiter, "acquire")
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_rate_limiter(limiter)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert [call.kwargs for call in acquire.call_args_list] == [
+            {"scope": RateLimitScopeEnm.CREATE_TASK, "api_key": "KEY", "max_wait": None},
+            {"scope": RateLimitScopeEnm.GET_TASK_RESULT, "api_key": "KEY", "max_wait": None},
+            {"scope": RateLimitScopeEnm.GET_TASK_RESULT, "api_key": "KEY", "max_wait": None},
+        ]
+
+    async def test_async_scopes(self, aio_http, mocker):
+        for payload in (CREATE_TASK_OK, RESULT_READY):
+            aio_http.enqueue_post(payload)
+        limiter = RateLimiter()
+        aio_acquire = mocker.spy(limiter, "aio_acquire")
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_rate_limiter(limiter)
+
+        await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert [call.kwargs["scope"] for call in aio_acquire.call_args_list] == [
+            RateLimitScopeEnm.CREATE_TASK,
+            RateLimitScopeEnm.GET_TASK_RESULT,
+        ]
+
+    def test_wait_is_clipped_to_deadline(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        limiter = RateLimiter(create_task=0.1, burst=1)
+        limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="KEY").reserve()
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_rate_limiter(limiter)
+        solver.set_timeout(total=2)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        # `time.sleep` is patched by the fixture, the limiter asked for a 10s wait
+        assert 0 < time.sleep.call_args_list[0].args[0] <= 2
+
+    async def test_async_wait_is_clipped_to_deadline(self, aio_http):
+        for payload in (CREATE_TASK_OK, RESULT_READY):
+            aio_http.enqueue_post(payload)
+        limiter = RateLimiter(create_task=0.1, burst=1)
+        limiter.bucket(RateLimitScopeEnm.CREATE_TASK, api_key="KEY").reserve()
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_rate_limiter(limiter)
+        solver.set_timeout(total=2)
+
+        await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert 0 < asyncio.sleep.call_args_list[0].args[0] <= 2
+
+    def test_control_scope(self, sio_http, mocker):
+        sio_http.post_sequence({"errorId": 0, "balance": 1.0})
+        limiter = RateLimiter(control=1)
+        acquire = mocker.spy(limiter, "acquire")
+        control = Control(api_key="KEY")
+        control.set_rate_limiter(limiter)
+
+        control.get_balance()
+
+        acquire.assert_called_once_with(scope=RateLimitScopeEnm.CONTROL, api_key="KEY")
+
+    async def test_async_control_scope(self, aio_http, mocker):
+        aio_http.enqueue_post({"errorId": 0, "balance": 1.0})
+        limiter = RateLimiter(control=1)
+        aio_acquire = mocker.spy(limiter, "aio_acquire")
+        control = Control(api_key="KEY")
+        control.set_rate_limiter(limiter)
+
+        await control.aio_get_balance()
+
+        aio_acquire.assert_called_once_with(scope=RateLimitScopeEnm.CONTROL, api_key="KEY")
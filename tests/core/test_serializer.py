@@ -10,6 +10,10 @@ from msgspec import Struct
 from python3_anticaptcha.core.const import APP_KEY
 from python3_anticaptcha.core.enum import ResponseStatusEnm
 from python3_anticaptcha.core.serializer import (
+    CREATE_TASK_RESPONSE_DECODER,
+    GET_TASK_RESULT_RESPONSE_DECODER,
+    JSON_DECODER,
+    JSON_ENCODER,
     BaseAPIResponseSer,
     CaptchaOptionsSer,
     CreateTaskBaseSer,
@@ -95,6 +99,17 @@ class TestGetTaskResultRequestSer:
 
 
 class TestGetTaskResultResponseSer:
+    def test_decoded_status_is_plain_string(self):
+        result = GET_TASK_RESULT_RESPONSE_DECODER.decode(b'{"errorId": 0, "status": "ready"}').to_dict()
+        assert type(result["status"]) is str
+        assert result["status"] == "ready"
+
+    def test_null_status_and_solution_are_decoded(self):
+        payload = b'{"errorId": 12, "errorCode": "ERROR_CAPTCHA_UNSOLVABLE", "status": null, "solution": null}'
+        result = GET_TASK_RESULT_RESPONSE_DECODER.decode(payload).to_dict()
+        assert result["errorCode"] == "ERROR_CAPTCHA_UNSOLVABLE"
+        assert (result["status"], result["solution"]) == ("error", {})
+
     def test_defaults(self):
         obj = GetTaskResultResponseSer()
         # NOTE: status defaults to ResponseStatusEnm.error.value — a documented,
@@ -147,3 +162,37 @@ def test_base_api_response_defaults():
     assert obj.errorId == 0
     assert obj.errorCode is None
     assert obj.errorDescription is None
+
+
+class TestJsonCodecs:
+    def test_encoder_writes_struct_fields(self):
+        body = JSON_ENCODER.encode(CreateTaskBaseSer(clientKey="KEY", task={"type": "ImageToTextTask"}))
+        assert JSON_DECODER.decode(body) == {
+            "clientKey": "KEY",
+            "task": {"type": "ImageToTextTask"},
+            "softId": APP_KEY,
+            "callbackUrl": "",
+        }
+
+    def test_create_task_response_decoded_to_struct(self):
+        obj = CREATE_TASK_RESPONSE_DECODER.decode(b'{"errorId": 0, "taskId": 7}')
+        assert isinstance(obj, CreateTaskResponseSer)
+        assert obj.taskId == 7
+        assert obj.errorCode is None
+
+    def test_error_response_with_nulls(self):
+        obj = GET_TASK_RESULT_RESPONSE_DECODER.decode(
+            b'{"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST", "errorDescription": null}'
+        )
+        assert obj.errorId == 1
+        assert obj.errorCode == "ERROR_KEY_DOES_NOT_EXIST"
+        assert obj.errorDescription is None
+
+    def test_cost_as_string_is_accepted(self):
+        obj = GET_TASK_RESULT_RESPONSE_DECODER.decode(b'{"errorId": 0, "status": "ready", "cost": "0.00070"}')
+        assert obj.status == ResponseStatusEnm.ready
+        assert obj.cost == pytest.approx(0.0007)
+
+    def test_unknown_fields_are_ignored(self):
+        obj = GET_TASK_RESULT_RESPONSE_DECODER.decode(b'{"errorId": 0, "status": "processing", "newField": 1}')
+        assert obj.status == ResponseStatusEnm.processing
@@ -14,12 +14,14 @@ import requests
 from python3_anticaptcha.core.base import CaptchaParams
 from python3_anticaptcha.core.const import APP_KEY, BASE_REQUEST_URL, CREATE_TASK_POSTFIX, GET_RESULT_POSTFIX
 from python3_anticaptcha.core.enum import SaveFormatsEnm
+from python3_anticaptcha.core.key_pool import KeyPool
 from python3_anticaptcha.core.sio_captcha_instrument import SIOCaptchaInstrument
 from tests.core.conftest import (
     CREATE_TASK_OK,
     RESULT_ERROR,
     RESULT_PROCESSING,
     RESULT_READY,
+    request_json,
     resp,
 )
 
@@ -37,8 +39,8 @@ def post_kwargs(call):
     """Return (url, json) from a session.post call regardless of call style."""
     kwargs = call.kwargs
     if "url" in kwargs:
-        return kwargs["url"], kwargs.get("json")
-    return call.args[0], kwargs.get("json")
+        return kwargs["url"], request_json(kwargs)
+    return call.args[0], request_json(kwargs)
 
 
 class TestProcessingCaptchaStateMachine:
@@ -156,6 +158,66 @@ class TestProcessingImageCaptcha:
         _, body = post_kwargs(sio_http.post.call_args_list[0])
         assert body["task"]["body"] == base64.b64encode(b"RAW").decode("utf-8")
 
+    def test_base64_str_is_sent_as_is(self, sio_http, tmp_path):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        encoded = base64.b64encode(b"RAW").decode("utf-8")
+        SIOCaptchaInstrument(make_params(type="ImageToTextTask")).processing_image_captcha(
+            save_format=SaveFormatsEnm.TEMP.value,
+            img_clearing=False,
+            captcha_link=None,
+            captcha_file=None,
+            captcha_base64=encoded,
+            img_path=str(tmp_path),
+        )
+
+        _, body = post_kwargs(sio_http.post.call_args_list[0])
+        assert body["task"]["body"] == encoded
+
+    def test_mapped_file_is_released_after_create_task(self, sio_http, tmp_path):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        img = tmp_path / "cap.png"
+        img.write_bytes(b"PNGDATA")
+        params = make_params(type="ImageToTextTask")
+        instrument = SIOCaptchaInstrument(params)
+
+        with open(img, "rb") as file:
+            instrument.processing_image_captcha(
+                save_format=SaveFormatsEnm.TEMP.value,
+                img_clearing=False,
+                captcha_link=None,
+                captcha_file=file,
+                captcha_base64=None,
+                img_path=str(tmp_path),
+            )
+
+        _, body = post_kwargs(sio_http.post.call_args_list[0])
+        assert body["task"]["body"] == base64.b64encode(b"PNGDATA").decode("utf-8")
+        assert "body" not in params.create_task_payload.task
+        assert instrument._body_release is None
+
+    def test_mapped_file_is_released_when_solve_fails(self, sio_http, tmp_path):
+        img = tmp_path / "cap.png"
+        img.write_bytes(b"PNGDATA")
+        pool = KeyPool(["A"])
+        pool.release(pool.acquire(), error_code="ERROR_KEY_DOES_NOT_EXIST")
+        params = make_params(type="ImageToTextTask")
+        params.set_key_pool(pool)
+        instrument = SIOCaptchaInstrument(params)
+
+        with pytest.raises(ValueError):
+            instrument.processing_image_captcha(
+                save_format=SaveFormatsEnm.TEMP.value,
+                img_clearing=False,
+                captcha_link=None,
+                captcha_file=str(img),
+                captcha_base64=None,
+                img_path=str(tmp_path),
+            )
+
+        assert "body" not in params.create_task_payload.task
+        assert instrument._body_release is None
+        assert sio_http.post.call_count == 0
+
     def test_captcha_link_body_from_url_content(self, sio_http, tmp_path):
         sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
         sio_http.get.return_value = resp({}, content=b"FROMURL")
@@ -0,0 +1,100 @@
+"""Tests for ``core.sio_session`` — the process-wide keep-alive pool shared by
+every sync instrument and ``Control`` method.
+
+A fresh ``SIOSessionPool`` is built per test so the module-level default pool is
+never closed or reconfigured behind other tests' backs.
+"""
+
+import requests
+
+from python3_anticaptcha.control import Control
+from python3_anticaptcha.core.base import CaptchaParams
+from python3_anticaptcha.core.const import RETRIES
+from python3_anticaptcha.core.sio_captcha_instrument import SIOCaptchaInstrument
+from python3_anticaptcha.core.sio_session import SIO_SESSION_POOL, SIOSessionPool
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, resp
+
+
+class TestSessionLifecycle:
+    def test_session_is_created_lazily_and_reused(self):
+        pool = SIOSessionPool()
+        assert pool._session is None
+
+        first = pool.session
+        assert isinstance(first, requests.Session)
+        assert pool.session is first
+
+    def test_adapter_uses_configured_pool_size_and_retries(self):
+        pool = SIOSessionPool(pool_connections=3, pool_maxsize=42)
+        adapter = pool.session.get_adapter("https://api.anti-captcha.com/")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 42
+        assert adapter.max_retries is RETRIES
+        assert pool.session.verify is False
+
+    def test_close_drops_session_and_next_access_reopens(self):
+        pool = SIOSessionPool()
+        first = pool.session
+        pool.close()
+
+        assert pool._session is None
+        assert pool.session is not first
+
+    def test_configure_remounts_adapters_on_live_session(self, mocker):
+        pool = SIOSessionPool()
+        first = pool.session
+        close = mocker.spy(first, "close")
+        pool.configure(pool_maxsize=64)
+
+        # threads in the middle of a request keep using the session
+        assert pool.session is first
+        close.assert_not_called()
+        assert pool.session.get_adapter("https://x")._pool_maxsize == 64
+        assert pool.session.get_adapter("http://x")._pool_maxsize == 64
+
+
+class TestContextManagerOwnership:
+    def test_exit_keeps_shared_session_open(self):
+        # other threads may still be polling with the shared session
+        params = CaptchaParams(api_key="k")
+        params.sio_session_pool = SIOSessionPool()
+        with params:
+            session = params.sio_session_pool.session
+
+        assert params.sio_session_pool.session is session
+
+    def test_explicit_close(self):
+        params = CaptchaParams(api_key="k")
+        params.sio_session_pool = SIOSessionPool()
+        session = params.sio_session_pool.session
+
+        params.close()
+
+        assert params.sio_session_pool._session is None
+        assert params.sio_session_pool.session is not session
+
+
+class TestSharedTransport:
+    def test_instruments_share_default_pool_session(self):
+        first = SIOCaptchaInstrument(CaptchaParams(api_key="a"))
+        second = SIOCaptchaInstrument(CaptchaParams(api_key="b"))
+
+        assert first.session is second.session is SIO_SESSION_POOL.session
+
+    def test_session_is_not_closed_after_solve(self, sio_http, mocker):
+        close = mocker.patch("requests.Session.close")
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        params = CaptchaParams(api_key="k", sleep_time=0)
+        params.task_params.update(type="ImageToTextTask")
+
+        params.captcha_handler()
+
+        close.assert_not_called()
+
+    def test_control_uses_pooled_session(self, sio_http):
+        sio_http.post.return_value = resp({"errorId": 0, "balance": 1.0})
+        Control(api_key="k").get_balance()
+        Control.get_queue_status(queue_id=1)
+
+        assert sio_http.post.call_count == 2
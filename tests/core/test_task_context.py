@@ -0,0 +1,103 @@
+"""Tests for ``core.task_context`` — per-call state of re-entrant solvers.
+
+One solver object is shared by concurrent calls (threads and tasks); every
+call must send its own task body and never change the solver template.
+Concurrent calls interleave their requests in any order, so the fake transport
+answers every request with one response valid for both API methods.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from python3_anticaptcha.core.key_pool import KeyPool
+from python3_anticaptcha.core.task_context import TaskContext
+from python3_anticaptcha.turnstile import Turnstile
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json, resp
+
+ANY_METHOD_OK = {**RESULT_READY, **CREATE_TASK_OK}
+
+
+def make_solver() -> Turnstile:
+    return Turnstile(
+        api_key="a" * 32,
+        captcha_type="TurnstileTaskProxyless",
+        websiteURL="https://example.com/",
+        websiteKey="1x00000000000000000000AA",
+    )
+
+
+class TestTaskContext:
+    def test_copies_the_template(self):
+        solver = make_solver()
+        context = TaskContext(solver, task_params={"proxyLogin": "user"})
+
+        context.create_task_payload.task["body"] = "X"
+        context.create_task_payload.clientKey = "other"
+        context.get_result_params.taskId = 1
+
+        assert context.create_task_payload.task["proxyLogin"] == "user"
+        assert context.create_task_payload.task["websiteURL"] == "https://example.com/"
+        assert "body" not in solver.create_task_payload.task
+        assert "proxyLogin" not in solver.task_params
+        assert solver.create_task_payload.clientKey == "a" * 32
+        assert solver.get_result_params.taskId is None
+
+    def test_per_call_params_override_the_template(self):
+        context = TaskContext(make_solver(), task_params={"websiteURL": "https://other.com/"})
+        assert context.create_task_payload.task["websiteURL"] == "https://other.com/"
+
+
+class TestReentrantSolver:
+    def test_overrides_do_not_leak_into_next_call(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY, CREATE_TASK_OK, RESULT_READY)
+        solver = make_solver()
+
+        solver.captcha_handler(proxyLogin="user")
+        solver.captcha_handler()
+
+        first, _, second, _ = (request_json(call.kwargs) for call in sio_http.post.call_args_list)
+        assert first["task"]["proxyLogin"] == "user"
+        assert "proxyLogin" not in second["task"]
+
+    def test_concurrent_threads_share_one_solver(self, sio_http):
+        sio_http.post.side_effect = lambda *args, **kwargs: resp(ANY_METHOD_OK)
+        solver = make_solver()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda n: solver.captcha_handler(websiteURL=f"https://{n}.com/"), range(32)))
+
+        assert all(result["status"] == "ready" for result in results)
+        urls = sorted(
+            payload["task"]["websiteURL"]
+            for payload in (request_json(call.kwargs) for call in sio_http.post.call_args_list)
+            if "task" in payload
+        )
+        assert urls == sorted(f"https://{n}.com/" for n in range(32))
+        assert solver.task_params["websiteURL"] == "https://example.com/"
+
+    async def test_concurrent_tasks_share_one_solver(self, aio_http):
+        for _ in range(4):
+            aio_http.enqueue_post(ANY_METHOD_OK)
+        solver = make_solver()
+
+        results = await asyncio.gather(
+            solver.aio_captcha_handler(websiteURL="https://a.com/"),
+            solver.aio_captcha_handler(websiteURL="https://b.com/"),
+        )
+
+        assert [result["status"] for result in results] == ["ready", "ready"]
+        payloads = [request_json(call["kwargs"]) for call in aio_http.post_calls]
+        urls = sorted(payload["task"]["websiteURL"] for payload in payloads if "task" in payload)
+        assert urls == ["https://a.com/", "https://b.com/"]
+        assert solver.task_params["websiteURL"] == "https://example.com/"
+
+    def test_key_pool_key_does_not_change_the_template(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        solver = make_solver()
+        solver.set_key_pool(KeyPool(["B"]))
+
+        solver.captcha_handler()
+
+        assert request_json(sio_http.post.call_args.kwargs)["clientKey"] == "B"
+        assert solver.create_task_payload.clientKey == "a" * 32
+        assert solver.get_result_params.clientKey == "a" * 32
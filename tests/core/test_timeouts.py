@@ -0,0 +1,131 @@
+"""Tests for ``core.timeouts`` — the solve deadline and per-request timeouts.
+
+Deadline arithmetic runs against a patched monotonic clock. The instrument
+integration runs through the HTTP boundary fixtures; the clock is moved
+forward from inside the fake transport to expire the deadline mid-solve.
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+
+from python3_anticaptcha.core.const import CONNECT_TIMEOUT, READ_TIMEOUT
+from python3_anticaptcha.core.timeouts import Deadline, DeadlineExceeded
+from python3_anticaptcha.image_to_text import ImageToText
+from tests.core.conftest import CREATE_TASK_OK, RESULT_PROCESSING, RESULT_READY, resp
+
+
+@pytest.fixture
+def clock(mocker):
+    return mocker.patch("python3_anticaptcha.core.timeouts.time.monotonic", return_value=100.0)
+
+
+class TestDeadline:
+    def test_no_total_never_expires(self, clock):
+        deadline = Deadline(total=None)
+        clock.return_value = 1e9
+        assert deadline.remaining() is None
+        assert not deadline.expired()
+        assert deadline.clip(7) == 7
+        assert deadline.sio_timeout() == (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    def test_clips_sleeps_and_timeouts(self, clock):
+        deadline = Deadline(total=12, connect=5, read=30)
+        clock.return_value = 104.0
+        assert deadline.remaining() == 8.0
+        assert deadline.clip(10) == 8.0
+        assert deadline.clip(3) == 3
+        assert deadline.sio_timeout() == (5, 8.0)
+
+        timeout = deadline.aio_timeout()
+        assert isinstance(timeout, aiohttp.ClientTimeout)
+        assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (8.0, 5, 8.0)
+
+    def test_expired_deadline_raises(self, clock):
+        deadline = Deadline(total=1)
+        clock.return_value = 101.0
+        assert deadline.expired()
+        assert deadline.remaining() == 0.0
+        with pytest.raises(DeadlineExceeded):
+            deadline.sio_timeout()
+        with pytest.raises(DeadlineExceeded):
+            deadline.aio_timeout()
+
+
+class TestSyncSolve:
+    def test_timeouts_are_passed_to_requests(self, sio_http):
+        sio_http.post_sequence(CREATE_TASK_OK, RESULT_READY)
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_timeout(connect=3, read=7)
+
+        solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert [call.kwargs["timeout"] for call in sio_http.post.call_args_list] == [(3, 7), (3, 7)]
+
+    def test_expired_deadline_returns_task_id(self, sio_http, clock):
+        responses = iter([CREATE_TASK_OK, RESULT_PROCESSING])
+
+        def post(*args, **kwargs):
+            clock.return_value += 6
+            return resp(next(responses))
+
+        sio_http.post.side_effect = post
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_timeout(total=10)
+
+        result = solver.captcha_handler(captcha_base64=b"RAW")
+
+        assert result["errorCode"] == "ERROR_DEADLINE_EXCEEDED"
+        assert result["status"] == "processing"
+        assert result["taskId"] == 4242
+        assert sio_http.post.call_count == 2
+
+    def test_request_timeout_before_deadline_is_raised(self, sio_http):
+        sio_http.post.side_effect = requests.ReadTimeout()
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_timeout(total=60)
+
+        with pytest.raises(requests.ReadTimeout):
+            solver.captcha_handler(captcha_base64=b"RAW")
+
+
+class TestAsyncSolve:
+    async def test_expired_deadline_returns_task_id(self, aio_http, clock, mocker):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+        for _ in range(5):
+            aio_http.enqueue_post(RESULT_PROCESSING)
+
+        async def sleep(delay):
+            clock.return_value += delay
+
+        mocker.patch("asyncio.sleep", side_effect=sleep)
+        solver = ImageToText(api_key="KEY", sleep_time=4)
+        solver.set_timeout(total=10)
+
+        result = await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert result["errorCode"] == "ERROR_DEADLINE_EXCEEDED"
+        assert result["taskId"] == 4242
+        # the last sleep is clipped to the deadline, no poll is sent after it
+        assert clock.return_value == 110.0
+        timeouts = [call["kwargs"]["timeout"] for call in aio_http.post_calls]
+        assert timeouts[0].total == 10.0
+        assert timeouts[-1].total == pytest.approx(2.0)
+
+    async def test_slow_poller_is_cut_by_deadline(self, aio_http):
+        aio_http.enqueue_post(CREATE_TASK_OK)
+
+        class StuckPoller:
+            async def poll(self, **kwargs):
+                await asyncio.Event().wait()
+
+        solver = ImageToText(api_key="KEY", sleep_time=0)
+        solver.set_poller(StuckPoller())
+        solver.set_timeout(total=0.05)
+
+        result = await solver.aio_captcha_handler(captcha_base64=b"RAW")
+
+        assert result["errorCode"] == "ERROR_DEADLINE_EXCEEDED"
+        assert result["taskId"] == 4242
@@ -0,0 +1,149 @@
+"""Tests for ``core.token_pool`` — the warm pool of pre-solved token captchas.
+
+Solvers are replaced by a scripted fake exposing the two things the pool uses:
+``task_params`` (the pool key) and ``aio_captcha_handler()``.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from python3_anticaptcha.core.token_pool import TokenPool
+from python3_anticaptcha.turnstile import Turnstile
+
+
+def ready(token: str, end_time: float = None) -> dict:
+    end_time = time.time() if end_time is None else end_time
+    return {
+        "errorId": 0,
+        "status": "ready",
+        "solution": {"token": token},
+        "createTime": int(end_time) - 10,
+        "endTime": int(end_time),
+    }
+
+
+class FakeSolver:
+    def __init__(self, *results, **task_params):
+        self.task_params = {"type": "TurnstileTaskProxyless", "websiteURL": "https://x", "websiteKey": "K"}
+        self.task_params.update(task_params)
+        self.results = list(results)
+        self.calls = 0
+
+    async def aio_captcha_handler(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.results:
+            return self.results.pop(0)
+        return ready(f"t{self.calls}")
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestKey:
+    def test_key_from_solver_params(self):
+        solver = Turnstile(
+            api_key="KEY",
+            captcha_type="TurnstileTaskProxyless",
+            websiteURL="https://x",
+            websiteKey="K",
+            action="login",
+        )
+        assert TokenPool.key(solver) == ("TurnstileTaskProxyless", "https://x", "K", "login")
+
+    def test_recaptcha_v3_page_action_is_the_action(self):
+        assert TokenPool.key(FakeSolver(pageAction="submit"))[3] == "submit"
+
+
+class TestWarmPool:
+    def test_add_outside_of_loop(self):
+        solver = FakeSolver()
+        pool = TokenPool(size=1)
+        pool.add(solver)
+        assert pool._pools[TokenPool.key(solver)].wakeup is None
+
+        async def main():
+            async with pool:
+                return await pool.get(solver, timeout=1)
+
+        assert asyncio.run(main())["status"] == "ready"
+
+    async def test_keeps_size_tokens_ready(self):
+        solver = FakeSolver()
+        async with TokenPool(size=3) as pool:
+            pool.add(solver)
+            await settle()
+            assert pool.ready(solver) == 3
+            assert solver.calls == 3
+
+    async def test_get_nowait_serves_ready_token_and_refills(self):
+        solver = FakeSolver()
+        async with TokenPool(size=2) as pool:
+            pool.add(solver)
+            await settle()
+
+            result = pool.get_nowait(solver)
+            assert result["solution"]["token"] in {"t1", "t2"}
+            await settle()
+            assert pool.ready(solver) == 2
+            assert solver.calls == 3
+
+    async def test_get_waits_for_next_token(self):
+        solver = FakeSolver()
+        pool = TokenPool(size=0)
+        pool.add(solver)
+        async with pool:
+            assert pool.get_nowait(solver) is None
+            result = await asyncio.wait_for(pool.get(solver), timeout=1)
+            assert result["status"] == "ready"
+
+    async def test_get_timeout(self):
+        pool = TokenPool(size=0)
+        solver = FakeSolver()
+        pool.add(solver)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.get(solver, timeout=0.01)
+
+    async def test_stale_tokens_are_evicted(self):
+        solver = FakeSolver(ready("old", end_time=time.time() - 115))
+        pool = TokenPool(size=1, token_ttl=120, safety_margin=10)
+        async with pool:
+            pool.add(solver)
+            await settle()
+            assert pool.get_nowait(solver)["solution"]["token"] != "old"
+
+    async def test_failed_solve_backs_off(self):
+        solver = FakeSolver({"errorId": 1, "errorCode": "ERROR_ZERO_BALANCE"})
+        async with TokenPool(size=1, error_backoff=60) as pool:
+            pool.add(solver)
+            await settle()
+            assert solver.calls == 1
+            assert pool.ready(solver) == 0
+
+    async def test_target_grows_with_demand(self):
+        solver = FakeSolver()
+        pool = TokenPool(size=1, max_size=50, demand_window=10)
+        pool.add(solver)
+        warm = pool._pools[pool.key(solver)]
+        warm.solve_time = 20.0
+        for _ in range(5):
+            pool.get_nowait(solver)
+        # 5 requests in 10s over a 20s solve time
+        assert pool._target(warm) == 10
+        warm.solve_time = 1000.0
+        assert pool._target(warm) == 50
+
+    async def test_stop_cancels_waiters(self):
+        pool = TokenPool(size=0)
+        solver = FakeSolver()
+        pool.add(solver)
+        await pool.start()
+        waiter = asyncio.create_task(pool.get(solver))
+        await asyncio.sleep(0)
+        await pool.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
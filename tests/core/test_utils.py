@@ -1,14 +1,18 @@
-"""Tests for ``core.utils.attempts_generator`` — the retry-count source for the
-get-result polling loop.
+"""Tests for ``core.utils`` — ``attempts_generator``, the retry-count source for
+the get-result polling loop, and ``LazyImports``, which keeps transports out of
+the package import.
 
 The default ``amount=30`` is the untested invariant noted in the audit (a
 duplicate with a different default lives in ``config.py``). The instruments
 import the ``core/utils`` copy, so that is the one that matters.
 """
 
+import subprocess
+import sys
+
 import pytest
 
-from python3_anticaptcha.core.utils import attempts_generator
+from python3_anticaptcha.core.utils import LazyImports, attempts_generator, lazy_instruments
 
 
 def test_default_amount_is_30():
@@ -36,3 +40,45 @@ def test_is_a_generator_not_a_list():
     gen = attempts_generator(amount=3)
     assert iter(gen) is gen  # generator object
     assert next(gen) == 1
+
+
+class TestLazyImports:
+    def test_imports_on_first_access_and_caches(self):
+        namespace = {"__name__": "fake_module"}
+        lazy = LazyImports(namespace, dedent="textwrap")
+        assert "dedent" not in namespace
+        from textwrap import dedent
+
+        assert lazy.dedent is dedent
+        assert namespace["dedent"] is dedent
+
+    def test_patched_value_wins(self):
+        namespace = {"__name__": "fake_module", "dedent": "patched"}
+        assert LazyImports(namespace, dedent="textwrap").dedent == "patched"
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            LazyImports({"__name__": "fake_module"}).module_getattr("missing")
+
+    def test_lazy_instruments(self):
+        namespace = {"__name__": "fake_module"}
+        lazy = lazy_instruments(namespace, dedent="textwrap")
+        from python3_anticaptcha.core.sio_captcha_instrument import SIOCaptchaInstrument
+
+        assert lazy.SIOCaptchaInstrument is SIOCaptchaInstrument
+        assert lazy.module_getattr("dedent").__name__ == "dedent"
+
+    def test_module_import_does_not_load_transports(self):
+        code = (
+            "import sys\n"
+            "import python3_anticaptcha.turnstile, python3_anticaptcha.image_to_text, python3_anticaptcha.control\n"
+            "import python3_anticaptcha.core.key_pool, python3_anticaptcha.core.queue_monitor\n"
+            "from python3_anticaptcha.core.base import SIOCaptchaInstrument\n"
+            "print(sorted(m for m in ('asyncio', 'aiohttp', 'tenacity') if m in sys.modules))\n"
+            "print(sorted(m for m in ('requests', 'urllib3') if m in sys.modules))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        lazy_async, sync = output.splitlines()
+        # importing the sync instrument loads `requests`, async backends stay unloaded
+        assert lazy_async == "[]"
+        assert sync == "['requests', 'urllib3']"
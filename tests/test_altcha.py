@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.altcha import Altcha
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestAltcha(BaseTest):
@@ -41,4 +42,4 @@ class TestAltcha(BaseTest):
     def test_handler_sends_type(self, sio_http):
         sio_http.post_sequence({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
         Altcha(api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.AltchaTaskProxyless, **self.BASE).captcha_handler()
-        assert sio_http.post.call_args.kwargs["json"]["task"]["type"] == CaptchaTypeEnm.AltchaTaskProxyless
+        assert request_json(sio_http.post.call_args.kwargs)["task"]["type"] == CaptchaTypeEnm.AltchaTaskProxyless
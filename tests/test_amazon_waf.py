@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.amazon_waf import AmazonWAF
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestAmazonWAF(BaseTest):
@@ -44,4 +45,4 @@ class TestAmazonWAF(BaseTest):
         await AmazonWAF(
             api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.AmazonTaskProxyless, **self.BASE
         ).aio_captcha_handler()
-        assert aio_http.post_calls[0]["kwargs"]["json"]["task"]["type"] == CaptchaTypeEnm.AmazonTaskProxyless
+        assert request_json(aio_http.post_calls[0]["kwargs"])["task"]["type"] == CaptchaTypeEnm.AmazonTaskProxyless
@@ -10,7 +10,7 @@ from python3_anticaptcha.control import Control
 from python3_anticaptcha.core.const import BASE_REQUEST_URL
 from python3_anticaptcha.core.enum import ControlPostfixEnm
 from tests.conftest import BaseTest
-from tests.core.conftest import resp
+from tests.core.conftest import request_json, resp
 
 
 def endpoint(postfix) -> str:
@@ -33,7 +33,7 @@ class TestControl(BaseTest):
         assert result == {"errorId": 0, "balance": 12.5}
         call = sio_http.post.call_args
         assert sync_url(call) == endpoint(ControlPostfixEnm.GET_BALANCE)
-        assert call.kwargs["json"] == {"clientKey": self.API_KEY}
+        assert request_json(call.kwargs) == {"clientKey": self.API_KEY}
 
     async def test_aio_get_balance_exact_request(self, aio_http):
         aio_http.enqueue_post({"errorId": 0, "balance": 12.5})
@@ -42,7 +42,7 @@ class TestControl(BaseTest):
         assert result == {"errorId": 0, "balance": 12.5}
         call = aio_http.post_calls[0]
         assert async_url(call) == endpoint(ControlPostfixEnm.GET_BALANCE)
-        assert call["kwargs"]["json"] == {"clientKey": self.API_KEY}
+        assert request_json(call["kwargs"]) == {"clientKey": self.API_KEY}
 
     def test_get_queue_status_exact_request(self, sio_http):
         sio_http.post.return_value = resp({"waiting": 12, "load": 1.5, "bid": 0.001, "speed": 2, "total": 20})
@@ -51,7 +51,7 @@ class TestControl(BaseTest):
         assert result["waiting"] == 12
         call = sio_http.post.call_args
         assert sync_url(call) == endpoint(ControlPostfixEnm.GET_QUEUE_STATS)
-        assert call.kwargs["json"] == {"queueId": 7}
+        assert request_json(call.kwargs) == {"queueId": 7}
 
     async def test_aio_get_queue_status_exact_request(self, aio_http):
         aio_http.enqueue_post({"waiting": 12, "load": 1.5, "bid": 0.001, "speed": 2, "total": 20})
@@ -60,7 +60,7 @@ class TestControl(BaseTest):
         assert result["total"] == 20
         call = aio_http.post_calls[0]
         assert async_url(call) == endpoint(ControlPostfixEnm.GET_QUEUE_STATS)
-        assert call["kwargs"]["json"] == {"queueId": 7}
+        assert request_json(call["kwargs"]) == {"queueId": 7}
 
     def test_get_spending_stats_merges_clientkey_and_kwargs(self, sio_http):
         payload = {"errorId": 0, "data": [{"volume": 2, "money": 0.01}]}
@@ -70,7 +70,7 @@ class TestControl(BaseTest):
         assert result == payload
         call = sio_http.post.call_args
         assert sync_url(call) == endpoint(ControlPostfixEnm.GET_SPENDING_STATS)
-        assert call.kwargs["json"] == {
+        assert request_json(call.kwargs) == {
             "clientKey": self.API_KEY,
             "softId": 867,
             "queue": "English ImageToText",
@@ -84,7 +84,7 @@ class TestControl(BaseTest):
         assert result == payload
         call = aio_http.post_calls[0]
         assert async_url(call) == endpoint(ControlPostfixEnm.GET_SPENDING_STATS)
-        assert call["kwargs"]["json"] == {"clientKey": self.API_KEY, "softId": 867}
+        assert request_json(call["kwargs"]) == {"clientKey": self.API_KEY, "softId": 867}
 
     @pytest.mark.parametrize("mode", [None, "views", "errors"])
     def test_get_app_stats_exact_payload(self, sio_http, mode):
@@ -95,7 +95,7 @@ class TestControl(BaseTest):
         assert result == payload
         call = sio_http.post.call_args
         assert sync_url(call) == endpoint(ControlPostfixEnm.GET_APP_STATS)
-        assert call.kwargs["json"] == {"clientKey": self.API_KEY, "softId": 867, "mode": mode}
+        assert request_json(call.kwargs) == {"clientKey": self.API_KEY, "softId": 867, "mode": mode}
 
     async def test_aio_get_app_stats_exact_payload(self, aio_http):
         payload = {"errorId": 0, "chartData": []}
@@ -105,7 +105,7 @@ class TestControl(BaseTest):
         assert result == payload
         call = aio_http.post_calls[0]
         assert async_url(call) == endpoint(ControlPostfixEnm.GET_APP_STATS)
-        assert call["kwargs"]["json"] == {"clientKey": self.API_KEY, "softId": 867, "mode": "views"}
+        assert request_json(call["kwargs"]) == {"clientKey": self.API_KEY, "softId": 867, "mode": "views"}
 
     @pytest.mark.parametrize(
         "sync_name, async_name, postfix",
@@ -128,7 +128,7 @@ class TestControl(BaseTest):
         assert result == payload
         call = sio_http.post.call_args
         assert sync_url(call) == endpoint(postfix)
-        assert call.kwargs["json"] == {"clientKey": self.API_KEY, "taskId": 99}
+        assert request_json(call.kwargs) == {"clientKey": self.API_KEY, "taskId": 99}
 
     @pytest.mark.parametrize(
         "async_name, postfix",
@@ -147,4 +147,4 @@ class TestControl(BaseTest):
         assert result == payload
         call = aio_http.post_calls[0]
         assert async_url(call) == endpoint(postfix)
-        assert call["kwargs"]["json"] == {"clientKey": self.API_KEY, "taskId": 99}
+        assert request_json(call["kwargs"]) == {"clientKey": self.API_KEY, "taskId": 99}
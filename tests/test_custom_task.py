@@ -3,6 +3,7 @@
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.custom_task import CustomTask
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestCustomTask(BaseTest):
@@ -42,4 +43,4 @@ class TestCustomTask(BaseTest):
     def test_handler_sends_antigate_type(self, sio_http):
         sio_http.post_sequence({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
         self.make().captcha_handler()
-        assert sio_http.post.call_args.kwargs["json"]["task"]["type"] == CaptchaTypeEnm.AntiGateTask
+        assert request_json(sio_http.post.call_args.kwargs)["task"]["type"] == CaptchaTypeEnm.AntiGateTask
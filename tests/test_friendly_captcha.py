@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.friendly_captcha import FriendlyCaptcha
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestFriendlyCaptcha(BaseTest):
@@ -50,4 +51,7 @@ class TestFriendlyCaptcha(BaseTest):
         await FriendlyCaptcha(
             api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.FriendlyCaptchaTaskProxyless, **self.BASE
         ).aio_captcha_handler()
-        assert aio_http.post_calls[0]["kwargs"]["json"]["task"]["type"] == CaptchaTypeEnm.FriendlyCaptchaTaskProxyless
+        assert (
+            request_json(aio_http.post_calls[0]["kwargs"])["task"]["type"]
+            == CaptchaTypeEnm.FriendlyCaptchaTaskProxyless
+        )
@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.fun_captcha import FunCaptcha
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestFunCaptcha(BaseTest):
@@ -51,4 +52,4 @@ class TestFunCaptcha(BaseTest):
         FunCaptcha(
             api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.FunCaptchaTaskProxyless, **self.BASE
         ).captcha_handler()
-        assert sio_http.post.call_args.kwargs["json"]["task"]["type"] == CaptchaTypeEnm.FunCaptchaTaskProxyless
+        assert request_json(sio_http.post.call_args.kwargs)["task"]["type"] == CaptchaTypeEnm.FunCaptchaTaskProxyless
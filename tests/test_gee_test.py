@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.gee_test import GeeTest
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestGeeTest(BaseTest):
@@ -46,4 +47,4 @@ class TestGeeTest(BaseTest):
         await GeeTest(
             api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.GeeTestTaskProxyless, **self.BASE
         ).aio_captcha_handler()
-        assert aio_http.post_calls[0]["kwargs"]["json"]["task"]["type"] == CaptchaTypeEnm.GeeTestTaskProxyless
+        assert request_json(aio_http.post_calls[0]["kwargs"])["task"]["type"] == CaptchaTypeEnm.GeeTestTaskProxyless
@@ -5,7 +5,7 @@ import base64
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, SaveFormatsEnm
 from python3_anticaptcha.image_to_coordinates import ImageToCoordinates
 from tests.conftest import BaseTest
-from tests.core.conftest import CREATE_TASK_OK, RESULT_READY
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
 
 
 class TestImageToCoordinates(BaseTest):
@@ -45,7 +45,7 @@ class TestImageToCoordinates(BaseTest):
         ).captcha_handler(captcha_base64=b"RAW")
 
         assert result["status"] == "ready"
-        task = sio_http.post.call_args_list[0].kwargs["json"]["task"]
+        task = request_json(sio_http.post.call_args_list[0].kwargs)["task"]
         assert task["comment"] == "select cars"
         assert task["mode"] == "rectangles"
         assert task["websiteURL"] == "https://example.test"
@@ -62,6 +62,6 @@ class TestImageToCoordinates(BaseTest):
         sio_http.post_sequence({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
         instance = ImageToCoordinates(api_key=self.API_KEY)
         instance.captcha_handler(captcha_base64=b"RAW", comment="override", mode="points")
-        task = sio_http.post.call_args.kwargs["json"]["task"]
+        task = request_json(sio_http.post.call_args.kwargs)["task"]
         assert task["comment"] == "override"
         assert task["mode"] == "points"
@@ -5,7 +5,7 @@ import base64
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, SaveFormatsEnm
 from python3_anticaptcha.image_to_text import ImageToText
 from tests.conftest import BaseTest
-from tests.core.conftest import CREATE_TASK_OK, RESULT_READY
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
 
 
 class TestImageToText(BaseTest):
@@ -36,7 +36,7 @@ class TestImageToText(BaseTest):
 
         assert result["status"] == "ready"
         assert result["taskId"] == 4242
-        body = sio_http.post.call_args_list[0].kwargs["json"]
+        body = request_json(sio_http.post.call_args_list[0].kwargs)
         assert body["task"]["type"] == CaptchaTypeEnm.ImageToTextTask
         assert body["task"]["body"] == base64.b64encode(b"RAW").decode("utf-8")
 
@@ -47,14 +47,14 @@ class TestImageToText(BaseTest):
 
         assert result["status"] == "ready"
         assert result["taskId"] == 4242
-        body = aio_http.post_calls[0]["kwargs"]["json"]
+        body = request_json(aio_http.post_calls[0]["kwargs"])
         assert body["task"]["body"] == base64.b64encode(b"RAW").decode("utf-8")
 
     def test_extra_task_options_are_forwarded_exactly(self, sio_http):
         sio_http.post_sequence({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
         instance = ImageToText(api_key=self.API_KEY)
         instance.captcha_handler(captcha_base64=b"RAW", phrase=True, numeric=1, languagePool="en")
-        task = sio_http.post.call_args.kwargs["json"]["task"]
+        task = request_json(sio_http.post.call_args.kwargs)["task"]
         assert task["phrase"] is True
         assert task["numeric"] == 1
         assert task["languagePool"] == "en"
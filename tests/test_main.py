@@ -0,0 +1,129 @@
+"""Tests for the ``python -m python3_anticaptcha`` JSONL batch CLI.
+
+Tasks run through the ``aio_http`` boundary, so the real handlers build and
+send the payloads; stdin/stdout are plain ``io.StringIO`` streams.
+"""
+
+import io
+import json
+
+import pytest
+
+from python3_anticaptcha.__main__ import SolverCache, main, solve_stream
+from python3_anticaptcha.turnstile import Turnstile
+from tests.conftest import API_KEY
+from tests.core.conftest import CREATE_TASK_OK, RESULT_READY, request_json
+
+TURNSTILE = {
+    "type": "Turnstile",
+    "params": {
+        "captcha_type": "TurnstileTaskProxyless",
+        "websiteURL": "https://example.test",
+        "websiteKey": "SITEKEY",
+    },
+}
+
+
+def jsonl(*lines) -> io.StringIO:
+    return io.StringIO("".join((line if isinstance(line, str) else json.dumps(line)) + "\n" for line in lines))
+
+
+def enqueue_solves(aio_http, count: int) -> None:
+    # concurrent tasks interleave, one response is valid for both API methods
+    for _ in range(count * 2):
+        aio_http.enqueue_post({**RESULT_READY, **CREATE_TASK_OK})
+
+
+class TestSolveStream:
+    async def test_streams_results_and_skips_blank_lines(self, aio_http):
+        enqueue_solves(aio_http, 2)
+        sink, progress_sink = io.StringIO(), io.StringIO()
+
+        progress = await solve_stream(
+            source=jsonl({**TURNSTILE, "id": "a"}, "", {**TURNSTILE, "id": "b", "task": {"action": "login"}}),
+            sink=sink,
+            cache=SolverCache(api_key=API_KEY),
+            concurrency=2,
+            progress_interval=0,
+            progress_sink=progress_sink,
+        )
+
+        records = [json.loads(line) for line in sink.getvalue().splitlines()]
+        assert sorted((record["id"], record["index"]) for record in records) == [("a", 0), ("b", 1)]
+        assert all(record["result"]["status"] == "ready" for record in records)
+        assert (progress.done, progress.failed) == (2, 0)
+        assert progress_sink.getvalue().startswith("2 done, 0 failed")
+
+        tasks = [request_json(call["kwargs"]) for call in aio_http.post_calls]
+        assert {payload["clientKey"] for payload in tasks} == {API_KEY}
+        assert [payload["task"].get("action") for payload in tasks if "task" in payload].count("login") == 1
+
+    async def test_bad_lines_are_reported_not_raised(self, aio_http):
+        sink = io.StringIO()
+
+        progress = await solve_stream(
+            source=jsonl("{not json", {"type": "Nope", "id": 7}, {"type": "Turnstile", "params": {"bad": 1}}),
+            sink=sink,
+            cache=SolverCache(api_key=API_KEY),
+            progress_interval=0,
+            progress_sink=io.StringIO(),
+        )
+
+        records = sorted((json.loads(line) for line in sink.getvalue().splitlines()), key=lambda r: r["index"])
+        assert [record["error"].split(":")[0] for record in records] == ["DecodeError", "ValueError", "TypeError"]
+        assert records[1]["id"] == 7
+        assert (progress.done, progress.failed) == (3, 3)
+
+    async def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            await solve_stream(io.StringIO(), io.StringIO(), SolverCache(api_key=API_KEY), concurrency=0)
+
+
+class TestSolverCache:
+    def test_same_type_and_params_share_solver(self):
+        cache = SolverCache(api_key=API_KEY)
+        first = cache.get("Turnstile", dict(TURNSTILE["params"]))
+        second = cache.get("Turnstile", dict(reversed(list(TURNSTILE["params"].items()))))
+
+        assert isinstance(first, Turnstile)
+        assert first is second
+
+    def test_size_is_bounded(self):
+        cache = SolverCache(api_key=API_KEY, size=2)
+        for n in range(5):
+            cache.get("Turnstile", {**TURNSTILE["params"], "websiteKey": str(n)})
+        assert len(cache._solvers) == 2
+
+    def test_applies_timeout_and_request_url(self):
+        solver = SolverCache(api_key=API_KEY, timeout=30, request_url="http://127.0.0.1:9/").get(
+            "Turnstile", TURNSTILE["params"]
+        )
+        assert solver.timeout.total == 30
+        assert solver.request_url == "http://127.0.0.1:9/"
+
+
+class TestMain:
+    def test_reads_file_and_writes_file(self, aio_http, tmp_path, capsys):
+        enqueue_solves(aio_http, 3)
+        source, target = tmp_path / "tasks.jsonl", tmp_path / "results.jsonl"
+        source.write_text(jsonl(TURNSTILE, TURNSTILE, TURNSTILE).getvalue())
+
+        assert main(["-i", str(source), "-o", str(target), "-k", API_KEY, "--progress-interval", "0"]) == 0
+
+        assert len(target.read_text().splitlines()) == 3
+        assert "3 done, 0 failed" in capsys.readouterr().err
+
+    def test_api_key_is_required(self, monkeypatch):
+        monkeypatch.delenv("API_KEY", raising=False)
+        with pytest.raises(SystemExit):
+            main(["-k", ""])
+
+    def test_api_key_from_environment(self, aio_http, monkeypatch, tmp_path):
+        monkeypatch.setenv("API_KEY", API_KEY)
+        enqueue_solves(aio_http, 1)
+        source, target = tmp_path / "tasks.jsonl", tmp_path / "results.jsonl"
+        source.write_text(jsonl(TURNSTILE).getvalue())
+
+        assert main(["-i", str(source), "-o", str(target), "--progress-interval", "0"]) == 0
+
+        assert request_json(aio_http.post_calls[0]["kwargs"])["clientKey"] == API_KEY
@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.prosopo_captcha import Prosopo
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestProsopo(BaseTest):
@@ -33,4 +34,4 @@ class TestProsopo(BaseTest):
     def test_sync_handler_sends_selected_type(self, sio_http):
         sio_http.post_sequence({"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"})
         Prosopo(api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.ProsopoTaskProxyless, **self.BASE).captcha_handler()
-        assert sio_http.post.call_args.kwargs["json"]["task"]["type"] == CaptchaTypeEnm.ProsopoTaskProxyless
+        assert request_json(sio_http.post.call_args.kwargs)["task"]["type"] == CaptchaTypeEnm.ProsopoTaskProxyless
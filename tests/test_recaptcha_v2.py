@@ -10,6 +10,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.recaptcha_v2 import ReCaptchaV2
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestReCaptchaV2(BaseTest):
@@ -88,6 +89,6 @@ class TestReCaptchaV2(BaseTest):
         ).captcha_handler()
 
         assert result["errorId"] == 1
-        body = sio_http.post.call_args.kwargs["json"]
+        body = request_json(sio_http.post.call_args.kwargs)
         assert body["clientKey"] == self.API_KEY
         assert body["task"]["type"] == CaptchaTypeEnm.RecaptchaV2TaskProxyless
@@ -5,6 +5,7 @@ import pytest
 from python3_anticaptcha.core.enum import CaptchaTypeEnm, ProxyTypeEnm
 from python3_anticaptcha.turnstile import Turnstile
 from tests.conftest import BaseTest
+from tests.core.conftest import request_json
 
 
 class TestTurnstile(BaseTest):
@@ -46,4 +47,4 @@ class TestTurnstile(BaseTest):
         Turnstile(
             api_key=self.API_KEY, captcha_type=CaptchaTypeEnm.TurnstileTaskProxyless, **self.BASE
         ).captcha_handler()
-        assert sio_http.post.call_args.kwargs["json"]["task"]["type"] == CaptchaTypeEnm.TurnstileTaskProxyless
+        assert request_json(sio_http.post.call_args.kwargs)["task"]["type"] == CaptchaTypeEnm.TurnstileTaskProxyless